@@ -1,23 +1,59 @@
 from django.contrib import admin
+from django.utils import timezone
+from django.http import StreamingHttpResponse
+from django.utils.html import format_html_join
 from django.utils.translation import gettext_lazy as _
 from apps.applications.models import (
     Region, District, Branch, Specialty, Specialist, Equipment, 
-    SpecialistsRequired, EquipmentRequired, Application, ApplicationBranch, EquipmentRequiredItem
+    SpecialistsRequired, EquipmentRequired, Application, ApplicationBranch, EquipmentRequiredItem,
+    ArchivedApplication, SelectedSpecialist, SelectedEquipment, ApplicationSnapshot,
 )
+from apps.applications.bundles import stream_document_bundle
+from apps.applications.search import search_applications
+from apps.applications.autocomplete import autocomplete
+
+
+class IndexedSearchMixin:
+    """Answers admin searches (and autocomplete_fields lookups) from the in-memory location index."""
+    autocomplete_kind = None
+    # Relations used by __str__, which the autocomplete JSON view renders per result
+    search_select_related = ()
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        ids = [entry.id for entry in autocomplete(search_term, kind=self.autocomplete_kind, limit=None)]
+        return queryset.filter(pk__in=ids).select_related(*self.search_select_related), False
 
 
 class ApplicationBranchInline(admin.TabularInline):
     """Allows editing ApplicationBranch records directly within the Application form."""
     model = ApplicationBranch
-    # Display the primary fields for context
-    fields = ('branch', 'specialties', 'selected_specialists', 'selected_equipment')
+    # Display the primary fields for context; the counted specialists and
+    # equipment are edited on the branch's own change page.
+    fields = ('branch', 'specialties')
     autocomplete_fields = ['branch'] 
     extra = 0
     min_num = 1 
+    show_change_link = True
     verbose_name = _("Associated Branch/Filial Details")
     verbose_name_plural = _("Associated Branches/Filial Details")
 
 
+class SelectedSpecialistInline(admin.TabularInline):
+    model = SelectedSpecialist
+    extra = 0
+    fields = ('specialist', 'count')
+    autocomplete_fields = ['specialist']
+
+
+class SelectedEquipmentInline(admin.TabularInline):
+    model = SelectedEquipment
+    extra = 0
+    fields = ('equipment', 'count')
+    autocomplete_fields = ['equipment']
+
+
 # --- Inline Definitions for Requirement Management (Specialty View) ---
 
 class SpecialistsRequiredInline(admin.TabularInline):
@@ -56,14 +92,21 @@ class EquipmentRequiredAdmin(admin.ModelAdmin):
 class ApplicationAdmin(admin.ModelAdmin):
     """Admin configuration for the main Application model."""
     list_display = ('registration_number', 'last_name', 'first_name', 'phone_number', 'status', 'created_at')
-    list_filter = ('status', 'document_type', 'created_at')
+    list_filter = ('status', 'document_type', 'created_at', 'applicationbranch__branch__district__region')
     search_fields = ('registration_number', 'last_name', 'first_name', 'paternal_name', 'phone_number', 'email')
     ordering = ('-created_at',)
-    readonly_fields = ('registration_number', 'created_at', 'updated_at')
+    readonly_fields = ('registration_number', 'created_at', 'updated_at', 'submitted_branches')
+    actions = ['download_documents']
     
     # Use the inline to manage application branches/requirements directly
     inlines = [ApplicationBranchInline]
 
+    def get_search_results(self, request, queryset, search_term):
+        # Served by the precomputed search document instead of icontains scans.
+        if not search_term.strip():
+            return queryset, False
+        return search_applications(search_term, queryset), False
+
     # Group fields for better readability
     fieldsets = (
         (_('Application Status & Registration'), {
@@ -75,8 +118,68 @@ class ApplicationAdmin(admin.ModelAdmin):
         (_('Document Information'), {
             'fields': ('document_type', 'document_file'),
         }),
+        (_('As Submitted'), {
+            'fields': ('submitted_branches',),
+        }),
     )
 
+    @admin.action(description=_("Download documents (ZIP with manifest)"))
+    def download_documents(self, request, queryset):
+        """Stream the selected applications' documents; the ZIP is built while it is sent."""
+        response = StreamingHttpResponse(stream_document_bundle(queryset), content_type='application/zip')
+        filename = f"documents-{timezone.localtime():%Y%m%d-%H%M}.zip"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    @admin.display(description=_("Submitted branches"))
+    def submitted_branches(self, obj):
+        """Branches from the submission snapshot: one primary-key read, no joins."""
+        snapshot = ApplicationSnapshot.objects.filter(pk=obj.pk).only('document').first()
+        if snapshot is None:
+            return "-"
+        return format_html_join(
+            '', '<p><strong>{}</strong> ({}, {}): {}<br>{}<br>{}</p>',
+            (
+                (
+                    branch['branch']['branch_name'],
+                    branch['branch']['region_name'],
+                    branch['branch']['district_name'],
+                    ", ".join(specialty['name'] for specialty in branch['specialties']),
+                    ", ".join(f"{item['title']} × {item['count']}" for item in branch['selected_specialists']),
+                    ", ".join(f"{item['name']} × {item['count']}" for item in branch['selected_equipment']),
+                )
+                for branch in snapshot.document['branches']
+            ),
+        )
+
+@admin.register(ApplicationBranch)
+class ApplicationBranchAdmin(admin.ModelAdmin):
+    """A branch of an application with how many specialists and equipment it has."""
+    list_display = ('application', 'branch')
+    list_select_related = ('application', 'branch')
+    search_fields = ('=application__registration_number',)
+    autocomplete_fields = ['branch']
+    fields = ('application', 'branch', 'specialties')
+    readonly_fields = ('application',)
+    inlines = [SelectedSpecialistInline, SelectedEquipmentInline]
+
+    def has_add_permission(self, request):
+        return False
+
+@admin.register(ArchivedApplication)
+class ArchivedApplicationAdmin(admin.ModelAdmin):
+    """Read-only view of applications moved out by ``archive_applications``."""
+    list_display = ('registration_number', 'last_name', 'first_name', 'phone_number', 'status', 'created_at', 'archived_at')
+    list_filter = ('status', 'created_at')
+    search_fields = ('=registration_number', '=phone_number', '=email', 'last_name')
+    ordering = ('-created_at',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
 @admin.register(Specialty)
 class SpecialtyAdmin(admin.ModelAdmin):
     """Admin configuration for the Specialty model, showing its requirements."""
@@ -86,24 +189,30 @@ class SpecialtyAdmin(admin.ModelAdmin):
 
 
 @admin.register(Branch)
-class BranchAdmin(admin.ModelAdmin):
+class BranchAdmin(IndexedSearchMixin, admin.ModelAdmin):
     """Admin configuration for the Branch model."""
     list_display = ('branch_name', 'district')
     list_filter = ('district__region', 'district',)
     search_fields = ('branch_name', 'district__district_name')
     autocomplete_fields = ['district']
+    autocomplete_kind = 'branch'
+    search_select_related = ('district__region',)
+    ordering = ('branch_name',)
 
 @admin.register(District)
-class DistrictAdmin(admin.ModelAdmin):
+class DistrictAdmin(IndexedSearchMixin, admin.ModelAdmin):
     list_display = ('district_name', 'region')
     list_filter = ('region',)
     search_fields = ('district_name',)
     autocomplete_fields = ['region']
+    autocomplete_kind = 'district'
+    search_select_related = ('region',)
 
 @admin.register(Region)
-class RegionAdmin(admin.ModelAdmin):
+class RegionAdmin(IndexedSearchMixin, admin.ModelAdmin):
     list_display = ('region_name',)
     search_fields = ('region_name',)
+    autocomplete_kind = 'region'
 
 @admin.register(Specialist)
 class SpecialistAdmin(admin.ModelAdmin):
@@ -0,0 +1,56 @@
+from django.db import transaction
+
+from apps.applications.choices import ApplicationStatus
+from apps.applications.models import Application, ArchivedApplication
+from apps.applications.snapshots import BRANCH_DOCUMENT_PREFETCH, branch_documents
+
+
+FINISHED_STATUSES = (ApplicationStatus.APPROVED, ApplicationStatus.REJECTED)
+
+ARCHIVED_FIELDS = (
+    'user_id', 'first_name', 'last_name', 'paternal_name', 'full_address', 'phone_number',
+    'email', 'document_type', 'document_file', 'registration_number', 'status',
+    'created_at', 'updated_at',
+)
+
+
+def archivable_applications(cutoff):
+    return Application.objects.filter(status__in=FINISHED_STATUSES, created_at__lt=cutoff)
+
+
+def archive_batch(pks, cutoff):
+    """
+    Copy the given applications (those still archivable under the row lock)
+    into the archive and delete them, atomically.
+    """
+    applications = archivable_applications(cutoff).filter(pk__in=pks).select_for_update().prefetch_related(
+        *BRANCH_DOCUMENT_PREFETCH
+    )
+    with transaction.atomic():
+        archived = [
+            ArchivedApplication(
+                id=application.pk,
+                branches=branch_documents(application),
+                **{field: getattr(application, field) for field in ARCHIVED_FIELDS},
+            )
+            for application in applications
+        ]
+        ArchivedApplication.objects.bulk_create(archived)
+        Application.objects.filter(pk__in=[item.pk for item in archived]).delete()
+    return len(archived)
+
+
+def archive_finished_applications(cutoff, batch_size=500):
+    """
+    Move finished applications created before ``cutoff`` into the archive in
+    primary-key ordered batches, one transaction per batch. Yields the number
+    of applications archived per batch.
+    """
+    queryset = archivable_applications(cutoff).order_by('pk')
+    last_pk = 0
+    while True:
+        pks = list(queryset.filter(pk__gt=last_pk).values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            return
+        yield archive_batch(pks, cutoff)
+        last_pk = pks[-1]
@@ -0,0 +1,183 @@
+import re
+import threading
+import time
+from bisect import bisect_left
+
+from apps.applications.models import Region, District, Branch
+from apps.common.cache import get_namespace_version
+
+
+AUTOCOMPLETE_NAMESPACE = "applications:autocomplete"
+# How often (seconds) a process asks the cache whether the index is stale.
+VERSION_CHECK_INTERVAL = 2.0
+
+KINDS = ("region", "district", "branch")
+
+_CYRILLIC_TO_LATIN = {
+    "а": "a", "б": "b", "в": "v", "г": "g", "ғ": "g", "д": "d", "е": "e", "ё": "yo",
+    "ж": "j", "з": "z", "и": "i", "й": "y", "к": "k", "қ": "q", "л": "l", "м": "m",
+    "н": "n", "о": "o", "ў": "o", "п": "p", "р": "r", "с": "s", "т": "t", "у": "u",
+    "ф": "f", "х": "x", "ҳ": "h", "ц": "ts", "ч": "ch", "ш": "sh", "щ": "sh",
+    "ъ": "", "ы": "i", "ь": "", "э": "e", "ю": "yu", "я": "ya",
+}
+_TRANSLITERATION = str.maketrans(_CYRILLIC_TO_LATIN)
+# o‘ / g‘ and friends are written with many different apostrophes; drop them all.
+_APOSTROPHES_RE = re.compile(r"['`ʻʼ‘’´]")
+_NON_WORD_RE = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(text):
+    """Casefold, transliterate Uzbek Cyrillic to Latin and strip apostrophes/punctuation."""
+    text = (text or "").casefold().translate(_TRANSLITERATION)
+    text = _APOSTROPHES_RE.sub("", text)
+    return _NON_WORD_RE.sub(" ", text).strip()
+
+
+def _trigrams(text):
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class Entry:
+    __slots__ = ("kind", "id", "name", "label", "region_id", "district_id", "normalized")
+
+    def __init__(self, kind, id, name, label, region_id=None, district_id=None):
+        self.kind = kind
+        self.id = id
+        self.name = name
+        self.label = label
+        self.region_id = region_id
+        self.district_id = district_id
+        self.normalized = normalize(label)
+
+    def as_dict(self):
+        return {
+            "kind": self.kind,
+            "id": self.id,
+            "name": self.name,
+            "label": self.label,
+            "region_id": self.region_id,
+            "district_id": self.district_id,
+        }
+
+
+class AutocompleteIndex:
+    """
+    In-memory prefix + trigram index over region, district and branch names.
+
+    Every entry is indexed under the words of its full label (a branch also
+    under its district and region names). Prefix lookups bisect a sorted word
+    list; queries that match no word prefix fall back to trigram candidates
+    verified by substring search.
+    """
+
+    def __init__(self, entries):
+        self.entries = entries
+        words = []
+        self.trigrams = {}
+        for position, entry in enumerate(entries):
+            for word in set(entry.normalized.split()):
+                words.append((word, position))
+            for trigram in _trigrams(entry.normalized):
+                self.trigrams.setdefault(trigram, set()).add(position)
+        words.sort()
+        self.words = [word for word, _ in words]
+        self.word_entries = [position for _, position in words]
+
+    @classmethod
+    def build(cls):
+        entries = []
+        regions = {}
+        for region in Region.objects.order_by("region_name"):
+            regions[region.pk] = region.region_name
+            entries.append(Entry("region", region.pk, region.region_name, region.region_name, region.pk))
+        districts = {}
+        for district in District.objects.order_by("district_name"):
+            label = f"{district.district_name} | {regions.get(district.region_id, '')}"
+            districts[district.pk] = (label, district.region_id)
+            entries.append(Entry(
+                "district", district.pk, district.district_name, label, district.region_id, district.pk,
+            ))
+        for branch in Branch.objects.order_by("branch_name"):
+            district_label, region_id = districts.get(branch.district_id, ("", None))
+            name = branch.branch_name or ""
+            entries.append(Entry(
+                "branch", branch.pk, name, f"{district_label} | {name}", region_id, branch.district_id,
+            ))
+        return cls(entries)
+
+    def _prefix_matches(self, token):
+        start = bisect_left(self.words, token)
+        matches = set()
+        for i in range(start, len(self.words)):
+            if not self.words[i].startswith(token):
+                break
+            matches.add(self.word_entries[i])
+        return matches
+
+    def _substring_matches(self, query):
+        candidates = None
+        for trigram in {query[i:i + 3] for i in range(len(query) - 2)}:
+            found = self.trigrams.get(trigram, set())
+            candidates = found if candidates is None else candidates & found
+            if not candidates:
+                return set()
+        if candidates is None:
+            candidates = range(len(self.entries))
+        return {position for position in candidates if query in self.entries[position].normalized}
+
+    def lookup(self, query, kind=None, region_id=None, district_id=None, limit=10):
+        query = normalize(query)
+        if not query:
+            return []
+
+        matches = None
+        for token in query.split():
+            found = self._prefix_matches(token)
+            matches = found if matches is None else matches & found
+            if not matches:
+                break
+        if not matches:
+            matches = self._substring_matches(query)
+
+        results = []
+        for position in matches:
+            entry = self.entries[position]
+            if kind and entry.kind != kind:
+                continue
+            if region_id and entry.region_id != region_id:
+                continue
+            if district_id and entry.district_id != district_id:
+                continue
+            name = normalize(entry.name)
+            # Matches on the entry's own name first, then shorter labels.
+            results.append(((not name.startswith(query), len(entry.normalized), entry.label), entry))
+        results.sort(key=lambda item: item[0])
+        return [entry for _, entry in (results[:limit] if limit else results)]
+
+
+_index = None
+_index_version = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def get_index():
+    """Return this process's index, rebuilding it when the cache version moved on."""
+    global _index, _index_version, _checked_at
+
+    now = time.monotonic()
+    if _index is not None and now - _checked_at < VERSION_CHECK_INTERVAL:
+        return _index
+
+    version = get_namespace_version(AUTOCOMPLETE_NAMESPACE)
+    with _lock:
+        if _index is None or version != _index_version:
+            _index = AutocompleteIndex.build()
+            _index_version = version
+        _checked_at = now
+    return _index
+
+
+def autocomplete(query, kind=None, region_id=None, district_id=None, limit=10):
+    return get_index().lookup(query, kind=kind, region_id=region_id, district_id=district_id, limit=limit)
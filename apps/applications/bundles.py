@@ -0,0 +1,144 @@
+import csv
+import io
+import os
+import zipfile
+
+from django.db import router
+from django.utils import timezone
+from django.core.files.storage import default_storage
+
+from apps.applications.models import Application
+from apps.common.db_router import use_replica
+
+
+MANIFEST_NAME = 'manifest.csv'
+MANIFEST_COLUMNS = (
+    'application_id', 'registration_number', 'status', 'last_name', 'first_name', 'paternal_name',
+    'created_at', 'regions', 'document_type', 'file', 'size',
+)
+COPY_CHUNK_SIZE = 1024 * 1024
+# PDFs and images are already compressed; only the manifest is deflated.
+DEFLATED_EXTENSIONS = frozenset(('.csv', '.txt', '.xml', '.json', '.html'))
+
+
+class _ChunkWriter(io.RawIOBase):
+    """Write-only, unseekable sink that hands the written bytes back in chunks."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _flush(sink):
+    data = sink.drain()
+    if data:
+        yield data
+
+
+def _batches(queryset, batch_size):
+    """Primary-key ordered batches of ``queryset`` up to the pk that was last when the export started."""
+    queryset = queryset.order_by('pk')
+    last = queryset.values_list('pk', flat=True).last()
+    if last is None:
+        return
+    queryset = queryset.filter(pk__lte=last).select_related('snapshot').only(
+        'pk', 'registration_number', 'status', 'last_name', 'first_name', 'paternal_name',
+        'created_at', 'document_type', 'document_file', 'snapshot__document',
+    )
+    last_pk = 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            return
+        yield batch
+        last_pk = batch[-1].pk
+
+
+def _archive_name(application):
+    folder = application.registration_number or f'application-{application.pk}'
+    return f'{folder}/{os.path.basename(application.document_file.name)}'
+
+
+def _regions(application):
+    try:
+        branches = application.snapshot.document['branches']
+    except Application.snapshot.RelatedObjectDoesNotExist:
+        return ''
+    return '; '.join(dict.fromkeys(branch['branch']['region_name'] for branch in branches))
+
+
+def stream_document_bundle(queryset=None, storage=None, batch_size=500):
+    """
+    Yield a ZIP archive of the documents of ``queryset`` (all applications by
+    default) as byte chunks, built on the fly: ``manifest.csv`` first, then
+    one ``<registration number>/<file>`` entry per document.
+
+    The applications are read twice in primary-key ordered batches (manifest,
+    then files) and files are copied through in 1 MiB chunks, so memory stays
+    constant whatever the size of the bundle and nothing touches the disk.
+    Documents missing from storage are listed in the manifest with an empty size.
+
+    Both passes read from the replica ``use_replica()`` picks. The queryset
+    is bound to it up front rather than by keeping the block open across
+    the yields, which would route the consumer's own queries there too.
+    """
+    queryset = queryset if queryset is not None else Application.objects.all()
+    with use_replica():
+        queryset = queryset.using(router.db_for_read(queryset.model))
+    storage = storage or default_storage
+    sink = _ChunkWriter()
+    now = timezone.localtime().timetuple()[:6]
+
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED, allowZip64=True) as bundle:
+        manifest_info = zipfile.ZipInfo(MANIFEST_NAME, date_time=now)
+        manifest_info.compress_type = zipfile.ZIP_DEFLATED
+        with bundle.open(manifest_info, 'w', force_zip64=True) as entry:
+            text = io.TextIOWrapper(entry, encoding='utf-8', newline='', write_through=True)
+            writer = csv.writer(text)
+            writer.writerow(MANIFEST_COLUMNS)
+            for batch in _batches(queryset, batch_size):
+                for application in batch:
+                    if not application.document_file:
+                        continue
+                    try:
+                        size = storage.size(application.document_file.name)
+                    except OSError:
+                        size = ''
+                    writer.writerow((
+                        application.pk, application.registration_number or '', application.status,
+                        application.last_name, application.first_name, application.paternal_name,
+                        application.created_at.isoformat(), _regions(application), application.document_type,
+                        _archive_name(application), size,
+                    ))
+                yield from _flush(sink)
+            text.detach()
+        yield from _flush(sink)
+
+        for batch in _batches(queryset, batch_size):
+            for application in batch:
+                if not application.document_file:
+                    continue
+                try:
+                    source = storage.open(application.document_file.name, 'rb')
+                except OSError:
+                    continue
+                info = zipfile.ZipInfo(_archive_name(application), date_time=now)
+                extension = os.path.splitext(info.filename)[1].lower()
+                info.compress_type = zipfile.ZIP_DEFLATED if extension in DEFLATED_EXTENSIONS else zipfile.ZIP_STORED
+                with source, bundle.open(info, 'w', force_zip64=True) as entry:
+                    while chunk := source.read(COPY_CHUNK_SIZE):
+                        entry.write(chunk)
+                        yield from _flush(sink)
+                yield from _flush(sink)
+    yield from _flush(sink)
@@ -0,0 +1,88 @@
+import hashlib
+import json
+
+from apps.applications.models import Specialty, SpecialistsRequired, EquipmentRequiredItem
+from apps.common.cache import cache_aside
+from apps.common.nplusone import allow_repeated_queries
+
+
+REFERENCE_CACHE_NAMESPACE = "applications:reference"
+REFERENCE_CACHE_TIMEOUT = 60 * 60
+
+
+def get_specialty_requirements(specialty_id):
+    """
+    Return the cached minimum specialists and equipment of one specialty,
+    or None if the specialty does not exist.
+    """
+    return cache_aside(
+        f"specialty-requirements:{specialty_id}",
+        lambda: _build_specialty_requirements(specialty_id),
+        timeout=REFERENCE_CACHE_TIMEOUT,
+        namespace=REFERENCE_CACHE_NAMESPACE,
+    )
+
+
+# Built once per requested specialty on a cold cache; the repeats are expected.
+@allow_repeated_queries()
+def _build_specialty_requirements(specialty_id):
+    if not Specialty.objects.filter(pk=specialty_id).exists():
+        return None
+
+    specialists = [
+        {'id': specialist_id, 'title': title, 'min_count': min_count}
+        for specialist_id, title, min_count in SpecialistsRequired.objects.filter(
+            specialty_id=specialty_id
+        ).values_list('required_specialists_id', 'required_specialists__title', 'min_count')
+    ]
+    equipment = [
+        {'id': equipment_id, 'name': name, 'min_count': min_count}
+        for equipment_id, name, min_count in EquipmentRequiredItem.objects.filter(
+            equipment_required__specialty_id=specialty_id
+        ).values_list('equipment_id', 'equipment__name', 'min_count')
+    ]
+    return {'specialists': specialists, 'equipment': equipment}
+
+
+def get_requirements_matrix():
+    """
+    Return ``(version, payload)``: the minimum specialists and equipment of
+    every specialty as compact JSON bytes, and a hash of that content used in
+    its URL so browsers can cache it forever.
+
+    Payload format::
+
+        {"specialists": {id: title}, "equipment": {id: name},
+         "requirements": {specialty_id: [[[specialist_id, min_count], ...],
+                                         [[equipment_id, min_count], ...]]}}
+    """
+    return cache_aside(
+        "requirements-matrix",
+        _build_requirements_matrix,
+        timeout=REFERENCE_CACHE_TIMEOUT,
+        namespace=REFERENCE_CACHE_NAMESPACE,
+    )
+
+
+def _build_requirements_matrix():
+    specialists = {}
+    equipment = {}
+    requirements = {specialty_id: [[], []] for specialty_id in Specialty.objects.values_list('pk', flat=True)}
+
+    for specialty_id, specialist_id, title, min_count in SpecialistsRequired.objects.values_list(
+        'specialty_id', 'required_specialists_id', 'required_specialists__title', 'min_count'
+    ).order_by('pk'):
+        specialists[specialist_id] = title
+        requirements.setdefault(specialty_id, [[], []])[0].append([specialist_id, min_count])
+
+    for specialty_id, equipment_id, name, min_count in EquipmentRequiredItem.objects.values_list(
+        'equipment_required__specialty_id', 'equipment_id', 'equipment__name', 'min_count'
+    ).order_by('pk'):
+        equipment[equipment_id] = name
+        requirements.setdefault(specialty_id, [[], []])[1].append([equipment_id, min_count])
+
+    payload = json.dumps(
+        {'specialists': specialists, 'equipment': equipment, 'requirements': requirements},
+        ensure_ascii=False, separators=(',', ':'), sort_keys=True,
+    ).encode()
+    return hashlib.sha256(payload).hexdigest()[:16], payload
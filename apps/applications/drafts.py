@@ -0,0 +1,144 @@
+import os
+
+from django.db import connections, router, transaction
+from django.core.files.storage import default_storage
+from django.db.models.functions import TruncDate
+
+from apps.applications.choices import ApplicationStatus
+from apps.applications.models import (
+    Application, ApplicationBranch, ApplicationSnapshot, ArchivedApplication, SelectedEquipment, SelectedSpecialist,
+)
+from apps.applications.search import remove_search_documents
+
+
+DOCUMENTS_DIR = 'documents'
+
+
+def stale_drafts(cutoff):
+    return Application.objects.filter(status=ApplicationStatus.DRAFT, updated_at__lt=cutoff)
+
+
+def delete_draft_batch(pks, cutoff):
+    """
+    Delete the given drafts (those still stale under the row lock) and their
+    branches with one DELETE statement per table, bypassing the per-object
+    delete collector and its signals.
+
+    Returns ``(rows_deleted, document_names, created_days)``.
+    """
+    with transaction.atomic():
+        drafts = list(
+            stale_drafts(cutoff).filter(pk__in=pks).select_for_update()
+            .annotate(day=TruncDate('created_at')).values_list('pk', 'document_file', 'day')
+        )
+        pks = [pk for pk, _, _ in drafts]
+        if not pks:
+            return 0, [], set()
+        branch_pks = list(ApplicationBranch.objects.filter(application_id__in=pks).values_list('pk', flat=True))
+
+        rows = sum(
+            _delete_rows(model, field, values)
+            for model, field, values in (
+                (ApplicationBranch.specialties.through, 'applicationbranch', branch_pks),
+                (SelectedSpecialist, 'application_branch', branch_pks),
+                (SelectedEquipment, 'application_branch', branch_pks),
+                (ApplicationBranch, 'id', branch_pks),
+                (ApplicationSnapshot, 'application', pks),
+                (Application, 'id', pks),
+            )
+        )
+        remove_search_documents(pks)
+
+    return rows, [name for _, name, _ in drafts if name], {day for _, _, day in drafts}
+
+
+def _delete_rows(model, field, values):
+    """``DELETE FROM <model's table> WHERE <field> IN values``; returns the number of rows deleted."""
+    if not values:
+        return 0
+    connection = connections[router.db_for_write(model)]
+    quote = connection.ops.quote_name
+    column = model._meta.get_field(field).column
+    placeholders = ", ".join(["%s"] * len(values))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {quote(model._meta.db_table)} WHERE {quote(column)} IN ({placeholders})", list(values)
+        )
+        return cursor.rowcount
+
+
+def delete_stale_drafts(cutoff, batch_size=500):
+    """
+    Delete drafts untouched since ``cutoff`` in primary-key ordered batches,
+    one transaction per batch, then remove their documents from storage.
+    Yields ``(rows_deleted, files_deleted, bytes_reclaimed, created_days)``
+    per batch.
+    """
+    queryset = stale_drafts(cutoff).order_by('pk')
+    last_pk = 0
+    while True:
+        pks = list(queryset.filter(pk__gt=last_pk).values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            return
+        rows, names, days = delete_draft_batch(pks, cutoff)
+        files, reclaimed = delete_files(default_storage, unreferenced_documents(names))
+        yield rows, files, reclaimed, days
+        last_pk = pks[-1]
+
+
+def unreferenced_documents(names):
+    """The ``names`` no application or archived application still points to."""
+    names = set(names)
+    if not names:
+        return names
+    names.difference_update(Application.objects.filter(document_file__in=names).values_list('document_file', flat=True))
+    names.difference_update(
+        ArchivedApplication.objects.filter(document_file__in=names).values_list('document_file', flat=True)
+    )
+    return names
+
+
+def delete_files(storage, names):
+    """Delete ``names`` from ``storage``; returns ``(files_deleted, bytes_reclaimed)``."""
+    files = reclaimed = 0
+    for name in names:
+        try:
+            size = storage.size(name)
+            storage.delete(name)
+        except OSError:
+            continue
+        files += 1
+        reclaimed += size
+    return files, reclaimed
+
+
+def _old_files(storage, directory, cutoff):
+    """Files below ``directory`` of ``storage`` last modified before ``cutoff``."""
+    if not storage.exists(directory):
+        return
+    subdirectories, files = storage.listdir(directory)
+    for name in files:
+        path = os.path.join(directory, name) if directory else name
+        if storage.get_modified_time(path) < cutoff:
+            yield path
+    for subdirectory in subdirectories:
+        yield from _old_files(storage, os.path.join(directory, subdirectory) if directory else subdirectory, cutoff)
+
+
+def orphaned_documents(cutoff, batch_size=1000):
+    """
+    Uploaded documents older than ``cutoff`` that no application or archived
+    application references (replaced uploads, rows deleted elsewhere).
+    """
+    batch = []
+    for name in _old_files(default_storage, DOCUMENTS_DIR, cutoff):
+        batch.append(name)
+        if len(batch) >= batch_size:
+            yield from unreferenced_documents(batch)
+            batch = []
+    yield from unreferenced_documents(batch)
+
+
+def abandoned_wizard_files(storage, cutoff):
+    """Temporary wizard uploads older than ``cutoff`` (the wizard was never finished)."""
+    return _old_files(storage, '', cutoff)
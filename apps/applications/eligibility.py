@@ -0,0 +1,172 @@
+import json
+import threading
+
+import numpy as np
+
+from apps.applications.cache import get_requirements_matrix
+from apps.applications.models import ApplicationBranch, SelectedEquipment, SelectedSpecialist, Specialty
+
+
+# Counts are compared as int32 (the range of the count columns); larger ones are clamped.
+MAX_COUNT = np.iinfo(np.int32).max
+# Elements of the boolean intermediate of one batch comparison (16 MB); larger
+# batches are compared in chunks of rows.
+MASK_CHUNK_ELEMENTS = 1 << 24
+
+
+class EligibilityMatrix:
+    """
+    The specialty requirements as two dense minimum-count matrices,
+    specialty × specialist and specialty × equipment (0 = not required).
+
+    A specialty is satisfied by an inventory (count per specialist and per
+    equipment) when every column of its rows is covered, which is one
+    vectorized comparison for all specialties at once, or for a whole batch
+    of inventories.
+    """
+
+    def __init__(self, specialty_ids, specialty_names, specialist_ids, equipment_ids,
+                 specialist_minimums, equipment_minimums):
+        self.specialty_ids = np.asarray(specialty_ids, dtype=np.int64)
+        self.specialty_names = specialty_names
+        self.specialist_index = {pk: column for column, pk in enumerate(specialist_ids)}
+        self.equipment_index = {pk: column for column, pk in enumerate(equipment_ids)}
+        self.specialist_minimums = specialist_minimums
+        self.equipment_minimums = equipment_minimums
+
+    @classmethod
+    def from_payload(cls, payload):
+        """Build from the compiled requirements matrix (see ``get_requirements_matrix``)."""
+        data = json.loads(payload)
+        specialty_ids = sorted(int(pk) for pk in data['requirements'])
+        specialist_ids = sorted(int(pk) for pk in data['specialists'])
+        equipment_ids = sorted(int(pk) for pk in data['equipment'])
+        matrix = cls(
+            specialty_ids,
+            dict(Specialty.objects.filter(pk__in=specialty_ids).values_list('pk', 'name')),
+            specialist_ids,
+            equipment_ids,
+            np.zeros((len(specialty_ids), len(specialist_ids)), dtype=np.int32),
+            np.zeros((len(specialty_ids), len(equipment_ids)), dtype=np.int32),
+        )
+        for row, specialty_id in enumerate(specialty_ids):
+            specialists, equipment = data['requirements'][str(specialty_id)]
+            for pk, min_count in specialists:
+                column = matrix.specialist_index[pk]
+                matrix.specialist_minimums[row, column] = max(matrix.specialist_minimums[row, column], min_count)
+            for pk, min_count in equipment:
+                column = matrix.equipment_index[pk]
+                matrix.equipment_minimums[row, column] = max(matrix.equipment_minimums[row, column], min_count)
+        return matrix
+
+    def inventory_vectors(self, specialists, equipment):
+        """
+        ``{specialist_id: count}``, ``{equipment_id: count}`` -> two count
+        vectors (unknown ids ignored, counts clamped to ``MAX_COUNT``).
+        """
+        return (
+            self._vector(self.specialist_index, specialists),
+            self._vector(self.equipment_index, equipment),
+        )
+
+    @staticmethod
+    def _vector(index, counts):
+        vector = np.zeros(len(index), dtype=np.int32)
+        for pk, count in counts.items():
+            if pk in index:
+                vector[index[pk]] = min(count, MAX_COUNT)
+        return vector
+
+    def satisfied_mask(self, specialist_counts, equipment_counts):
+        """
+        Boolean mask of the satisfied specialties. Accepts single inventory
+        vectors, or ``(n, specialists)`` / ``(n, equipment)`` arrays for a
+        batch, which return an ``(n, specialties)`` mask. Batches are compared
+        in chunks of rows that keep the ``(rows, specialties, columns)``
+        intermediate under ``MASK_CHUNK_ELEMENTS``.
+        """
+        specialist_counts = np.asarray(specialist_counts)
+        equipment_counts = np.asarray(equipment_counts)
+        if specialist_counts.ndim == 1:
+            return self._mask(specialist_counts, equipment_counts)
+
+        columns = max(self.specialist_minimums.shape[1], self.equipment_minimums.shape[1], 1)
+        chunk = max(1, MASK_CHUNK_ELEMENTS // max(len(self.specialty_ids) * columns, 1))
+        mask = np.empty((len(specialist_counts), len(self.specialty_ids)), dtype=bool)
+        for start in range(0, len(specialist_counts), chunk):
+            mask[start:start + chunk] = self._mask(
+                specialist_counts[start:start + chunk], equipment_counts[start:start + chunk]
+            )
+        return mask
+
+    def _mask(self, specialist_counts, equipment_counts):
+        return (
+            (specialist_counts[..., None, :] >= self.specialist_minimums).all(axis=-1)
+            & (equipment_counts[..., None, :] >= self.equipment_minimums).all(axis=-1)
+        )
+
+    def satisfied_specialties(self, specialists, equipment):
+        """Ids of the specialties an inventory (``{id: count}`` dicts) satisfies."""
+        mask = self.satisfied_mask(*self.inventory_vectors(specialists, equipment))
+        return self.specialty_ids[mask].tolist()
+
+
+_matrix = None
+_matrix_version = None
+_lock = threading.Lock()
+
+
+def get_eligibility_matrix():
+    """Return this process's matrix, rebuilt whenever the compiled requirements change."""
+    global _matrix, _matrix_version
+
+    version, payload = get_requirements_matrix()
+    if _matrix is None or version != _matrix_version:
+        with _lock:
+            if _matrix is None or version != _matrix_version:
+                _matrix = EligibilityMatrix.from_payload(payload)
+                _matrix_version = version
+    return _matrix
+
+
+def branch_inventories(application_branch_ids):
+    """
+    ``{application_branch_id: ({specialist_id: count}, {equipment_id: count})}``
+    of the given application branches, read with one query per table.
+    """
+    inventories = {pk: ({}, {}) for pk in application_branch_ids}
+    specialists = SelectedSpecialist.objects.filter(
+        application_branch_id__in=application_branch_ids
+    ).values_list('application_branch_id', 'specialist_id', 'count')
+    for application_branch_id, specialist_id, count in specialists:
+        inventories[application_branch_id][0][specialist_id] = count
+    equipment = SelectedEquipment.objects.filter(
+        application_branch_id__in=application_branch_ids
+    ).values_list('application_branch_id', 'equipment_id', 'count')
+    for application_branch_id, equipment_id, count in equipment:
+        inventories[application_branch_id][1][equipment_id] = count
+    return inventories
+
+
+def score_application_branches(queryset=None, batch_size=5000):
+    """
+    Yield ``(application_branch, eligible_specialty_ids)`` for every
+    application branch of ``queryset``, scoring each batch of inventories
+    with a single vectorized comparison.
+    """
+    matrix = get_eligibility_matrix()
+    queryset = (queryset if queryset is not None else ApplicationBranch.objects.all()).order_by('pk')
+    last_pk = 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last_pk).prefetch_related('specialties')[:batch_size])
+        if not batch:
+            return
+        inventories = branch_inventories([application_branch.pk for application_branch in batch])
+        vectors = [matrix.inventory_vectors(*inventories[application_branch.pk]) for application_branch in batch]
+        mask = matrix.satisfied_mask(
+            np.stack([specialists for specialists, _ in vectors]),
+            np.stack([equipment for _, equipment in vectors]),
+        )
+        for application_branch, row in zip(batch, mask):
+            yield application_branch, matrix.specialty_ids[row].tolist()
+        last_pk = batch[-1].pk
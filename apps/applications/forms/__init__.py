@@ -1,2 +1,4 @@
 from .application_create import ApplicationForm
 from .application_branch import ApplicationBranchForm, ApplicationBranchFormSet
+from .application_wizard import PersonalInfoForm, DocumentForm, ReviewForm
+from .mixins import DuplicateValuesError
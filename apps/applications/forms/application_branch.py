@@ -1,26 +1,39 @@
 from django import forms
+from django.db.models import Max
 from django.core.exceptions import ValidationError
-from django.forms.models import inlineformset_factory
+from django.forms.models import BaseInlineFormSet, inlineformset_factory
 from django.utils.translation import gettext_lazy as _
 
-from apps.applications.models import Application, ApplicationBranch
+from apps.applications.forms.fields import CountedModelMultipleChoiceField
+from apps.applications.models import (Application, ApplicationBranch, Branch, Equipment, EquipmentRequiredItem,
+                                      SelectedEquipment, SelectedSpecialist, Specialist, SpecialistsRequired)
+
+
+# (form field, through model, related field) of the counted selections
+SELECTION_FIELDS = (
+    ('selected_specialists', SelectedSpecialist, 'specialist'),
+    ('selected_equipment', SelectedEquipment, 'equipment'),
+)
 
 
 class ApplicationBranchForm(forms.ModelForm):
     form_prefix = forms.CharField(widget=forms.HiddenInput(), required=False)
+    # Counted through-model selections, saved with the specialties by save_relations()
+    selected_specialists = CountedModelMultipleChoiceField(
+        Specialist.objects.all(), required=False, label=_("Selected Specialists")
+    )
+    selected_equipment = CountedModelMultipleChoiceField(
+        Equipment.objects.all(), required=False, label=_("Selected Equipment")
+    )
     
     class Meta:
         model = ApplicationBranch
         fields = [
             'branch', 
             'specialties', 
-            'selected_specialists', 
-            'selected_equipment'
         ]
         widgets = {
             'specialties': forms.CheckboxSelectMultiple(),
-            'selected_specialists': forms.CheckboxSelectMultiple(),
-            'selected_equipment': forms.CheckboxSelectMultiple(),
         }
         
     def __init__(self, *args, **kwargs):
@@ -29,6 +42,12 @@ class ApplicationBranchForm(forms.ModelForm):
         if self.prefix:
             self.fields['form_prefix'].initial = self.prefix
 
+        if self.instance.pk:
+            for field_name, model, related_field in SELECTION_FIELDS:
+                self.initial.setdefault(field_name, dict(
+                    model.objects.filter(application_branch=self.instance).values_list(f'{related_field}_id', 'count')
+                ))
+
         for field_name in self.fields:
             field = self.fields[field_name]
             
@@ -41,13 +60,13 @@ class ApplicationBranchForm(forms.ModelForm):
                 field.widget.attrs['class'] = 'checkbox-group'
         
         self.fields['specialties'].required = True 
+        # Branch.__str__ walks district -> region; load them with the options.
+        self.fields['branch'].queryset = Branch.objects.select_related('district__region')
 
     def clean(self):
         cleaned_data = super().clean()
         
         specialties = cleaned_data.get('specialties')
-        selected_specialists = cleaned_data.get('selected_specialists')
-        selected_equipment = cleaned_data.get('selected_equipment')
         
         if self.has_changed():
             if cleaned_data.get('branch') and not cleaned_data.get('DELETE'): 
@@ -57,79 +76,154 @@ class ApplicationBranchForm(forms.ModelForm):
                         code='missing_specialties'
                     )
 
-            if specialties and selected_specialists:
-                self._validate_specialist_requirements(specialties, selected_specialists)
-            
-            if specialties and selected_equipment:
-                self._validate_equipment_requirements(specialties, selected_equipment)
+            # A malformed count is reported on its own field only.
+            if specialties and not (self.has_error('selected_specialists') or self.has_error('selected_equipment')):
+                errors = self._validate_specialist_requirements(
+                    specialties, cleaned_data.get('selected_specialists') or {}
+                )
+                errors += self._validate_equipment_requirements(
+                    specialties, cleaned_data.get('selected_equipment') or {}
+                )
+                if errors:
+                    raise ValidationError(errors)
             
         return cleaned_data
 
-    def _validate_specialist_requirements(self, specialties_qs, selected_specialists_qs):
-        from apps.applications.models import SpecialistsRequired
-        
-        errors = []
-        
-        for specialty in specialties_qs:
-            required_qs = SpecialistsRequired.objects.filter(specialty=specialty)
-            
-            for requirement in required_qs:
-                required_title = requirement.required_specialists.title
-                min_count = requirement.min_count
-                
-                # Count how many specialists of this type the user selected
-                selected_count = selected_specialists_qs.filter(title=required_title).count()
-                
-                if selected_count < min_count:
-                    errors.append(
-                        f'"{specialty.name}" ixtisosligi uchun "{required_title}" lavozimidan '
-                        f'kamida {min_count} ta tanlash shart (Siz {selected_count} ta tanladingiz).'
-                    )
-        
-        if errors:
-            raise ValidationError(
-                "Minimal talab qilinadigan mutaxassislarni to'liq tanlamadingiz:\n" + "\n".join(f"• {err}" for err in errors),
-                code='insufficient_specialists'
+    def _validate_specialist_requirements(self, specialties_qs, selected_specialists):
+        """Compare the entered counts with the highest ``min_count`` of every required specialist."""
+        selected = {specialist.pk: count for specialist, count in selected_specialists.items()}
+        requirements = SpecialistsRequired.objects.filter(specialty__in=specialties_qs).values(
+            'required_specialists_id', 'required_specialists__title'
+        ).annotate(min_count=Max('min_count')).order_by('required_specialists__title')
+
+        missing = []
+        for requirement in requirements:
+            selected_count = selected.get(requirement['required_specialists_id'], 0)
+            if selected_count < requirement['min_count']:
+                missing.append(
+                    f'"{requirement["required_specialists__title"]}" lavozimidan '
+                    f'kamida {requirement["min_count"]} ta kiritish shart (Siz {selected_count} ta kiritdingiz).'
+                )
+
+        if not missing:
+            return []
+        return [ValidationError(
+            "Minimal talab qilinadigan mutaxassislarni to'liq kiritmadingiz:\n" + "\n".join(f"• {err}" for err in missing),
+            code='insufficient_specialists'
+        )]
+
+    def _validate_equipment_requirements(self, specialties_qs, selected_equipment):
+        """Compare the entered counts with the highest ``min_count`` of every required equipment."""
+        selected = {equipment.pk: count for equipment, count in selected_equipment.items()}
+        requirements = EquipmentRequiredItem.objects.filter(
+            equipment_required__specialty__in=specialties_qs
+        ).values('equipment_id', 'equipment__name').annotate(min_count=Max('min_count')).order_by('equipment__name')
+
+        return [
+            ValidationError(
+                _("\"%(equipment)s\" dan kamida %(min_count)s ta kiritilishi shart (Kiritilgani: %(selected_count)s).") % {
+                    'equipment': requirement['equipment__name'],
+                    'min_count': requirement['min_count'],
+                    'selected_count': selected.get(requirement['equipment_id'], 0),
+                },
+                code='insufficient_equipment'
             )
+            for requirement in requirements
+            if selected.get(requirement['equipment_id'], 0) < requirement['min_count']
+        ]
 
-    def _validate_equipment_requirements(self, specialties_qs, selected_equipment_qs):
-        from apps.applications.models import EquipmentRequired, EquipmentRequiredItem
-        
-        for specialty in specialties_qs:
-            try:
-                equipment_req = EquipmentRequired.objects.get(specialty=specialty)
-            except EquipmentRequired.DoesNotExist:
+    def _save_m2m(self):
+        # specialties is the only model field saved by the default _save_m2m;
+        # replace it together with the selections, as the formset does.
+        save_relations([self], replaced_pks=[self.instance.pk])
+
+    def relation_rows(self):
+        """Unsaved through rows of the specialties and counted selections, per through model."""
+        specialties = ApplicationBranch.specialties.through
+        return {
+            specialties: [
+                specialties(applicationbranch_id=self.instance.pk, specialty_id=specialty.pk)
+                for specialty in self.cleaned_data['specialties']
+            ],
+            **self.selection_rows(),
+        }
+
+    def selection_rows(self):
+        """Unsaved through rows of the counted selections, per through model."""
+        return {
+            model: [
+                model(application_branch=self.instance, count=count, **{related_field: obj})
+                for obj, count in self.cleaned_data.get(field_name, {}).items()
+            ]
+            for field_name, model, related_field in SELECTION_FIELDS
+        }
+
+
+def save_relations(forms, replaced_pks=()):
+    """
+    Write the specialties and counted selections of the saved branch
+    ``forms``: per through table one delete of the rows of the branches in
+    ``replaced_pks`` and one ``bulk_create`` of the new rows.
+    """
+    rows = {}
+    for form in forms:
+        for model, model_rows in form.relation_rows().items():
+            rows.setdefault(model, []).extend(model_rows)
+
+    for model, model_rows in rows.items():
+        if replaced_pks:
+            column = next(field.attname for field in model._meta.concrete_fields if field.related_model is ApplicationBranch)
+            model.objects.filter(**{f'{column}__in': replaced_pks}).delete()
+        model.objects.bulk_create(model_rows)
+
+
+class BaseApplicationBranchFormSet(BaseInlineFormSet):
+    """
+    Saves all branches with a fixed number of statements however many
+    there are: one delete for the removed branches, one ``bulk_create`` and
+    one ``bulk_update`` for the branches, then per through table (specialties,
+    specialists, equipment) one delete of the changed branches' rows and one
+    ``bulk_create`` of the new rows.
+    """
+
+    def save(self, commit=True):
+        if not commit:
+            return super().save(commit=False)
+
+        self.new_objects = []
+        self.changed_objects = []
+        self.deleted_objects = []
+        saved_forms = []
+        for form in self.initial_forms:
+            if form.instance.pk is None:
                 continue
-            
-            # Get all required equipment items with their individual counts
-            required_items = EquipmentRequiredItem.objects.filter(
-                equipment_required=equipment_req
-            ).select_related('equipment')
-            
-            # Check each required equipment item
-            for item in required_items:
-                equipment_name = item.equipment.name
-                min_count = item.min_count
-                
-                # Count how many of this equipment type user selected
-                selected_count = selected_equipment_qs.filter(name=equipment_name).count()
-                
-                if selected_count < min_count:
-                    raise ValidationError(
-                        _("%(specialty)s ixtisosligi uchun \"%(equipment)s\" dan kamida %(min_count)s ta kiritilishi shart (Kiritilgani: %(selected_count)s).") % {
-                            'specialty': specialty.name,
-                            'equipment': equipment_name,
-                            'min_count': min_count,
-                            'selected_count': selected_count
-                        },
-                        code='insufficient_equipment'
-                    )
+            if self.can_delete and self._should_delete_form(form):
+                self.deleted_objects.append(form.instance)
+            elif form.has_changed():
+                self.changed_objects.append((form.instance, form.changed_data))
+                saved_forms.append(form)
+        for form in self.extra_forms:
+            if form.has_changed() and not (self.can_delete and self._should_delete_form(form)):
+                setattr(form.instance, self.fk.name, self.instance)
+                self.new_objects.append(form.instance)
+                saved_forms.append(form)
+
+        if self.deleted_objects:
+            ApplicationBranch.objects.filter(pk__in=[obj.pk for obj in self.deleted_objects]).delete()
+        ApplicationBranch.objects.bulk_create(self.new_objects)
+        changed = [obj for obj, changed_data in self.changed_objects if 'branch' in changed_data]
+        if changed:
+            ApplicationBranch.objects.bulk_update(changed, ['branch'])
+
+        save_relations(saved_forms, replaced_pks=[obj.pk for obj, _ in self.changed_objects])
+        return [form.instance for form in saved_forms]
 
 
 ApplicationBranchFormSet = inlineformset_factory(
     Application, 
     ApplicationBranch, 
     form=ApplicationBranchForm, 
+    formset=BaseApplicationBranchFormSet,
     extra=1, 
     can_delete=True 
-)
\ No newline at end of file
+)
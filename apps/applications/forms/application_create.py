@@ -2,9 +2,10 @@ from django import forms
 from django.utils.translation import gettext_lazy as _
 
 from apps.applications.models import Application
+from apps.applications.forms.mixins import UniqueFieldsPrecheckMixin
 
 
-class ApplicationForm(forms.ModelForm):
+class ApplicationForm(UniqueFieldsPrecheckMixin, forms.ModelForm):
     class Meta:
         model = Application
         fields = [
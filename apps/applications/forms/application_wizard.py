@@ -0,0 +1,30 @@
+from django import forms
+from django.utils.translation import gettext_lazy as _
+
+from apps.applications.forms.application_create import ApplicationForm
+
+
+class PersonalInfoForm(ApplicationForm):
+    """Wizard step 1: applicant details (phone/e-mail uniqueness checked up front)."""
+
+    class Meta(ApplicationForm.Meta):
+        fields = ['first_name', 'last_name', 'paternal_name', 'phone_number', 'email', 'full_address']
+
+
+class DocumentForm(ApplicationForm):
+    """Wizard step 2: the identity document, uploaded once and kept in the wizard's file storage."""
+
+    class Meta(ApplicationForm.Meta):
+        fields = ['document_type', 'document_file']
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['document_file'].required = True
+
+
+class ReviewForm(forms.Form):
+    """Wizard step 4: the applicant confirms the summary before it is submitted."""
+    confirm = forms.BooleanField(
+        required=True,
+        label=_("Ma'lumotlar to'g'riligini tasdiqlayman"),
+    )
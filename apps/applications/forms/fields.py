@@ -0,0 +1,107 @@
+from django import forms
+from django.core.exceptions import ValidationError
+from django.forms.utils import flatatt
+from django.utils.html import format_html_join
+from django.utils.translation import gettext_lazy as _
+
+
+class CountSelectMultiple(forms.Widget):
+    """
+    One number input per choice, named ``<name>-<pk>``; a choice is selected
+    when its count is above zero. The value is a ``{pk: count}`` dict.
+    """
+
+    def __init__(self, attrs=None, choices=()):
+        super().__init__(attrs)
+        self.choices = choices
+
+    def render(self, name, value, attrs=None, renderer=None):
+        counts = {str(pk): count for pk, count in (value or {}).items()}
+        attrs = self.build_attrs(self.attrs, attrs)
+        base_id = attrs.pop('id', f'id_{name}')
+        rows = []
+        for pk, label in self.choices:
+            if pk == '':
+                continue
+            pk = str(pk)
+            rows.append((
+                f'{base_id}_{pk}', label, f'{base_id}_{pk}', f'{name}-{pk}', counts.get(pk, 0),
+                flatatt(attrs),
+            ))
+        return format_html_join(
+            '',
+            '<label for="{}" class="count-choice"><span>{}</span>'
+            '<input type="number" id="{}" name="{}" value="{}" min="0" class="form-control form-control-sm"{}></label>',
+            rows,
+        )
+
+    def value_from_datadict(self, data, files, name):
+        prefix = f'{name}-'
+        return {key[len(prefix):]: data[key] for key in data if key.startswith(prefix)}
+
+    def value_omitted_from_data(self, data, files, name):
+        # An untouched widget posts zeros, never nothing.
+        return False
+
+    def id_for_label(self, id_):
+        return ''
+
+
+class CountedModelMultipleChoiceField(forms.ModelMultipleChoiceField):
+    """
+    ModelMultipleChoiceField with a count per choice. Cleans to a
+    ``{object: count}`` dict holding the choices with a positive count.
+    """
+    widget = CountSelectMultiple
+    default_error_messages = {
+        **forms.ModelMultipleChoiceField.default_error_messages,
+        'invalid_count': _("Soni 0 dan %(max_count)s gacha butun son bo'lishi kerak."),
+    }
+
+    def __init__(self, queryset, max_count=999, **kwargs):
+        self.max_count = max_count
+        super().__init__(queryset, **kwargs)
+
+    def _counts(self, value):
+        """``{pk: count}`` of the positive counts in ``value``; raises on a malformed count."""
+        if not value:
+            return {}
+        if not isinstance(value, dict):
+            # Plain selections (e.g. a list of objects or pks) count once each.
+            value = {getattr(item, 'pk', item): 1 for item in value}
+        counts = {}
+        for pk, count in value.items():
+            try:
+                count = int(count or 0)
+            except (TypeError, ValueError):
+                count = -1
+            if not 0 <= count <= self.max_count:
+                raise ValidationError(
+                    self.error_messages['invalid_count'], code='invalid_count', params={'max_count': self.max_count}
+                )
+            if count:
+                counts[str(pk)] = count
+        return counts
+
+    def clean(self, value):
+        counts = self._counts(value)
+        if self.required and not counts:
+            raise ValidationError(self.error_messages['required'], code='required')
+        if not counts:
+            return {}
+        objects = self._check_values(list(counts))
+        self.run_validators(objects)
+        return {obj: counts[str(obj.pk)] for obj in objects}
+
+    def prepare_value(self, value):
+        if isinstance(value, dict):
+            return {str(getattr(key, 'pk', key)): count for key, count in value.items()}
+        return super().prepare_value(value)
+
+    def has_changed(self, initial, data):
+        if self.disabled:
+            return False
+        try:
+            return self._counts(self.prepare_value(initial)) != self._counts(data)
+        except ValidationError:
+            return True
@@ -0,0 +1,60 @@
+from contextlib import contextmanager
+
+from django.db import IntegrityError, transaction
+from django.core.exceptions import ValidationError
+
+from apps.applications.utils import DUPLICATE_CHECK_FIELDS, find_duplicate_fields, forget_duplicate_free
+
+
+class DuplicateValuesError(Exception):
+    """A unique value was taken between validation and save; the form now carries the field errors."""
+
+
+class UniqueFieldsPrecheckMixin:
+    """
+    ModelForm mixin that checks the unique ``precheck_unique_fields`` with one
+    query (see ``find_duplicate_fields``) instead of one ``validate_unique``
+    existence query per field.
+
+    The check may answer from the short-lived "free" cache, or race with
+    another submission, so views save the instance inside
+    ``guard_unique_values()``.
+    """
+    precheck_unique_fields = DUPLICATE_CHECK_FIELDS
+
+    def validate_unique(self):
+        exclude = self._get_validation_exclusions()
+        exclude.update(self.precheck_unique_fields)
+        try:
+            self.instance.validate_unique(exclude=exclude)
+        except ValidationError as e:
+            self._update_errors(e)
+
+        values = {
+            field: self.cleaned_data.get(field)
+            for field in self.precheck_unique_fields
+            if field in self.fields and field not in self._errors
+        }
+        for field in find_duplicate_fields(values, exclude_pk=self.instance.pk):
+            self.add_error(field, self.instance.unique_error_message(type(self.instance), (field,)))
+
+    @contextmanager
+    def guard_unique_values(self):
+        """
+        Run the block's writes in a savepoint. If they violate the unique
+        constraint of a precheck field, roll them back, add the field errors
+        and raise DuplicateValuesError for the view to re-render the form;
+        other integrity errors propagate.
+        """
+        try:
+            with transaction.atomic():
+                yield
+        except IntegrityError:
+            forget_duplicate_free(self.instance)
+            values = {field: getattr(self.instance, field) for field in self.precheck_unique_fields}
+            taken = find_duplicate_fields(values, exclude_pk=self.instance.pk)
+            if not taken:
+                raise
+            for field in taken:
+                self.add_error(field, self.instance.unique_error_message(type(self.instance), (field,)))
+            raise DuplicateValuesError from None
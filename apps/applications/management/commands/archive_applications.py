@@ -0,0 +1,33 @@
+import time
+from datetime import timedelta
+
+from django.utils import timezone
+from django.core.management.base import BaseCommand
+
+from apps.applications.archive import archivable_applications, archive_finished_applications
+
+
+class Command(BaseCommand):
+    help = "Move approved/rejected applications older than the cutoff into the archive table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=365, help="Archive applications created more than N days ago.")
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--dry-run", action="store_true", help="Only count the matching applications.")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+
+        if options["dry_run"]:
+            count = archivable_applications(cutoff).count()
+            self.stdout.write(f"{count} applications created before {cutoff:%Y-%m-%d} would be archived.")
+            return
+
+        started = time.monotonic()
+        total = 0
+        for archived in archive_finished_applications(cutoff, batch_size=options["batch_size"]):
+            total += archived
+            self.stdout.write(f"Archived {total} applications...")
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {total} applications created before {cutoff:%Y-%m-%d} in {time.monotonic() - started:.1f}s."
+        ))
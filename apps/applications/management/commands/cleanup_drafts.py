@@ -0,0 +1,64 @@
+import time
+from datetime import timedelta
+
+from django.utils import timezone
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from apps.applications.drafts import (
+    abandoned_wizard_files, delete_files, delete_stale_drafts, orphaned_documents, stale_drafts,
+)
+from apps.applications.views.application_wizard import ApplicationWizardView
+from apps.reports.rollups import rebuild_days
+
+
+class Command(BaseCommand):
+    help = "Delete drafts untouched for a while, with their branches and documents, and reclaim orphaned files."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=180, help="Delete drafts not updated for N days.")
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--orphaned-files", action="store_true",
+            help="Also delete unreferenced documents and abandoned wizard uploads older than the cutoff.",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Only count the matching drafts.")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+
+        if options["dry_run"]:
+            count = stale_drafts(cutoff).count()
+            self.stdout.write(f"{count} drafts not updated since {cutoff:%Y-%m-%d} would be deleted.")
+            return
+
+        started = time.monotonic()
+        rows = files = reclaimed = 0
+        days = set()
+        for batch_rows, batch_files, batch_bytes, batch_days in delete_stale_drafts(
+            cutoff, batch_size=options["batch_size"]
+        ):
+            rows += batch_rows
+            files += batch_files
+            reclaimed += batch_bytes
+            days.update(batch_days)
+            self.stdout.write(f"Deleted {rows} rows and {files} files ({reclaimed} bytes)...")
+
+        if options["orphaned_files"]:
+            for storage, names in (
+                (default_storage, orphaned_documents(cutoff)),
+                (ApplicationWizardView.file_storage, abandoned_wizard_files(ApplicationWizardView.file_storage, cutoff)),
+            ):
+                deleted, size = delete_files(storage, names)
+                files += deleted
+                reclaimed += size
+
+        # Deleted drafts no longer count in the daily report rollups.
+        rebuild_days(days)
+
+        elapsed = time.monotonic() - started
+        per_second = 1 / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {rows} rows ({rows * per_second:.0f}/s) and {files} files, "
+            f"{reclaimed} bytes ({reclaimed * per_second:.0f} B/s), in {elapsed:.1f}s."
+        ))
@@ -0,0 +1,62 @@
+import sys
+import time
+from datetime import datetime, time as day_time
+
+from django.utils import timezone
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.applications.bundles import stream_document_bundle
+from apps.applications.choices import ApplicationStatus
+from apps.applications.models import Application
+
+
+def _date(value):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise CommandError(f"Invalid date {value!r}, expected YYYY-MM-DD.")
+
+
+class Command(BaseCommand):
+    help = "Write a ZIP (with manifest.csv) of the documents of the matching applications."
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="Path of the ZIP file to write, or - for stdout.")
+        parser.add_argument("--region", type=int, help="Only applications with a branch in this region (id).")
+        parser.add_argument("--from", dest="date_from", type=_date, help="Created on or after YYYY-MM-DD.")
+        parser.add_argument("--to", dest="date_to", type=_date, help="Created on or before YYYY-MM-DD.")
+        parser.add_argument("--status", choices=ApplicationStatus.values)
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        queryset = Application.objects.exclude(document_file="").exclude(document_file__isnull=True)
+        if options["region"]:
+            queryset = queryset.filter(applicationbranch__branch__district__region_id=options["region"]).distinct()
+        if options["date_from"]:
+            queryset = queryset.filter(
+                created_at__gte=timezone.make_aware(datetime.combine(options["date_from"], day_time.min))
+            )
+        if options["date_to"]:
+            queryset = queryset.filter(
+                created_at__lte=timezone.make_aware(datetime.combine(options["date_to"], day_time.max))
+            )
+        if options["status"]:
+            queryset = queryset.filter(status=options["status"])
+
+        to_stdout = options["output"] == "-"
+        output = sys.stdout.buffer if to_stdout else open(options["output"], "wb")
+        started = time.monotonic()
+        written = 0
+        try:
+            for chunk in stream_document_bundle(queryset, batch_size=options["batch_size"]):
+                output.write(chunk)
+                written += len(chunk)
+        finally:
+            if not to_stdout:
+                output.close()
+
+        elapsed = time.monotonic() - started
+        # Keep stdout clean when the archive itself is written there.
+        (self.stderr if to_stdout else self.stdout).write(self.style.SUCCESS(
+            f"Wrote {written} bytes in {elapsed:.1f}s ({written / elapsed if elapsed else 0:.0f} B/s)."
+        ))
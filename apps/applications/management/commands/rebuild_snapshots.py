@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.applications.choices import ApplicationStatus
+from apps.applications.models import Application
+from apps.applications.snapshots import rebuild_snapshots
+
+
+class Command(BaseCommand):
+    help = "Regenerate the submission snapshots of submitted applications."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--missing-only", action="store_true", help="Only create snapshots for applications without one."
+        )
+
+    def handle(self, *args, **options):
+        queryset = Application.objects.exclude(status=ApplicationStatus.DRAFT)
+        if options["missing_only"]:
+            queryset = queryset.filter(snapshot__isnull=True)
+
+        started = time.monotonic()
+        total = 0
+        for written in rebuild_snapshots(queryset, batch_size=options["batch_size"]):
+            total += written
+            self.stdout.write(f"Wrote {total} snapshots...")
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {total} snapshots in {elapsed:.1f}s ({total / elapsed if elapsed else 0:.0f}/s)."
+        ))
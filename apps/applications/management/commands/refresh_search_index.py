@@ -0,0 +1,19 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.applications.search import refresh_search_documents
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search document of every application."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        processed = refresh_search_documents(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Refreshed {processed} search documents in {time.monotonic() - started:.1f}s."
+        ))
@@ -0,0 +1,53 @@
+import csv
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.applications.choices import ApplicationStatus
+from apps.applications.eligibility import score_application_branches
+from apps.applications.models import ApplicationBranch
+
+
+class Command(BaseCommand):
+    help = "Score every application branch against the requirements matrix and report unmet specialties."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--status", choices=ApplicationStatus.values, help="Only score applications in this status.")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--output", help="Write one CSV row per application branch to this file.")
+
+    def handle(self, *args, **options):
+        queryset = ApplicationBranch.objects.all()
+        if options["status"]:
+            queryset = queryset.filter(application__status=options["status"])
+
+        output = open(options["output"], "w", newline="", encoding="utf-8") if options["output"] else None
+        writer = None
+        if output is not None:
+            writer = csv.writer(output)
+            writer.writerow(["application_id", "application_branch_id", "branch_id", "eligible_specialties", "unmet_specialties"])
+
+        started = time.monotonic()
+        total = unmet_total = 0
+        try:
+            for application_branch, eligible in score_application_branches(queryset, batch_size=options["batch_size"]):
+                unmet = sorted({specialty.pk for specialty in application_branch.specialties.all()} - set(eligible))
+                total += 1
+                unmet_total += bool(unmet)
+                if writer is not None:
+                    writer.writerow([
+                        application_branch.application_id,
+                        application_branch.pk,
+                        application_branch.branch_id,
+                        " ".join(map(str, eligible)),
+                        " ".join(map(str, unmet)),
+                    ])
+        finally:
+            if output is not None:
+                output.close()
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Scored {total} application branches in {elapsed:.1f}s ({total / elapsed if elapsed else 0:.0f}/s); "
+            f"{unmet_total} of them select specialties their inventory does not satisfy."
+        ))
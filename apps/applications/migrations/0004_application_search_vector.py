@@ -0,0 +1,56 @@
+# Generated by Django 5.2.6 on 2026-10-19 12:38
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+FTS_TABLE = "applications_application_fts"
+FTS_COLUMNS = "registration_number, phone_number, email, last_name, first_name, paternal_name"
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE INDEX application_search_vector_gin "
+            "ON applications_application USING gin (search_vector)"
+        )
+        schema_editor.execute(
+            "UPDATE applications_application SET search_vector = "
+            "setweight(to_tsvector('simple', coalesce(registration_number, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(phone_number, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(email, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(last_name, '')), 'B') || "
+            "setweight(to_tsvector('simple', coalesce(first_name, '')), 'B') || "
+            "setweight(to_tsvector('simple', coalesce(paternal_name, '')), 'C')"
+        )
+    elif vendor == "sqlite":
+        schema_editor.execute(f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5({FTS_COLUMNS})")
+        schema_editor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, {FTS_COLUMNS}) "
+            "SELECT id, coalesce(registration_number, ''), phone_number, email, "
+            "last_name, first_name, paternal_name FROM applications_application"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS application_search_vector_gin")
+    elif vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0003_alter_specialistsrequired_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
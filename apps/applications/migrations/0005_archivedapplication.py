@@ -0,0 +1,41 @@
+# Generated by Django 5.2.6 on 2026-10-19 12:43
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0004_application_search_vector'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedApplication',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False, verbose_name='Original ID')),
+                ('first_name', models.CharField(max_length=128, verbose_name='First name')),
+                ('last_name', models.CharField(max_length=128, verbose_name='Last name')),
+                ('paternal_name', models.CharField(max_length=128, verbose_name='Paternal name')),
+                ('full_address', models.CharField(max_length=255, verbose_name='Full address')),
+                ('phone_number', models.CharField(max_length=50, verbose_name='Phone number')),
+                ('email', models.EmailField(max_length=254, verbose_name='Email')),
+                ('document_type', models.CharField(max_length=50, verbose_name='Document type')),
+                ('document_file', models.FileField(blank=True, null=True, upload_to='documents/', verbose_name='Document file')),
+                ('registration_number', models.CharField(blank=True, db_index=True, max_length=128, null=True, verbose_name='Registration number')),
+                ('status', models.CharField(choices=[('draft', 'Draft'), ('submitted', 'Submitted'), ('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected')], verbose_name='Status')),
+                ('created_at', models.DateTimeField(verbose_name='Created at')),
+                ('updated_at', models.DateTimeField(verbose_name='Updated at')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='Archived at')),
+                ('branches', models.JSONField(default=list, verbose_name='Branches')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_applications', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Archived application',
+                'verbose_name_plural': 'Archived applications',
+            },
+        ),
+    ]
@@ -0,0 +1,103 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+COPY_BATCH_SIZE = 2000
+
+# (ApplicationBranch field, through model, target column)
+SELECTIONS = (
+    ('selected_specialists', 'SelectedSpecialist', 'specialist_id'),
+    ('selected_equipment', 'SelectedEquipment', 'equipment_id'),
+)
+
+
+def copy_selections(apps, schema_editor):
+    """Every row of the old auto-created M2M tables becomes a count of 1."""
+    ApplicationBranch = apps.get_model('applications', 'ApplicationBranch')
+    for field, model_name, column in SELECTIONS:
+        model = apps.get_model('applications', model_name)
+        rows = getattr(ApplicationBranch, field).through.objects.order_by('pk').values_list(
+            'applicationbranch_id', column
+        )
+        batch = []
+        for application_branch_id, related_id in rows.iterator(chunk_size=COPY_BATCH_SIZE):
+            batch.append(model(application_branch_id=application_branch_id, **{column: related_id}))
+            if len(batch) >= COPY_BATCH_SIZE:
+                model.objects.bulk_create(batch)
+                batch = []
+        model.objects.bulk_create(batch)
+
+
+def uncopy_selections(apps, schema_editor):
+    """Back to plain M2M rows; the counts are lost."""
+    ApplicationBranch = apps.get_model('applications', 'ApplicationBranch')
+    for field, model_name, column in SELECTIONS:
+        model = apps.get_model('applications', model_name)
+        through = getattr(ApplicationBranch, field).through
+        rows = model.objects.order_by('pk').values_list('application_branch_id', column)
+        batch = []
+        for application_branch_id, related_id in rows.iterator(chunk_size=COPY_BATCH_SIZE):
+            batch.append(through(applicationbranch_id=application_branch_id, **{column: related_id}))
+            if len(batch) >= COPY_BATCH_SIZE:
+                through.objects.bulk_create(batch)
+                batch = []
+        through.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0005_archivedapplication'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SelectedEquipment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=1, verbose_name='Count')),
+                ('application_branch', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='equipment_selections', to='applications.applicationbranch', verbose_name='Application Branch')),
+                ('equipment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='applications.equipment', verbose_name='Equipment')),
+            ],
+            options={
+                'verbose_name': 'Selected Equipment',
+                'verbose_name_plural': 'Selected Equipment',
+                'unique_together': {('application_branch', 'equipment')},
+            },
+        ),
+        migrations.CreateModel(
+            name='SelectedSpecialist',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=1, verbose_name='Count')),
+                ('application_branch', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='specialist_selections', to='applications.applicationbranch', verbose_name='Application Branch')),
+                ('specialist', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='applications.specialist', verbose_name='Specialist')),
+            ],
+            options={
+                'verbose_name': 'Selected Specialist',
+                'verbose_name_plural': 'Selected Specialists',
+                'unique_together': {('application_branch', 'specialist')},
+            },
+        ),
+        migrations.RunPython(copy_selections, uncopy_selections),
+        # A plain M2M cannot be altered into one with a through model, so the
+        # fields are recreated on top of the tables filled above.
+        migrations.RemoveField(
+            model_name='applicationbranch',
+            name='selected_equipment',
+        ),
+        migrations.RemoveField(
+            model_name='applicationbranch',
+            name='selected_specialists',
+        ),
+        migrations.AddField(
+            model_name='applicationbranch',
+            name='selected_equipment',
+            field=models.ManyToManyField(blank=True, through='applications.SelectedEquipment', to='applications.equipment', verbose_name='Selected Equipment'),
+        ),
+        migrations.AddField(
+            model_name='applicationbranch',
+            name='selected_specialists',
+            field=models.ManyToManyField(blank=True, through='applications.SelectedSpecialist', to='applications.specialist', verbose_name='Selected Specialists'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.6 on 2026-10-19 13:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0006_selected_counts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationSnapshot',
+            fields=[
+                ('application', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='snapshot', serialize=False, to='applications.application', verbose_name='Application')),
+                ('document', models.JSONField(verbose_name='Document')),
+                ('submitted_at', models.DateTimeField(auto_now_add=True, verbose_name='Submitted at')),
+            ],
+            options={
+                'verbose_name': 'Application snapshot',
+                'verbose_name_plural': 'Application snapshots',
+            },
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.core.validators import RegexValidator
+from django.contrib.postgres.search import SearchVectorField
 from django.utils.translation import gettext_lazy as _
 
 from apps.applications.choices import ApplicationStatus
@@ -192,6 +193,9 @@ class Application(models.Model):
     status = models.CharField(
         choices=ApplicationStatus.choices,
         default=ApplicationStatus.DRAFT)
+    # Maintained by apps.applications.search (GIN-indexed on PostgreSQL,
+    # mirrored into an FTS5 table on SQLite).
+    search_vector = SearchVectorField(null=True, editable=False)
 
     def __str__(self):
         return f"{self.registration_number}"
@@ -215,11 +219,13 @@ class ApplicationBranch(models.Model):
     specialties = models.ManyToManyField("applications.Specialty", verbose_name="Specialties")
     selected_specialists = models.ManyToManyField(
         "applications.Specialist",
+        through="applications.SelectedSpecialist",
         blank=True,
         verbose_name=_("Selected Specialists"),
         )
     selected_equipment = models.ManyToManyField(
         "applications.Equipment",
+        through="applications.SelectedEquipment",
         blank=True,
         verbose_name=_("Selected Equipment"),
         )
@@ -230,3 +236,126 @@ class ApplicationBranch(models.Model):
     class Meta:
         verbose_name = "Application Branch"
         verbose_name = "Applications Branch"
+
+
+class SelectedSpecialist(models.Model):
+    """How many specialists of one type a branch has."""
+    application_branch = models.ForeignKey(
+        "applications.ApplicationBranch",
+        on_delete=models.CASCADE,
+        related_name="specialist_selections",
+        verbose_name=_("Application Branch")
+    )
+    specialist = models.ForeignKey(
+        "applications.Specialist",
+        on_delete=models.CASCADE,
+        verbose_name=_("Specialist")
+    )
+    count = models.PositiveIntegerField(
+        default=1,
+        verbose_name=_("Count")
+    )
+
+    def __str__(self):
+        return f"{self.specialist.title} ({self.count})"
+
+    class Meta:
+        verbose_name = _("Selected Specialist")
+        verbose_name_plural = _("Selected Specialists")
+        unique_together = ('application_branch', 'specialist')
+
+
+class SelectedEquipment(models.Model):
+    """How many items of one equipment type a branch has."""
+    application_branch = models.ForeignKey(
+        "applications.ApplicationBranch",
+        on_delete=models.CASCADE,
+        related_name="equipment_selections",
+        verbose_name=_("Application Branch")
+    )
+    equipment = models.ForeignKey(
+        "applications.Equipment",
+        on_delete=models.CASCADE,
+        verbose_name=_("Equipment")
+    )
+    count = models.PositiveIntegerField(
+        default=1,
+        verbose_name=_("Count")
+    )
+
+    def __str__(self):
+        return f"{self.equipment.name} ({self.count})"
+
+    class Meta:
+        verbose_name = _("Selected Equipment")
+        verbose_name_plural = _("Selected Equipment")
+        unique_together = ('application_branch', 'equipment')
+
+
+class ArchivedApplication(models.Model):
+    """
+    Finished (approved/rejected) application moved out of the hot tables by
+    ``manage.py archive_applications``. Keeps the original primary key so old
+    links keep working; branches are stored denormalized in ``branches``.
+    """
+    id = models.BigIntegerField(primary_key=True, verbose_name=_("Original ID"))
+    user = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        related_name="archived_applications",
+        verbose_name=_("User")
+    )
+    first_name = models.CharField(max_length=128, verbose_name=_("First name"))
+    last_name = models.CharField(max_length=128, verbose_name=_("Last name"))
+    paternal_name = models.CharField(max_length=128, verbose_name=_("Paternal name"))
+    full_address = models.CharField(max_length=255, verbose_name=_("Full address"))
+    phone_number = models.CharField(max_length=50, verbose_name=_("Phone number"))
+    email = models.EmailField(verbose_name=_("Email"))
+    document_type = models.CharField(max_length=50, verbose_name=_("Document type"))
+    document_file = models.FileField(
+        upload_to='documents/',
+        blank=True,
+        null=True,
+        verbose_name=_("Document file"))
+    registration_number = models.CharField(
+        max_length=128,
+        blank=True,
+        null=True,
+        db_index=True,
+        verbose_name=_("Registration number"))
+    status = models.CharField(choices=ApplicationStatus.choices, verbose_name=_("Status"))
+    created_at = models.DateTimeField(verbose_name=_("Created at"))
+    updated_at = models.DateTimeField(verbose_name=_("Updated at"))
+    archived_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Archived at"))
+    branches = models.JSONField(default=list, verbose_name=_("Branches"))
+
+    def __str__(self):
+        return f"{self.registration_number}"
+
+    class Meta:
+        verbose_name = _("Archived application")
+        verbose_name_plural = _("Archived applications")
+
+
+class ApplicationSnapshot(models.Model):
+    """
+    The application as submitted, denormalized into one JSON document
+    (see ``apps.applications.snapshots``) so read paths fetch a single row
+    by primary key instead of joining branches, locations and selections.
+    """
+    application = models.OneToOneField(
+        "applications.Application",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="snapshot",
+        verbose_name=_("Application")
+    )
+    document = models.JSONField(verbose_name=_("Document"))
+    submitted_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Submitted at"))
+
+    def __str__(self):
+        return f"{self.document.get('registration_number')}"
+
+    class Meta:
+        verbose_name = _("Application snapshot")
+        verbose_name_plural = _("Application snapshots")
@@ -0,0 +1,129 @@
+import re
+
+from django.db import connections, router
+from django.db.models import F, FloatField
+from django.db.models.expressions import RawSQL
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+
+from apps.applications.models import Application
+
+
+SEARCH_CONFIG = "simple"
+FTS_TABLE = "applications_application_fts"
+
+# (field, Postgres weight) of the columns that make up the search document
+SEARCH_FIELDS = (
+    ("registration_number", "A"),
+    ("phone_number", "A"),
+    ("email", "A"),
+    ("last_name", "B"),
+    ("first_name", "B"),
+    ("paternal_name", "C"),
+)
+
+_UNSAFE_CHARS_RE = re.compile(r"['\"\\:&|!()*<>]")
+
+
+def uses_postgres(using):
+    return connections[using].vendor == "postgresql"
+
+
+def _write_db():
+    return router.db_for_write(Application)
+
+
+def search_vector():
+    vector = None
+    for field, weight in SEARCH_FIELDS:
+        part = SearchVector(field, weight=weight, config=SEARCH_CONFIG)
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def _terms(query):
+    return [term for term in (_UNSAFE_CHARS_RE.sub(" ", token).strip() for token in query.split()) if term]
+
+
+def refresh_search_documents(queryset=None, batch_size=1000):
+    """
+    Recompute the search document of the given applications (all by default)
+    in primary-key batches. Returns the number of applications processed.
+    """
+    queryset = (queryset if queryset is not None else Application.objects.all()).order_by("pk")
+    processed = 0
+    last_pk = 0
+    while True:
+        pks = list(queryset.filter(pk__gt=last_pk).values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            return processed
+        using = _write_db()
+        if uses_postgres(using):
+            Application.objects.using(using).filter(pk__in=pks).update(search_vector=search_vector())
+        else:
+            _refresh_fts(pks, using)
+        processed += len(pks)
+        last_pk = pks[-1]
+
+
+def _refresh_fts(pks, using):
+    columns = ", ".join(field for field, _ in SEARCH_FIELDS)
+    values = ", ".join(f"COALESCE({field}, '')" for field, _ in SEARCH_FIELDS)
+    placeholders = ", ".join(["%s"] * len(pks))
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", pks)
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, {columns}) "
+            f"SELECT id, {values} FROM {Application._meta.db_table} WHERE id IN ({placeholders})",
+            pks,
+        )
+
+
+def remove_search_document(pk):
+    remove_search_documents([pk])
+
+
+def remove_search_documents(pks):
+    """Drop the search documents of applications deleted without signals (bulk deletes)."""
+    using = _write_db()
+    if pks and not uses_postgres(using):
+        placeholders = ", ".join(["%s"] * len(pks))
+        with connections[using].cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", list(pks))
+
+
+def search_applications(query, queryset=None):
+    """
+    Return ``queryset`` (all applications by default) filtered to the
+    applications matching ``query`` and annotated with a ``rank``, best match
+    first. Every search term is matched as a prefix.
+
+    Both backends search in SQL on the database the queryset reads from, so
+    results stay lazy and uncapped; slice the result to page through it.
+    """
+    queryset = queryset if queryset is not None else Application.objects.all()
+    terms = _terms(query)
+    if not terms:
+        return queryset.none()
+
+    if uses_postgres(queryset.db):
+        search_query = SearchQuery(
+            " & ".join(f"'{term}':*" for term in terms), search_type="raw", config=SEARCH_CONFIG
+        )
+        return (
+            queryset.filter(search_vector=search_query)
+            .annotate(rank=SearchRank(F("search_vector"), search_query))
+            .order_by("-rank", "-created_at")
+        )
+
+    match = " ".join(f'"{term}"*' for term in terms)
+    table = Application._meta.db_table
+    return (
+        queryset.filter(pk__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]))
+        # bm25() is lower for better matches
+        .annotate(rank=RawSQL(
+            f"SELECT -bm25({FTS_TABLE}) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND rowid = \"{table}\".\"id\"",
+            [match],
+            output_field=FloatField(),
+        ))
+        .order_by("-rank", "-created_at")
+    )
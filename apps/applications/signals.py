@@ -0,0 +1,58 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+from apps.applications.autocomplete import AUTOCOMPLETE_NAMESPACE
+from apps.applications.cache import REFERENCE_CACHE_NAMESPACE
+from apps.applications.models import (
+    Application, Region, District, Branch, Specialty, Specialist, SpecialistsRequired,
+    Equipment, EquipmentRequired, EquipmentRequiredItem,
+)
+from apps.applications.search import refresh_search_documents, remove_search_document
+from apps.applications.utils import forget_duplicate_free
+from apps.common.cache import invalidate_namespace
+
+
+# Rarely changing data that is cached under REFERENCE_CACHE_NAMESPACE.
+REFERENCE_MODELS = (
+    Region, District, Branch, Specialty, Specialist, SpecialistsRequired,
+    Equipment, EquipmentRequired, EquipmentRequiredItem,
+)
+
+
+def invalidate_reference_cache(sender, **kwargs):
+    # Bump the version only after commit, otherwise a concurrent request could
+    # re-cache the old rows before our transaction becomes visible.
+    transaction.on_commit(lambda: invalidate_namespace(REFERENCE_CACHE_NAMESPACE))
+
+
+for model in REFERENCE_MODELS:
+    post_save.connect(invalidate_reference_cache, sender=model, dispatch_uid=f"invalidate-save-{model.__name__}")
+    post_delete.connect(invalidate_reference_cache, sender=model, dispatch_uid=f"invalidate-delete-{model.__name__}")
+
+
+def invalidate_autocomplete_index(sender, **kwargs):
+    transaction.on_commit(lambda: invalidate_namespace(AUTOCOMPLETE_NAMESPACE))
+
+
+for model in (Region, District, Branch):
+    post_save.connect(invalidate_autocomplete_index, sender=model, dispatch_uid=f"autocomplete-save-{model.__name__}")
+    post_delete.connect(invalidate_autocomplete_index, sender=model, dispatch_uid=f"autocomplete-delete-{model.__name__}")
+
+
+def forget_application_unique_values(sender, instance, **kwargs):
+    transaction.on_commit(lambda: forget_duplicate_free(instance))
+
+
+post_save.connect(forget_application_unique_values, sender=Application, dispatch_uid="forget-duplicate-free")
+
+
+def update_search_document(sender, instance, **kwargs):
+    refresh_search_documents(Application.objects.filter(pk=instance.pk))
+
+
+def delete_search_document(sender, instance, **kwargs):
+    remove_search_document(instance.pk)
+
+
+post_save.connect(update_search_document, sender=Application, dispatch_uid="update-search-document")
+post_delete.connect(delete_search_document, sender=Application, dispatch_uid="delete-search-document")
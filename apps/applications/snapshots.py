@@ -0,0 +1,100 @@
+from apps.applications.choices import ApplicationStatus
+from apps.applications.models import Application, ApplicationSnapshot
+
+
+# Prefetches branch_documents() relies on
+BRANCH_DOCUMENT_PREFETCH = (
+    'applicationbranch_set__branch__district__region',
+    'applicationbranch_set__specialties',
+    'applicationbranch_set__specialist_selections__specialist',
+    'applicationbranch_set__equipment_selections__equipment',
+)
+
+SNAPSHOT_FIELDS = (
+    'user_id', 'first_name', 'last_name', 'paternal_name', 'full_address', 'phone_number',
+    'email', 'document_type', 'registration_number', 'status',
+)
+
+
+def branch_documents(application):
+    """Denormalized branches of an application with prefetched applicationbranch_set."""
+    documents = []
+    for application_branch in application.applicationbranch_set.all():
+        branch = application_branch.branch
+        documents.append({
+            'branch': {
+                'id': branch.pk,
+                'branch_name': branch.branch_name,
+                'district_id': branch.district_id,
+                'district_name': branch.district.district_name,
+                'region_id': branch.district.region_id,
+                'region_name': branch.district.region.region_name,
+            },
+            'specialties': [
+                {'id': specialty.pk, 'name': specialty.name}
+                for specialty in application_branch.specialties.all()
+            ],
+            'selected_specialists': [
+                {'id': selection.specialist_id, 'title': selection.specialist.title, 'count': selection.count}
+                for selection in application_branch.specialist_selections.all()
+            ],
+            'selected_equipment': [
+                {
+                    'id': selection.equipment_id,
+                    'name': selection.equipment.name,
+                    'description': selection.equipment.description,
+                    'count': selection.count,
+                }
+                for selection in application_branch.equipment_selections.all()
+            ],
+        })
+    return documents
+
+
+def snapshot_document(application):
+    """The JSON document of an application with prefetched BRANCH_DOCUMENT_PREFETCH."""
+    document = {field: getattr(application, field) for field in SNAPSHOT_FIELDS}
+    document['id'] = application.pk
+    document['document_file'] = application.document_file.name or ''
+    document['created_at'] = application.created_at.isoformat()
+    document['branches'] = branch_documents(application)
+    return document
+
+
+def write_snapshot(application):
+    """
+    Store the snapshot of a just-submitted application. Reads the
+    application back so the branches saved in this transaction are included.
+    """
+    application = Application.objects.prefetch_related(*BRANCH_DOCUMENT_PREFETCH).get(pk=application.pk)
+    snapshot, _ = ApplicationSnapshot.objects.update_or_create(
+        application=application, defaults={'document': snapshot_document(application)}
+    )
+    return snapshot
+
+
+def rebuild_snapshots(queryset=None, batch_size=500):
+    """
+    Regenerate the snapshots of ``queryset`` (every non-draft application by
+    default) in primary-key ordered batches, one upsert per batch. Yields the
+    number of snapshots written per batch.
+    """
+    if queryset is None:
+        queryset = Application.objects.exclude(status=ApplicationStatus.DRAFT)
+    queryset = queryset.order_by('pk').prefetch_related(*BRANCH_DOCUMENT_PREFETCH)
+    last_pk = 0
+    while True:
+        applications = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+        if not applications:
+            return
+        ApplicationSnapshot.objects.bulk_create(
+            [
+                ApplicationSnapshot(application=application, document=snapshot_document(application))
+                for application in applications
+            ],
+            update_conflicts=True,
+            unique_fields=['application'],
+            update_fields=['document'],
+        )
+        yield len(applications)
+        last_pk = applications[-1].pk
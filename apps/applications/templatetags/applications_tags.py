@@ -0,0 +1,13 @@
+from django import template
+from django.urls import reverse
+
+from apps.applications.cache import get_requirements_matrix
+
+register = template.Library()
+
+
+@register.simple_tag
+def requirements_matrix_url():
+    """Versioned URL of the requirements matrix (changes whenever its content does)."""
+    version, _ = get_requirements_matrix()
+    return reverse('applications:requirements_matrix', kwargs={'version': version})
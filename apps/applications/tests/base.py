@@ -0,0 +1,197 @@
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse_lazy
+
+from apps.applications.models import (
+    Application, ApplicationBranch, Branch, District, Equipment, EquipmentRequired, EquipmentRequiredItem,
+    Region, SelectedEquipment, SelectedSpecialist, Specialist, SpecialistsRequired, Specialty,
+)
+from apps.users.models import CustomUser
+
+
+class ApplicationDataMixin:
+    """Reference data (one region, district, branch and specialty with its requirements) and a logged-in user."""
+    databases = {'default', 'replica'}
+    password = "pass12345"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.region = Region.objects.create(region_name="Toshkent")
+        cls.district = District.objects.create(region=cls.region, district_name="Yunusobod")
+        cls.branch = Branch.objects.create(district=cls.district, branch_name="Filial 1")
+        cls.specialty = Specialty.objects.create(name="Terapiya")
+        cls.specialist = Specialist.objects.create(title="Hamshira")
+        cls.equipment = Equipment.objects.create(name="EKG")
+        SpecialistsRequired.objects.create(specialty=cls.specialty, required_specialists=cls.specialist, min_count=1)
+        equipment_required = EquipmentRequired.objects.create(specialty=cls.specialty)
+        EquipmentRequiredItem.objects.create(equipment_required=equipment_required, equipment=cls.equipment, min_count=1)
+        cls.user = CustomUser.objects.create_user(
+            email="user@example.uz", password=cls.password, first_name="Ali", last_name="Valiyev"
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def create_application(self, index=0, with_branch=True, **fields):
+        fields = {
+            'user': self.user, 'first_name': "Ali", 'last_name': "Valiyev", 'paternal_name': "Karimovich",
+            'full_address': "Toshkent", 'phone_number': f"+99890000{index:04d}", 'email': f"ali{index}@example.uz",
+            'document_type': "passport", **fields,
+        }
+        application = Application.objects.create(**fields)
+        if with_branch:
+            application_branch = ApplicationBranch.objects.create(application=application, branch=self.branch)
+            application_branch.specialties.add(self.specialty)
+            SelectedSpecialist.objects.create(application_branch=application_branch, specialist=self.specialist, count=1)
+            SelectedEquipment.objects.create(application_branch=application_branch, equipment=self.equipment, count=1)
+        return application
+
+    def application_data(self, **extra):
+        data = {
+            'first_name': "Ali", 'last_name': "Valiyev", 'paternal_name': "Karimovich", 'full_address': "Toshkent",
+            'phone_number': "+998901112233", 'email': "ali@example.uz", 'document_type': "passport",
+        }
+        data.update(extra)
+        return {key: value for key, value in data.items() if value is not None}
+
+    def branch_data(self, prefix=''):
+        return {
+            f'{prefix}branch': str(self.branch.pk),
+            f'{prefix}specialties': [str(self.specialty.pk)],
+            f'{prefix}selected_specialists-{self.specialist.pk}': "1",
+            f'{prefix}selected_equipment-{self.equipment.pk}': "1",
+        }
+
+    def branch_formset_data(self, count=1, initial=0):
+        data = {
+            'applicationbranch_set-TOTAL_FORMS': str(count), 'applicationbranch_set-INITIAL_FORMS': str(initial),
+            'applicationbranch_set-MIN_NUM_FORMS': "0", 'applicationbranch_set-MAX_NUM_FORMS': "1000",
+        }
+        for index in range(count):
+            data.update(self.branch_data(prefix=f'applicationbranch_set-{index}-'))
+        return data
+
+
+class WizardMixin:
+    """Posts the steps of ApplicationWizardView; use with ApplicationDataMixin and TemporaryMediaMixin."""
+    wizard_url = reverse_lazy('applications:application_wizard')
+    wizard_prefix = 'application_wizard_view'
+
+    def wizard_steps(self, branches=1, document=b"%PDF-1.4 test"):
+        """(step, data) pairs that walk the wizard to submission."""
+        personal = self.application_data(document_type=None)
+        branch_data = {
+            'TOTAL_FORMS': str(branches), 'INITIAL_FORMS': "0", 'MIN_NUM_FORMS': "0", 'MAX_NUM_FORMS': "1000",
+        }
+        for index in range(branches):
+            branch_data.update(self.branch_data(prefix=f'{index}-'))
+        return [
+            ('personal', personal),
+            ('document', {
+                'document_type': "passport",
+                'document_file': SimpleUploadedFile("passport.pdf", document, content_type="application/pdf"),
+            }),
+            ('branches', branch_data),
+            ('review', {'confirm': "on"}),
+        ]
+
+    def post_wizard_step(self, step, data, **extra):
+        payload = {f'{self.wizard_prefix}-current_step': step, **extra}
+        payload.update({f'{step}-{name}': value for name, value in data.items()})
+        return self.client.post(self.wizard_url, payload)
+
+    def submit_wizard(self, **kwargs):
+        """Post every step; returns the response to the last one."""
+        self.client.get(self.wizard_url)
+        for step, data in self.wizard_steps(**kwargs):
+            response = self.post_wizard_step(step, data)
+        return response
+
+
+class TemporaryMediaMixin:
+    """Points MEDIA_ROOT, and the wizard's upload storage below it, at a directory removed after the test."""
+
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.wizard_storage = FileSystemStorage(location=os.path.join(self.media_root, 'wizard'))
+        storage_patch = mock.patch(
+            'apps.applications.views.application_wizard.ApplicationWizardView.file_storage', self.wizard_storage
+        )
+        storage_patch.start()
+        self.addCleanup(storage_patch.stop)
+
+    def media_files(self, directory=''):
+        """Paths below MEDIA_ROOT/``directory``, relative to it."""
+        root = os.path.join(self.media_root, directory)
+        return sorted(
+            os.path.relpath(os.path.join(path, name), root)
+            for path, _, names in os.walk(root)
+            for name in names
+        )
+
+
+class CaptureStatements(CaptureQueriesContext):
+    """
+    Captured queries grouped by transaction. Inside a TestCase every atomic
+    block is a savepoint, so the outermost savepoints are the transactions
+    the code under test opened; statements outside them ran in autocommit.
+    """
+
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        super().__init__(connections[using])
+
+    def statements(self, keyword):
+        return [query['sql'] for query in self.captured_queries if query['sql'].upper().startswith(keyword)]
+
+    @property
+    def begins(self):
+        return self.statements('BEGIN')
+
+    @property
+    def transactions(self):
+        """The statements of each outermost atomic block, ignoring session saves."""
+        transactions, depth = [], 0
+        for query in self.captured_queries:
+            sql = query['sql'].upper()
+            if sql.startswith('SAVEPOINT'):
+                if depth == 0:
+                    transactions.append([])
+                depth += 1
+            elif sql.startswith(('RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT')):
+                # ROLLBACK TO keeps the savepoint open; its RELEASE follows.
+                depth -= sql.startswith('RELEASE')
+            elif depth:
+                transactions[-1].append(query['sql'])
+        return [
+            statements for statements in transactions
+            if not all('"django_session"' in statement for statement in statements)
+        ]
+
+    @property
+    def autocommit_writes(self):
+        """INSERT/UPDATE/DELETE statements run outside any atomic block."""
+        writes, depth = [], 0
+        for query in self.captured_queries:
+            sql = query['sql'].upper()
+            if sql.startswith('SAVEPOINT'):
+                depth += 1
+            elif sql.startswith('RELEASE SAVEPOINT'):
+                depth -= 1
+            elif depth == 0 and sql.startswith(('INSERT', 'UPDATE', 'DELETE')):
+                writes.append(query['sql'])
+        return writes
@@ -0,0 +1,115 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.applications.archive import archive_batch, archive_finished_applications
+from apps.applications.choices import ApplicationStatus
+from apps.applications.models import Application, ApplicationBranch, ArchivedApplication, SelectedSpecialist
+from apps.applications.tests.base import ApplicationDataMixin
+from apps.users.models import CustomUser
+
+
+class ArchiveTests(ApplicationDataMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.cutoff = timezone.now() - timedelta(days=365)
+
+    def create_finished(self, index, status=ApplicationStatus.APPROVED, age=timedelta(days=400), **fields):
+        application = self.create_application(index=index, status=status, registration_number=f"REG-{index}", **fields)
+        Application.objects.filter(pk=application.pk).update(created_at=timezone.now() - age)
+        return application
+
+    def test_archives_finished_applications_in_batches(self):
+        finished = [self.create_finished(index) for index in range(5)]
+        rejected = self.create_finished(5, status=ApplicationStatus.REJECTED)
+        recent = self.create_finished(6, age=timedelta(days=10))
+        pending = self.create_finished(7, status=ApplicationStatus.PENDING)
+
+        self.assertEqual(list(archive_finished_applications(self.cutoff, batch_size=2)), [2, 2, 2])
+
+        self.assertEqual(
+            set(ArchivedApplication.objects.values_list('pk', flat=True)),
+            {application.pk for application in finished + [rejected]},
+        )
+        self.assertEqual(set(Application.objects.all()), {recent, pending})
+        self.assertFalse(ApplicationBranch.objects.filter(application_id=rejected.pk).exists())
+        self.assertFalse(SelectedSpecialist.objects.filter(application_branch__application_id=rejected.pk).exists())
+
+        archived = ArchivedApplication.objects.get(pk=rejected.pk)
+        self.assertEqual(archived.registration_number, "REG-5")
+        self.assertEqual(archived.status, ApplicationStatus.REJECTED)
+        self.assertEqual(archived.branches[0]['branch']['id'], self.branch.pk)
+        self.assertEqual(archived.branches[0]['specialties'], [{'id': self.specialty.pk, 'name': "Terapiya"}])
+
+    def test_skips_rows_that_changed_after_the_scan(self):
+        reopened = self.create_finished(0)
+        kept = self.create_finished(1)
+        # A reviewer reopens the application between the pk scan and the lock.
+        Application.objects.filter(pk=reopened.pk).update(status=ApplicationStatus.PENDING)
+
+        self.assertEqual(archive_batch([reopened.pk, kept.pk], self.cutoff), 1)
+
+        self.assertEqual(list(ArchivedApplication.objects.values_list('pk', flat=True)), [kept.pk])
+        self.assertEqual(list(Application.objects.all()), [reopened])
+
+    def test_command(self):
+        self.create_finished(0)
+        out = StringIO()
+        call_command('archive_applications', '--dry-run', stdout=out)
+        self.assertIn("1 applications created before", out.getvalue())
+        self.assertFalse(ArchivedApplication.objects.exists())
+
+        call_command('archive_applications', '--batch-size=1', stdout=out)
+        self.assertEqual(ArchivedApplication.objects.count(), 1)
+        self.assertFalse(Application.objects.exists())
+
+    def test_detail_view_serves_archived_applications(self):
+        application = self.create_finished(0)
+        self.assertEqual(list(archive_finished_applications(self.cutoff)), [1])
+
+        response = self.client.get(reverse('applications:application_detail', args=[application.pk]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.context['application'], ArchivedApplication)
+        self.assertContains(response, "REG-0")
+        self.assertContains(response, "Filial 1")
+
+        other = CustomUser.objects.create_user(email="other@example.uz", password=self.password)
+        self.client.force_login(other)
+        response = self.client.get(reverse('applications:application_detail', args=[application.pk]))
+        self.assertEqual(response.status_code, 404)
+
+
+class ArchivedApplicationAdminTests(ApplicationDataMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.admin = CustomUser.objects.create_superuser(email="admin@example.uz", password=self.password)
+        self.client.force_login(self.admin)
+        application = self.create_application(status=ApplicationStatus.APPROVED, registration_number="REG-0")
+        archive_batch([application.pk], timezone.now() + timedelta(days=1))
+        self.archived = ArchivedApplication.objects.get()
+
+    def test_changelist(self):
+        response = self.client.get(reverse('admin:applications_archivedapplication_changelist'), {'q': "REG-0"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context['cl'].result_list), [self.archived])
+
+    def test_read_only(self):
+        url = reverse('admin:applications_archivedapplication_change', args=[self.archived.pk])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.context['has_change_permission'])
+
+        response = self.client.post(url, {'first_name': "Vali"})
+        self.assertEqual(response.status_code, 403)
+        self.archived.refresh_from_db()
+        self.assertEqual(self.archived.first_name, "Ali")
+
+        response = self.client.get(reverse('admin:applications_archivedapplication_add'))
+        self.assertEqual(response.status_code, 403)
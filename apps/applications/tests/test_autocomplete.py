@@ -0,0 +1,137 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from apps.applications import autocomplete
+from apps.applications.autocomplete import AutocompleteIndex, get_index, normalize
+from apps.applications.models import Branch, District, Region
+from apps.applications.tests.base import ApplicationDataMixin
+
+
+class NormalizeTests(SimpleTestCase):
+
+    def test_cyrillic_and_apostrophes(self):
+        for text in ("Қўқон", "Qo'qon", "Qo‘qon", "QOʻQON", "qoqon"):
+            with self.subTest(text=text):
+                self.assertEqual(normalize(text), "qoqon")
+
+    def test_punctuation(self):
+        self.assertEqual(normalize("  Farg'ona | Qo'qon-1 "), "fargona qoqon 1")
+        self.assertEqual(normalize(None), "")
+
+
+class AutocompleteDataMixin(ApplicationDataMixin):
+    """Adds Farg'ona / Qo'qon with a branch, and a Yunusobod branch named after Qo'qon; starts without an index."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.fergana = Region.objects.create(region_name="Farg'ona")
+        cls.kokand = District.objects.create(region=cls.fergana, district_name="Qo'qon")
+        cls.kokand_branch = Branch.objects.create(district=cls.kokand, branch_name="Markaziy filial")
+        cls.yunusobod_branch = Branch.objects.create(district=cls.district, branch_name="Qo'qon ko'chasi filiali")
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        patcher = mock.patch.multiple(autocomplete, _index=None, _index_version=None, _checked_at=0.0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class AutocompleteIndexTests(AutocompleteDataMixin, TestCase):
+
+    def lookup(self, query, **kwargs):
+        return [(entry.kind, entry.id) for entry in get_index().lookup(query, **kwargs)]
+
+    def test_prefix_lookup_in_any_script(self):
+        for query in ("Қўқ", "qo'q", "qoq"):
+            with self.subTest(query=query):
+                # The district itself first, then the entries found under it or by name.
+                self.assertEqual(self.lookup(query), [
+                    ("district", self.kokand.pk),
+                    ("branch", self.yunusobod_branch.pk),
+                    ("branch", self.kokand_branch.pk),
+                ])
+
+    def test_every_token_must_match(self):
+        self.assertEqual(self.lookup("qoqon mark"), [("branch", self.kokand_branch.pk)])
+
+    def test_trigram_fallback(self):
+        # No word starts with "arkaz"; found as a substring.
+        self.assertEqual(self.lookup("arkaz"), [("branch", self.kokand_branch.pk)])
+        self.assertEqual(self.lookup("xyz"), [])
+
+    def test_filters_and_limit(self):
+        self.assertEqual(self.lookup("qoqon", kind="branch", region_id=self.region.pk), [
+            ("branch", self.yunusobod_branch.pk),
+        ])
+        self.assertEqual(self.lookup("qoqon", district_id=self.kokand.pk), [
+            ("district", self.kokand.pk), ("branch", self.kokand_branch.pk),
+        ])
+        self.assertEqual(len(self.lookup("qoqon", limit=1)), 1)
+
+    def test_rebuilt_after_namespace_bump(self):
+        index = get_index()
+        with self.assertNumQueries(0):
+            self.assertIs(get_index(), index)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Region.objects.create(region_name="Namangan")
+        with mock.patch.object(autocomplete, "VERSION_CHECK_INTERVAL", 0):
+            rebuilt = get_index()
+            self.assertIs(get_index(), rebuilt)
+
+        self.assertIsNot(rebuilt, index)
+        self.assertEqual([entry.kind for entry in rebuilt.lookup("naman")], ["region"])
+
+    def test_stale_index_is_kept_until_the_next_version_check(self):
+        index = get_index()
+        with self.captureOnCommitCallbacks(execute=True):
+            Region.objects.create(region_name="Namangan")
+
+        self.assertIs(get_index(), index)
+        self.assertEqual(index.lookup("naman"), [])
+
+    def test_build(self):
+        index = AutocompleteIndex.build()
+        branch = next(entry for entry in index.entries if entry.kind == "branch" and entry.id == self.kokand_branch.pk)
+        self.assertEqual(branch.label, "Qo'qon | Farg'ona | Markaziy filial")
+        self.assertEqual((branch.region_id, branch.district_id), (self.fergana.pk, self.kokand.pk))
+
+
+class AutocompleteViewTests(AutocompleteDataMixin, TestCase):
+    url = reverse('applications:autocomplete')
+
+    def get(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return [(result['kind'], result['id']) for result in response.json()['results']]
+
+    def test_parameters(self):
+        self.assertEqual(self.get(q="Қўқон", kind="district"), [("district", self.kokand.pk)])
+        self.assertEqual(self.get(q="qoqon", kind="branch", region=self.region.pk), [
+            ("branch", self.yunusobod_branch.pk),
+        ])
+        self.assertEqual(self.get(q="qoqon", district=self.kokand.pk, limit=1), [("district", self.kokand.pk)])
+        # Unknown kinds and malformed ids are ignored.
+        self.assertEqual(len(self.get(q="qoqon", kind="country", region="x")), 3)
+
+    def test_limit_is_capped(self):
+        Region.objects.bulk_create(Region(region_name=f"Qoqon {index}") for index in range(60))
+        self.assertEqual(len(self.get(q="qoqon", limit=100)), 50)
+        self.assertEqual(len(self.get(q="qoqon")), 10)
+
+    def test_result_fields(self):
+        response = self.client.get(self.url, {'q': "markaziy"})
+        self.assertEqual(response.json()['results'], [{
+            'kind': "branch", 'id': self.kokand_branch.pk, 'name': "Markaziy filial",
+            'label': "Qo'qon | Farg'ona | Markaziy filial",
+            'region_id': self.fergana.pk, 'district_id': self.kokand.pk,
+        }])
+
+    def test_login_required(self):
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url, {'q': "qoqon"}).status_code, 302)
@@ -0,0 +1,70 @@
+from django.db import connection
+from django.test import TestCase
+
+from apps.applications.forms import ApplicationBranchForm, ApplicationBranchFormSet
+from apps.applications.models import ApplicationBranch, SelectedEquipment, SelectedSpecialist, Specialty
+from apps.applications.tests.base import ApplicationDataMixin, CaptureStatements
+
+
+class BranchFormSetSaveTests(ApplicationDataMixin, TestCase):
+    """Saving branches costs the same number of statements for 1 or 20 branches."""
+
+    def formset(self, application, count, initial=0):
+        data = self.branch_formset_data(count=count, initial=initial)
+        branches = ApplicationBranch.objects.filter(application=application).order_by('pk')
+        for index, application_branch in enumerate(branches):
+            data[f'applicationbranch_set-{index}-id'] = str(application_branch.pk)
+        formset = ApplicationBranchFormSet(data, instance=application)
+        self.assertTrue(formset.is_valid(), formset.errors)
+        return formset
+
+    def test_create_branches(self):
+        for count in range(1, 21):
+            with self.subTest(count=count):
+                application = self.create_application(index=count, with_branch=False)
+                formset = self.formset(application, count)
+                # One bulk_create for the branches and one per through table.
+                with self.assertNumQueries(4, using='default'):
+                    formset.save()
+                self.assertEqual(ApplicationBranch.objects.filter(application=application).count(), count)
+                self.assertEqual(
+                    SelectedSpecialist.objects.filter(application_branch__application=application).count(), count
+                )
+
+    def test_update_branches(self):
+        other = Specialty.objects.create(name="Jarrohlik")
+        for count in range(1, 21):
+            with self.subTest(count=count):
+                application = self.create_application(index=count, with_branch=False)
+                for _ in range(count):
+                    ApplicationBranch.objects.create(application=application, branch=self.branch).specialties.add(other)
+                formset = self.formset(application, count, initial=count)
+                # Per through table one delete of the old rows and one bulk_create.
+                with self.assertNumQueries(6, using='default'):
+                    formset.save()
+                self.assertEqual(
+                    set(Specialty.objects.filter(applicationbranch__application=application)), {self.specialty}
+                )
+                self.assertEqual(
+                    SelectedEquipment.objects.filter(application_branch__application=application).count(), count
+                )
+
+
+class BranchFormSaveTests(ApplicationDataMixin, TestCase):
+
+    def test_single_branch_update_uses_the_bulk_path(self):
+        application = self.create_application()
+        application_branch = ApplicationBranch.objects.get(application=application)
+        other = Specialty.objects.create(name="Jarrohlik")
+        data = self.branch_data() | {'specialties': [str(self.specialty.pk), str(other.pk)]}
+        form = ApplicationBranchForm(data, instance=application_branch)
+        self.assertTrue(form.is_valid(), form.errors)
+
+        with CaptureStatements(connection.alias) as statements:
+            form.save()
+
+        # The UPDATE of the branch, then one delete and one insert per through table.
+        self.assertEqual(len(statements), 7)
+        self.assertEqual(statements.transactions, [])
+        self.assertEqual(set(application_branch.specialties.all()), {self.specialty, other})
+        self.assertEqual(application_branch.specialist_selections.get().count, 1)
@@ -0,0 +1,103 @@
+import csv
+import io
+import os
+import zipfile
+from datetime import datetime
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.db import connections
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.applications.bundles import MANIFEST_COLUMNS, MANIFEST_NAME, stream_document_bundle
+from apps.applications.choices import ApplicationStatus
+from apps.applications.models import Application, ApplicationBranch, Branch, District, Region
+from apps.applications.tests.base import ApplicationDataMixin, TemporaryMediaMixin
+
+
+class DocumentBundleTests(ApplicationDataMixin, TemporaryMediaMixin, TestCase):
+
+    def create_with_document(self, index, size, created_at=None, **fields):
+        application = self.create_application(index=index, registration_number=f"REG-{index}", **fields)
+        name = default_storage.save(f"documents/doc-{index}.pdf", ContentFile(bytes([index]) * size))
+        updates = {'document_file': name}
+        if created_at:
+            updates['created_at'] = timezone.make_aware(created_at)
+        Application.objects.filter(pk=application.pk).update(**updates)
+        return application
+
+    def read_bundle(self, chunks):
+        bundle = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+        self.assertIsNone(bundle.testzip())
+        manifest = list(csv.DictReader(io.TextIOWrapper(bundle.open(MANIFEST_NAME), encoding="utf-8")))
+        return bundle, manifest
+
+    def export(self, *args):
+        path = os.path.join(self.media_root, "export.zip")
+        call_command("export_documents", path, *args, stdout=io.StringIO())
+        with open(path, "rb") as output:
+            return self.read_bundle([output.read()])
+
+    def test_manifest_first_then_one_entry_per_document(self):
+        first = self.create_with_document(1, 1000)
+        second = self.create_with_document(2, 3000)
+        self.create_application(index=3)  # No document.
+
+        bundle, manifest = self.read_bundle(stream_document_bundle(batch_size=1))
+
+        self.assertEqual(bundle.namelist(), [MANIFEST_NAME, "REG-1/doc-1.pdf", "REG-2/doc-2.pdf"])
+        self.assertEqual(list(manifest[0]), list(MANIFEST_COLUMNS))
+        self.assertEqual(
+            [(row['application_id'], row['registration_number'], row['file'], row['size']) for row in manifest],
+            [(str(first.pk), "REG-1", "REG-1/doc-1.pdf", "1000"), (str(second.pk), "REG-2", "REG-2/doc-2.pdf", "3000")],
+        )
+        self.assertEqual(bundle.read("REG-2/doc-2.pdf"), bytes([2]) * 3000)
+        self.assertEqual(bundle.getinfo("REG-2/doc-2.pdf").compress_type, zipfile.ZIP_STORED)
+
+    def test_missing_file_is_listed_without_size(self):
+        application = self.create_with_document(1, 10)
+        default_storage.delete("documents/doc-1.pdf")
+
+        bundle, manifest = self.read_bundle(stream_document_bundle(Application.objects.filter(pk=application.pk)))
+
+        self.assertEqual(bundle.namelist(), [MANIFEST_NAME])
+        self.assertEqual(manifest[0]['size'], "")
+
+    def test_reads_from_a_replica(self):
+        self.create_with_document(1, 10)
+
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections['replica']) as replica:
+            self.read_bundle(stream_document_bundle(batch_size=1))
+
+        self.assertEqual(len(primary), 0)
+        self.assertGreater(len(replica), 0)
+
+    def test_command_filters(self):
+        other_region = Region.objects.create(region_name="Samarqand")
+        other_branch = Branch.objects.create(
+            district=District.objects.create(region=other_region, district_name="Urgut"), branch_name="Filial 2"
+        )
+        old = self.create_with_document(1, 10, created_at=datetime(2024, 1, 10))
+        new = self.create_with_document(2, 10, created_at=datetime(2024, 3, 10), status=ApplicationStatus.SUBMITTED)
+        elsewhere = self.create_with_document(3, 10, created_at=datetime(2024, 3, 10), with_branch=False)
+        ApplicationBranch.objects.create(application=elsewhere, branch=other_branch)
+        # A second branch in the same region must not duplicate the entry.
+        ApplicationBranch.objects.create(application=new, branch=self.branch)
+
+        cases = (
+            ((), {old, new, elsewhere}),
+            (("--region", str(self.region.pk)), {old, new}),
+            (("--region", str(other_region.pk)), {elsewhere}),
+            (("--from", "2024-02-01"), {new, elsewhere}),
+            (("--to", "2024-01-10"), {old}),
+            (("--from", "2024-03-10", "--to", "2024-03-10", "--status", "submitted"), {new}),
+        )
+        for args, expected in cases:
+            with self.subTest(args=args):
+                bundle, manifest = self.export(*args)
+                self.assertEqual(sorted(row['application_id'] for row in manifest), sorted(str(a.pk) for a in expected))
+                self.assertEqual(len(bundle.namelist()), len(expected) + 1)
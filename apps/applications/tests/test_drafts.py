@@ -0,0 +1,93 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.applications.choices import ApplicationStatus
+from apps.applications.drafts import delete_draft_batch
+from apps.applications.models import (
+    Application, ApplicationBranch, ApplicationSnapshot, SelectedEquipment, SelectedSpecialist,
+)
+from apps.applications.tests.base import ApplicationDataMixin, TemporaryMediaMixin
+
+
+class CleanupDraftsTests(ApplicationDataMixin, TemporaryMediaMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.long_ago = timezone.now() - timedelta(days=365)
+
+    def create_draft(self, index, document=None, stale=True, **fields):
+        application = self.create_application(index=index, **fields)
+        updates = {'updated_at': self.long_ago} if stale else {}
+        if document:
+            updates['document_file'] = document
+        Application.objects.filter(pk=application.pk).update(**updates)
+        return application
+
+    def save_document(self, name, size):
+        return default_storage.save(f"documents/{name}", ContentFile(b"x" * size))
+
+    def cleanup(self, *args):
+        out = StringIO()
+        call_command('cleanup_drafts', *args, stdout=out)
+        return out.getvalue()
+
+    def test_deletes_stale_drafts_with_their_rows_and_files(self):
+        own = self.save_document("own.pdf", 100)
+        shared = self.save_document("shared.pdf", 50)
+        stale = [self.create_draft(0, document=own), self.create_draft(1, document=shared)]
+        ApplicationSnapshot.objects.create(application=stale[0], document={})
+        fresh = self.create_draft(2, stale=False)
+        submitted = self.create_draft(3, status=ApplicationStatus.SUBMITTED, document=shared)
+
+        output = self.cleanup('--days=30', '--batch-size=1')
+
+        self.assertEqual(set(Application.objects.all()), {fresh, submitted})
+        stale_pks = [application.pk for application in stale]
+        self.assertFalse(ApplicationBranch.objects.filter(application_id__in=stale_pks).exists())
+        self.assertFalse(ApplicationBranch.specialties.through.objects.filter(
+            applicationbranch__application_id__in=stale_pks
+        ).exists())
+        for model in (SelectedSpecialist, SelectedEquipment):
+            self.assertFalse(model.objects.filter(application_branch__application_id__in=stale_pks).exists())
+        self.assertFalse(ApplicationSnapshot.objects.exists())
+        self.assertEqual(ApplicationBranch.objects.count(), 2)
+        self.assertEqual(SelectedSpecialist.objects.count(), 2)
+
+        # The submitted application still points to the shared document.
+        self.assertEqual(self.media_files('documents'), ["shared.pdf"])
+        # Per draft: the application, its branch, one specialty, specialist
+        # and equipment row; plus one snapshot.
+        self.assertIn("Deleted 11 rows", output.splitlines()[-1])
+        self.assertIn("and 1 files, 100 bytes", output.splitlines()[-1])
+
+    def test_dry_run_deletes_nothing(self):
+        document = self.save_document("own.pdf", 100)
+        self.create_draft(0, document=document)
+        self.create_draft(1)
+
+        output = self.cleanup('--days=30', '--dry-run')
+
+        self.assertIn("2 drafts not updated since", output)
+        self.assertEqual(Application.objects.count(), 2)
+        self.assertEqual(SelectedSpecialist.objects.count(), 2)
+        self.assertEqual(self.media_files('documents'), ["own.pdf"])
+
+    def test_draft_touched_after_the_scan_is_kept(self):
+        touched = self.create_draft(0)
+        stale = self.create_draft(1)
+        # Saved by its owner between the pk scan and the lock.
+        Application.objects.filter(pk=touched.pk).update(updated_at=timezone.now())
+
+        rows, documents, days = delete_draft_batch([touched.pk, stale.pk], timezone.now() - timedelta(days=30))
+
+        self.assertEqual(rows, 5)
+        self.assertEqual(documents, [])
+        self.assertEqual(days, {stale.created_at.date()})
+        self.assertEqual(list(Application.objects.all()), [touched])
+        self.assertEqual(SelectedEquipment.objects.get().application_branch.application, touched)
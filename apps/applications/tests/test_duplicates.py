@@ -0,0 +1,80 @@
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from apps.applications.choices import ApplicationStatus
+from apps.applications.models import Application
+from apps.applications.tests.base import ApplicationDataMixin
+from apps.applications.utils import _duplicate_free_key, find_duplicate_fields
+
+
+class StaleDuplicateCacheTests(ApplicationDataMixin, TestCase):
+    """A value cached as free but taken since must give a field error, not an IntegrityError."""
+
+    phone_number = "+998901112233"
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.other = self.create_application(index=1, phone_number=self.phone_number, with_branch=False)
+
+    def mark_free(self):
+        # What the cache holds when the number was checked just before the
+        # other application took it.
+        cache.set(_duplicate_free_key('phone_number', self.phone_number), True)
+
+    def assertPhoneTaken(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['form'].has_error('phone_number'))
+        # The stale marker is dropped, so the next attempt fails validation.
+        self.assertEqual(find_duplicate_fields({'phone_number': self.phone_number}), {'phone_number'})
+
+    def test_create(self):
+        self.mark_free()
+        data = self.application_data(phone_number=self.phone_number) | self.branch_formset_data()
+        response = self.client.post(reverse('applications:application_create'), data)
+
+        self.assertPhoneTaken(response)
+        self.assertEqual(list(Application.objects.all()), [self.other])
+
+    def test_update(self):
+        application = self.create_application()
+        url = reverse('applications:application_update', args=[application.pk])
+        data = self.application_data(phone_number=self.phone_number, email=application.email) | self.branch_data()
+        for action in ({}, {'action': "submit"}):
+            with self.subTest(action=action):
+                self.mark_free()
+                response = self.client.post(url, data | action)
+
+                self.assertPhoneTaken(response)
+                application.refresh_from_db()
+                self.assertEqual(application.phone_number, "+998900000000")
+                self.assertEqual(application.status, ApplicationStatus.DRAFT)
+
+
+class DuplicateCheckRateLimitTests(ApplicationDataMixin, TestCase):
+    url = reverse('applications:check_duplicates')
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def check(self):
+        return self.client.post(
+            self.url, data=json.dumps({'phone_number': "+998901112233"}),
+            content_type='application/json', HTTP_X_REQUESTED_WITH='XMLHttpRequest',
+        )
+
+    @override_settings(RATELIMITS={
+        **settings.RATELIMITS,
+        "applications:duplicates": {"rate": "2/m", "burst": 2, "key": "user_or_ip", "methods": ("POST",)},
+    })
+    def test_rate_limited(self):
+        self.assertEqual(self.check().json(), {'phone_number': {'taken': False}})
+        self.assertEqual(self.check().status_code, 200)
+        response = self.check()
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
@@ -0,0 +1,71 @@
+import json
+from unittest import mock
+
+import numpy as np
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from apps.applications.eligibility import MAX_COUNT, EligibilityMatrix
+from apps.applications.tests.base import ApplicationDataMixin
+
+
+class EligibilityViewTests(ApplicationDataMixin, TestCase):
+    url = reverse('applications:branch_eligibility')
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def post(self, specialists, equipment):
+        return self.client.post(
+            self.url, data=json.dumps({'specialists': specialists, 'equipment': equipment}),
+            content_type='application/json', HTTP_X_REQUESTED_WITH='XMLHttpRequest',
+        )
+
+    def test_satisfied_specialties(self):
+        response = self.post({str(self.specialist.pk): 1}, {str(self.equipment.pk): 1})
+        self.assertEqual(response.json(), {'specialties': [{'id': self.specialty.pk, 'name': "Terapiya"}]})
+        self.assertEqual(self.post({str(self.specialist.pk): 1}, {}).json(), {'specialties': []})
+
+    def test_out_of_range_counts_are_rejected(self):
+        for count in (MAX_COUNT + 1, 10 ** 12, -1):
+            with self.subTest(count=count):
+                response = self.post({str(self.specialist.pk): count}, {str(self.equipment.pk): 1})
+                self.assertEqual(response.status_code, 400)
+
+        response = self.post({str(self.specialist.pk): MAX_COUNT}, {str(self.equipment.pk): MAX_COUNT})
+        self.assertEqual(len(response.json()['specialties']), 1)
+
+
+class EligibilityMatrixTests(TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+
+        def minimums(shape):
+            # Each specialty requires about a tenth of the columns.
+            return ((rng.random(shape) < 0.1) * rng.integers(1, 3, shape)).astype(np.int32)
+
+        self.matrix = EligibilityMatrix(
+            range(1, 41), {}, range(1, 31), range(1, 21), minimums((40, 30)), minimums((40, 20)),
+        )
+        self.specialists = rng.integers(0, 4, (500, 30), dtype=np.int32)
+        self.equipment = rng.integers(0, 4, (500, 20), dtype=np.int32)
+
+    def test_large_counts_are_clamped(self):
+        specialists, equipment = self.matrix.inventory_vectors({1: 10 ** 12, 2: 5, 99: 1}, {1: MAX_COUNT})
+        self.assertEqual(specialists[:2].tolist(), [MAX_COUNT, 5])
+        self.assertEqual(equipment[0], MAX_COUNT)
+
+    def test_chunked_batches_match_row_by_row(self):
+        expected = np.stack([
+            self.matrix.satisfied_mask(specialists, equipment)
+            for specialists, equipment in zip(self.specialists, self.equipment)
+        ])
+        # 40 specialties x 30 columns per row: chunks of 3 rows.
+        with mock.patch('apps.applications.eligibility.MASK_CHUNK_ELEMENTS', 40 * 30 * 3):
+            mask = self.matrix.satisfied_mask(self.specialists, self.equipment)
+        np.testing.assert_array_equal(mask, expected)
+        self.assertTrue(mask.any())
+        self.assertFalse(mask.all())
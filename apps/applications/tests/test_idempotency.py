@@ -0,0 +1,96 @@
+import uuid
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from apps.applications.models import Application
+from apps.applications.tests.base import ApplicationDataMixin
+from apps.common.mixins import _PENDING, IDEMPOTENCY_CACHE_KEY, IdempotentSubmitMixin
+
+
+class IdempotentSubmitTests(ApplicationDataMixin, TestCase):
+    url = reverse('applications:application_create')
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.key = uuid.uuid4().hex
+        self.cache_key = IDEMPOTENCY_CACHE_KEY.format(user=self.user.pk, key=self.key)
+
+    def submit(self, **extra):
+        data = self.application_data(idempotency_key=self.key, send_application="1", **extra)
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(self.url, data | self.branch_formset_data())
+
+    def test_form_carries_a_key(self):
+        response = self.client.get(self.url)
+        self.assertRegex(response.context['idempotency_key'], r"^[0-9a-f]{32}$")
+
+    def test_replayed_key_returns_the_stored_redirect(self):
+        first = self.submit()
+        second = self.submit()
+
+        self.assertRedirects(first, reverse('applications:application_list'), fetch_redirect_response=False)
+        self.assertRedirects(second, reverse('applications:application_list'), fetch_redirect_response=False)
+        self.assertEqual(Application.objects.count(), 1)
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_pending_duplicate_waits_for_the_result(self):
+        cache.set(self.cache_key, _PENDING)
+
+        def first_attempt_finishes(seconds):
+            cache.set(self.cache_key, "/applications/")
+
+        with mock.patch('apps.common.mixins.time.sleep', side_effect=first_attempt_finishes) as sleep:
+            response = self.submit()
+
+        sleep.assert_called_once()
+        self.assertRedirects(response, "/applications/", fetch_redirect_response=False)
+        self.assertFalse(Application.objects.exists())
+
+    def test_pending_duplicate_conflicts_after_the_wait(self):
+        cache.set(self.cache_key, _PENDING)
+
+        with mock.patch.object(IdempotentSubmitMixin, 'idempotency_wait', 0):
+            response = self.submit()
+
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(Application.objects.exists())
+        self.assertEqual(cache.get(self.cache_key), _PENDING)
+
+    def test_invalid_submission_releases_the_key(self):
+        response = self.submit(email="not-an-email")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(cache.get(self.cache_key))
+        self.assertEqual(response.context['idempotency_key'], self.key)
+
+        self.assertEqual(self.submit().status_code, 302)
+        self.assertEqual(Application.objects.count(), 1)
+
+    def test_failed_submission_releases_the_key(self):
+        with mock.patch('apps.applications.views.application_create.write_snapshot', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.submit()
+
+        self.assertIsNone(cache.get(self.cache_key))
+        self.assertFalse(Application.objects.exists())
+        self.assertEqual(self.submit().status_code, 302)
+        self.assertEqual(Application.objects.count(), 1)
+
+    def test_key_is_scoped_to_the_user(self):
+        self.submit()
+        other = get_user_model().objects.create_user(
+            email="other@example.uz", password=self.password
+        )
+        self.client.force_login(other)
+
+        response = self.submit(phone_number="+998901112244", email="other@example.uz")
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Application.objects.filter(user=other).count(), 1)
+        self.assertEqual(len(mail.outbox), 2)
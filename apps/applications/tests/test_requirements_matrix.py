@@ -0,0 +1,109 @@
+import json
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from apps.applications.cache import get_requirements_matrix
+from apps.applications.models import (
+    Equipment, EquipmentRequired, EquipmentRequiredItem, Region, Specialist, SpecialistsRequired, Specialty,
+)
+from apps.applications.templatetags.applications_tags import requirements_matrix_url
+from apps.applications.tests.base import ApplicationDataMixin
+
+
+def merge(matrix, specialty_ids):
+    """What the client does with the matrix: the highest minimum of every item over the chosen specialties."""
+    merged = [{}, {}]
+    for specialty_id in specialty_ids:
+        for kind, items in enumerate(matrix['requirements'][str(specialty_id)]):
+            for item_id, min_count in items:
+                merged[kind][item_id] = max(merged[kind].get(item_id, 0), min_count)
+    return merged
+
+
+class RequirementsMatrixTests(ApplicationDataMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.surgery = Specialty.objects.create(name="Jarrohlik")
+        cls.surgeon = Specialist.objects.create(title="Jarroh")
+        cls.table = Equipment.objects.create(name="Operatsion stol")
+        SpecialistsRequired.objects.create(specialty=cls.surgery, required_specialists=cls.surgeon, min_count=2)
+        SpecialistsRequired.objects.create(specialty=cls.surgery, required_specialists=cls.specialist, min_count=3)
+        required = EquipmentRequired.objects.create(specialty=cls.surgery)
+        EquipmentRequiredItem.objects.create(equipment_required=required, equipment=cls.table, min_count=1)
+        EquipmentRequiredItem.objects.create(equipment_required=required, equipment=cls.equipment, min_count=2)
+        cls.empty = Specialty.objects.create(name="Bo'sh")
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def url(self, version):
+        return reverse('applications:requirements_matrix', kwargs={'version': version})
+
+    def test_version_follows_the_content(self):
+        version, _ = get_requirements_matrix()
+        self.assertEqual(requirements_matrix_url(), self.url(version))
+
+        # A saved row that changes nothing rebuilds the same content.
+        with self.captureOnCommitCallbacks(execute=True):
+            Region.objects.create(region_name="Namangan")
+        self.assertEqual(get_requirements_matrix()[0], version)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            SpecialistsRequired.objects.filter(specialty=self.surgery, required_specialists=self.surgeon).update(
+                min_count=4
+            )
+            self.surgeon.title = "Jarroh-xirurg"
+            self.surgeon.save()
+        new_version, payload = get_requirements_matrix()
+
+        self.assertNotEqual(new_version, version)
+        self.assertEqual(requirements_matrix_url(), self.url(new_version))
+        matrix = json.loads(payload)
+        self.assertEqual(matrix['specialists'][str(self.surgeon.pk)], "Jarroh-xirurg")
+        self.assertIn([self.surgeon.pk, 4], matrix['requirements'][str(self.surgery.pk)][0])
+
+    def test_outdated_version_redirects(self):
+        version, _ = get_requirements_matrix()
+        response = self.client.get(self.url("0123456789abcdef"))
+        self.assertRedirects(response, self.url(version), fetch_redirect_response=False)
+        self.assertNotIn('immutable', response.get('Cache-Control', ''))
+
+    def test_current_version_is_cached_forever(self):
+        version, payload = get_requirements_matrix()
+        response = self.client.get(self.url(version))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], "application/json")
+        self.assertEqual(response['Cache-Control'], "public, max-age=31536000, immutable")
+        self.assertEqual(response['ETag'], f'"{version}"')
+        self.assertEqual(response.content, payload)
+        self.assertEqual(self.client.post(self.url(version)).status_code, 405)
+
+    def test_matches_the_requirements_endpoint(self):
+        version, _ = get_requirements_matrix()
+        matrix = self.client.get(self.url(version)).json()
+        self.assertEqual(matrix['requirements'][str(self.empty.pk)], [[], []])
+
+        for specialty_ids in ([self.specialty.pk], [self.surgery.pk], [self.specialty.pk, self.surgery.pk],
+                              [self.empty.pk]):
+            with self.subTest(specialty_ids=specialty_ids):
+                response = self.client.post(
+                    reverse('applications:get_requirements'),
+                    data=json.dumps({'specialty_ids': specialty_ids}),
+                    content_type='application/json',
+                    HTTP_X_REQUESTED_WITH='XMLHttpRequest',
+                ).json()
+                specialists, equipment = merge(matrix, specialty_ids)
+                self.assertEqual(
+                    {item['id']: (item['title'], item['min_count']) for item in response['specialists']},
+                    {pk: (matrix['specialists'][str(pk)], count) for pk, count in specialists.items()},
+                )
+                self.assertEqual(
+                    {item['id']: (item['name'], item['min_count']) for item in response['equipment']},
+                    {pk: (matrix['equipment'][str(pk)], count) for pk, count in equipment.items()},
+                )
@@ -0,0 +1,55 @@
+from django.db import connections
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.applications.models import Application
+from apps.applications.search import search_applications
+from apps.applications.tests.base import ApplicationDataMixin
+from apps.common.db_router import use_replica
+
+
+class SearchApplicationsTests(ApplicationDataMixin, TestCase):
+
+    def test_ranks_prefix_matches(self):
+        exact = self.create_application(index=0, last_name="Rahimov", with_branch=False)
+        other = self.create_application(index=1, last_name="Rahimova", first_name="Rahim", with_branch=False)
+        self.create_application(index=2, last_name="Valiyev", with_branch=False)
+
+        results = list(search_applications("rahim"))
+
+        self.assertEqual(set(results), {exact, other})
+        # Matches in two weighted fields rank above one.
+        self.assertEqual(results[0], other)
+        self.assertGreater(results[0].rank, results[1].rank)
+
+    def test_results_are_not_capped(self):
+        for index in range(30):
+            self.create_application(index=index, with_branch=False)
+
+        results = search_applications("ali")
+
+        self.assertEqual(results.count(), Application.objects.count())
+        self.assertEqual(len(results[20:]), 10)
+
+    def test_filters_the_given_queryset(self):
+        mine = self.create_application(index=0, with_branch=False)
+        self.create_application(index=1, status="submitted", with_branch=False)
+
+        results = search_applications("ali", Application.objects.filter(status=mine.status))
+
+        self.assertEqual(list(results), [mine])
+
+    def test_reads_from_the_routed_database(self):
+        application = self.create_application(with_branch=False)
+
+        with use_replica(), CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections['replica']) as replica:
+            results = list(search_applications("valiyev"))
+
+        self.assertEqual(results, [application])
+        self.assertEqual(len(primary), 0)
+        self.assertEqual(len(replica), 1)
+
+    def test_empty_query(self):
+        self.create_application(with_branch=False)
+        self.assertEqual(list(search_applications(" ()* ")), [])
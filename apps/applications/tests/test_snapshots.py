@@ -0,0 +1,151 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from apps.applications import snapshots
+from apps.applications.choices import ApplicationStatus
+from apps.applications.models import Application, ApplicationSnapshot
+from apps.applications.tests.base import (
+    ApplicationDataMixin, CaptureStatements, TemporaryMediaMixin, WizardMixin,
+)
+
+
+def write_then_fail(application):
+    snapshots.write_snapshot(application)
+    raise RuntimeError("disk full")
+
+
+class SubmitSnapshotTests(ApplicationDataMixin, TemporaryMediaMixin, WizardMixin, TestCase):
+    """Each submit path writes the snapshot in its own transaction, which takes it along on rollback."""
+
+    def assertSnapshotWrittenIn(self, statements):
+        transaction, = statements.transactions
+        self.assertTrue(any('INSERT INTO "applications_applicationsnapshot"' in sql for sql in transaction))
+        self.assertEqual(statements.autocommit_writes, [])
+
+    def assertSnapshotOf(self, application):
+        document = ApplicationSnapshot.objects.get(pk=application.pk).document
+        self.assertEqual(document['registration_number'], application.registration_number)
+        self.assertEqual([branch['branch']['id'] for branch in document['branches']], [self.branch.pk])
+        self.assertEqual(document['branches'][0]['selected_specialists'], [
+            {'id': self.specialist.pk, 'title': "Hamshira", 'count': 1},
+        ])
+
+    def create_data(self):
+        return self.application_data(send_application="1") | self.branch_formset_data()
+
+    def update_data(self, application):
+        return self.application_data(
+            phone_number=application.phone_number, email=application.email, action="submit",
+        ) | self.branch_data()
+
+    def test_create_view(self):
+        with CaptureStatements() as statements:
+            self.client.post(reverse('applications:application_create'), self.create_data())
+
+        self.assertSnapshotWrittenIn(statements)
+        self.assertSnapshotOf(Application.objects.get())
+
+    def test_create_view_rollback(self):
+        with mock.patch('apps.applications.views.application_create.write_snapshot', write_then_fail):
+            with self.assertRaises(RuntimeError):
+                self.client.post(reverse('applications:application_create'), self.create_data())
+
+        self.assertFalse(Application.objects.exists())
+        self.assertFalse(ApplicationSnapshot.objects.exists())
+
+    def test_handle_submit(self):
+        application = self.create_application()
+        url = reverse('applications:application_update', args=[application.pk])
+
+        with CaptureStatements() as statements:
+            self.client.post(url, self.update_data(application))
+
+        self.assertSnapshotWrittenIn(statements)
+        application.refresh_from_db()
+        self.assertSnapshotOf(application)
+
+    def test_handle_submit_rollback(self):
+        application = self.create_application()
+        url = reverse('applications:application_update', args=[application.pk])
+
+        with mock.patch('apps.applications.views.application_update.write_snapshot', write_then_fail):
+            response = self.client.post(url, self.update_data(application))
+
+        self.assertContains(response, "disk full")
+        self.assertFalse(ApplicationSnapshot.objects.exists())
+        application.refresh_from_db()
+        self.assertEqual(application.status, ApplicationStatus.DRAFT)
+
+    def test_wizard(self):
+        self.client.get(self.wizard_url)
+        *steps, (last_step, last_data) = self.wizard_steps()
+        for step, data in steps:
+            self.post_wizard_step(step, data)
+
+        with CaptureStatements() as statements:
+            self.post_wizard_step(last_step, last_data)
+
+        self.assertSnapshotWrittenIn(statements)
+        application = Application.objects.get()
+        self.assertSnapshotOf(application)
+        self.assertEqual(
+            ApplicationSnapshot.objects.get(pk=application.pk).document['document_file'], application.document_file.name
+        )
+
+    def test_wizard_rollback(self):
+        with mock.patch('apps.applications.views.application_wizard.write_snapshot', write_then_fail):
+            with self.assertRaises(RuntimeError):
+                self.submit_wizard()
+
+        self.assertFalse(Application.objects.exists())
+        self.assertFalse(ApplicationSnapshot.objects.exists())
+
+
+class SnapshotDetailTests(ApplicationDataMixin, TestCase):
+
+    def test_submitted_application_is_served_from_its_snapshot(self):
+        application = self.create_application(status=ApplicationStatus.SUBMITTED)
+        snapshots.write_snapshot(application)
+        # Later changes to the reference data don't alter what was submitted.
+        self.branch.branch_name = "Filial 1 (yangi)"
+        self.branch.save()
+
+        with self.assertNumQueries(1, using='replica'):
+            response = self.client.get(reverse('applications:application_detail', args=[application.pk]))
+
+        self.assertEqual(response.context['application'], application)
+        self.assertNotIn('application_branch', response.context)
+        self.assertEqual(response.context['branch_documents'][0]['branch']['branch_name'], "Filial 1")
+        self.assertNotContains(response, "Filial 1 (yangi)")
+
+
+class RebuildSnapshotsCommandTests(ApplicationDataMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.existing = self.create_application(index=0, status=ApplicationStatus.SUBMITTED)
+        self.missing = self.create_application(index=1, status=ApplicationStatus.APPROVED)
+        self.draft = self.create_application(index=2)
+        ApplicationSnapshot.objects.create(application=self.existing, document={'outdated': True})
+
+    def rebuild(self, *args):
+        call_command('rebuild_snapshots', '--batch-size=1', *args, stdout=StringIO())
+        return {snapshot.pk: snapshot.document for snapshot in ApplicationSnapshot.objects.all()}
+
+    def test_missing_only(self):
+        documents = self.rebuild('--missing-only')
+
+        self.assertEqual(set(documents), {self.existing.pk, self.missing.pk})
+        self.assertEqual(documents[self.existing.pk], {'outdated': True})
+        self.assertEqual(documents[self.missing.pk]['status'], ApplicationStatus.APPROVED)
+        self.assertEqual(len(documents[self.missing.pk]['branches']), 1)
+
+    def test_all(self):
+        documents = self.rebuild()
+
+        self.assertEqual(set(documents), {self.existing.pk, self.missing.pk})
+        self.assertEqual(documents[self.existing.pk]['id'], self.existing.pk)
@@ -0,0 +1,140 @@
+import json
+from unittest import mock
+
+from django.core import mail
+from django.test import TestCase
+from django.urls import reverse
+
+from apps.applications.choices import ApplicationStatus
+from apps.applications.models import Application, ApplicationSnapshot
+from apps.applications.tests.base import ApplicationDataMixin, CaptureStatements
+
+
+# TestCase wraps every test in a transaction, so a view's atomic() block
+# shows up as an outermost SAVEPOINT (see CaptureStatements); read-only views
+# running in autocommit open none. With ATOMIC_REQUESTS every request,
+# including the read-only ones, was one such block, and the write views
+# nested further savepoints inside it.
+
+
+class ReadOnlyViewTransactionTests(ApplicationDataMixin, TestCase):
+
+    def assertNoTransaction(self, response, statements):
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(statements.transactions, [])
+        self.assertEqual(statements.begins, [])
+
+    def test_home(self):
+        self.create_application()
+        with CaptureStatements() as statements:
+            response = self.client.get(reverse('home'))
+        self.assertNoTransaction(response, statements)
+
+    def test_application_list(self):
+        application = self.create_application()
+        with CaptureStatements() as statements:
+            response = self.client.get(reverse('applications:application_list'))
+        self.assertNoTransaction(response, statements)
+        self.assertEqual(list(response.context['applications']), [application])
+
+    def test_application_detail(self):
+        application = self.create_application()
+        with CaptureStatements() as statements:
+            response = self.client.get(reverse('applications:application_detail', args=[application.pk]))
+        self.assertNoTransaction(response, statements)
+        self.assertEqual(response.context['application'], application)
+
+    def test_requirements_endpoint(self):
+        with CaptureStatements() as statements:
+            response = self.client.post(
+                reverse('applications:get_requirements'),
+                data=json.dumps({'specialty_ids': [self.specialty.pk]}),
+                content_type='application/json',
+                HTTP_X_REQUESTED_WITH='XMLHttpRequest',
+            )
+        self.assertNoTransaction(response, statements)
+        self.assertEqual([item['id'] for item in response.json()['specialists']], [self.specialist.pk])
+
+
+class CreateViewTransactionTests(ApplicationDataMixin, TestCase):
+    url = reverse('applications:application_create')
+
+    def test_submit_runs_in_one_transaction_and_mails_on_commit(self):
+        data = self.application_data(send_application="1") | self.branch_formset_data()
+        with CaptureStatements() as statements, self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(self.url, data)
+
+        self.assertRedirects(response, reverse('applications:application_list'), fetch_redirect_response=False)
+        self.assertEqual(len(statements.transactions), 1)
+        self.assertEqual(statements.autocommit_writes, [])
+        application = Application.objects.get()
+        self.assertEqual(application.status, ApplicationStatus.SUBMITTED)
+        self.assertTrue(ApplicationSnapshot.objects.filter(pk=application.pk).exists())
+
+        # No e-mail until the transaction commits.
+        self.assertEqual(mail.outbox, [])
+        for callback in callbacks:
+            callback()
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_invalid_branch_writes_nothing(self):
+        data = self.application_data(send_application="1") | self.branch_formset_data()
+        data['applicationbranch_set-0-branch'] = ""
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(self.url, data)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Application.objects.exists())
+        self.assertEqual(callbacks, [])
+
+
+class UpdateViewTransactionTests(ApplicationDataMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.application = self.create_application()
+        self.url = reverse('applications:application_update', args=[self.application.pk])
+
+    def form_data(self, **extra):
+        return self.application_data(
+            phone_number=self.application.phone_number, email=self.application.email, **extra,
+        ) | self.branch_data()
+
+    def test_save_draft(self):
+        with CaptureStatements() as statements:
+            response = self.client.post(self.url, self.form_data(first_name="Vali"))
+
+        self.assertRedirects(response, self.url, fetch_redirect_response=False)
+        self.assertEqual(len(statements.transactions), 1)
+        self.assertEqual(statements.autocommit_writes, [])
+        self.application.refresh_from_db()
+        self.assertEqual(self.application.first_name, "Vali")
+        self.assertEqual(self.application.status, ApplicationStatus.DRAFT)
+
+    def test_submit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, self.form_data(action="submit"))
+
+        self.assertRedirects(
+            response, reverse('applications:application_detail', args=[self.application.pk]),
+            fetch_redirect_response=False,
+        )
+        self.application.refresh_from_db()
+        self.assertEqual(self.application.status, ApplicationStatus.PENDING)
+        self.assertTrue(self.application.registration_number)
+        self.assertTrue(ApplicationSnapshot.objects.filter(pk=self.application.pk).exists())
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_failed_submit_rolls_back_and_rerenders(self):
+        with mock.patch(
+            'apps.applications.views.application_update.write_snapshot', side_effect=RuntimeError("disk full")
+        ), self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(self.url, self.form_data(action="submit", first_name="Vali"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "disk full")
+        self.application.refresh_from_db()
+        self.assertEqual(self.application.first_name, "Ali")
+        self.assertEqual(self.application.status, ApplicationStatus.DRAFT)
+        self.assertIsNone(self.application.registration_number)
+        self.assertEqual(callbacks, [])
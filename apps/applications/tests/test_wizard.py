@@ -0,0 +1,94 @@
+from unittest import mock
+
+from django.core import mail
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.applications.choices import ApplicationStatus
+from apps.applications.models import Application, ApplicationBranch, ApplicationSnapshot
+from apps.applications.tests.base import (
+    ApplicationDataMixin, CaptureStatements, TemporaryMediaMixin, WizardMixin,
+)
+
+
+class ApplicationWizardTests(ApplicationDataMixin, TemporaryMediaMixin, WizardMixin, TestCase):
+
+    def test_document_is_uploaded_once_and_cleaned_up(self):
+        document = b"%PDF-1.4 passport scan"
+        steps = self.wizard_steps(document=document)
+        self.client.get(self.wizard_url)
+
+        with mock.patch.object(self.wizard_storage, 'save', wraps=self.wizard_storage.save) as save:
+            for step, data in steps[:-1]:
+                self.post_wizard_step(step, data)
+                if step != 'personal':
+                    self.assertEqual(self.media_files('wizard'), ["passport.pdf"])
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.post_wizard_step(*steps[-1])
+
+        self.assertRedirects(response, reverse('applications:application_list'), fetch_redirect_response=False)
+        save.assert_called_once()
+        self.assertEqual(self.media_files('wizard'), [])
+        application = Application.objects.get()
+        self.assertEqual(application.document_file.name, "documents/passport.pdf")
+        self.assertEqual(application.document_file.read(), document)
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_done_writes_everything_in_one_transaction(self):
+        self.client.get(self.wizard_url)
+        *steps, last = self.wizard_steps(branches=2)
+        for step, data in steps:
+            self.post_wizard_step(step, data)
+
+        with CaptureStatements() as statements, self.captureOnCommitCallbacks() as callbacks:
+            self.post_wizard_step(*last)
+
+        transaction, = statements.transactions
+        self.assertEqual(statements.autocommit_writes, [])
+        for table in ("applications_application", "applications_applicationbranch", "applications_applicationsnapshot"):
+            self.assertTrue(any(f'INSERT INTO "{table}"' in sql for sql in transaction), table)
+        application = Application.objects.get()
+        self.assertEqual(application.status, ApplicationStatus.SUBMITTED)
+        self.assertTrue(application.registration_number)
+        self.assertEqual(ApplicationBranch.objects.filter(application=application).count(), 2)
+        self.assertEqual(len(ApplicationSnapshot.objects.get(pk=application.pk).document['branches']), 2)
+        # The e-mail waits for the commit.
+        self.assertEqual(mail.outbox, [])
+        for callback in callbacks:
+            callback()
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_branches_are_validated_once_per_request(self):
+        self.client.get(self.wizard_url)
+        personal, document, branches, _ = self.wizard_steps(branches=2)
+        self.post_wizard_step(*personal)
+        self.post_wizard_step(*document)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post_wizard_step(*branches)
+
+        self.assertEqual(response.context['wizard']['steps'].current, 'review')
+        self.assertEqual(len(response.context["branches"]), 2)
+        # One specialty lookup per branch form, none more for the review page.
+        lookups = [query for query in queries if query['sql'].startswith('SELECT "applications_specialty"')]
+        self.assertEqual(len(lookups), 2)
+
+    def test_branches_are_required(self):
+        self.client.get(self.wizard_url)
+        personal, document, branches, review = self.wizard_steps(branches=0)
+        self.post_wizard_step(*personal)
+        self.post_wizard_step(*document)
+
+        response = self.post_wizard_step(*branches)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['wizard']['steps'].current, 'branches')
+        self.assertTrue(response.context['wizard']['form'].non_form_errors())
+
+        # Skipping ahead to the review does not get around it.
+        response = self.post_wizard_step(*review)
+        self.assertEqual(response.context['wizard']['steps'].current, 'branches')
+        self.assertFalse(Application.objects.exists())
+        self.assertEqual(self.media_files('wizard'), ["passport.pdf"])
@@ -1,17 +1,29 @@
 from django.urls import path
 from apps.applications.views import (ApplicationCreateView,
+                                    ApplicationWizardView,
                                     ApplicationUpdateView,
                                     ApplicationListView,
                                     ApplicationDetailView,
                                     get_requirements_for_specialty,
+                                    requirements_matrix_view,
+                                    branch_eligibility_view,
+                                    check_application_duplicates,
+                                    search_applications_view,
+                                    location_autocomplete,
                                     )
 
 app_name = "applications"
 
 urlpatterns = [
     path("application-create/", ApplicationCreateView.as_view(), name="application_create"),
+    path("application-wizard/", ApplicationWizardView.as_view(), name="application_wizard"),
     path("application/<int:pk>/update/", ApplicationUpdateView.as_view(), name="application_update"),
     path("application-list/", ApplicationListView.as_view(), name="application_list"),
     path("application/<int:pk>/detail/", ApplicationDetailView.as_view(), name="application_detail"),
     path('get-requirements/', get_requirements_for_specialty, name='get_requirements'), 
+    path('requirements-matrix/<str:version>.json', requirements_matrix_view, name='requirements_matrix'),
+    path('eligibility/', branch_eligibility_view, name='branch_eligibility'),
+    path('check-duplicates/', check_application_duplicates, name='check_duplicates'),
+    path('search/', search_applications_view, name='search'),
+    path('autocomplete/', location_autocomplete, name='autocomplete'),
 ]
@@ -1,9 +1,19 @@
 import random
 import string
+import hashlib
+import logging
 from django.conf import settings
 from django.db import IntegrityError
+from django.db.models import Q
+from django.core.cache import cache
 from django.core.mail import send_mail 
 
+logger = logging.getLogger(__name__)
+
+# Fields of Application declared unique=True that are checked up front.
+DUPLICATE_CHECK_FIELDS = ('phone_number', 'email')
+DUPLICATE_FREE_TIMEOUT = 30
+
 
 def generate_registration_number(length=20):
     """
@@ -34,7 +44,6 @@ def send_application_email(application_instance):
         f"Ariza holatini kuzatib boring."
     )
     recipient_list = [application_instance.email]
-    print(recipient_list)
     
     try:
         send_mail(
@@ -44,7 +53,69 @@ def send_application_email(application_instance):
             recipient_list=recipient_list,
             fail_silently=False, # Agar xato bo'lsa, xatolikni ko'rsatish
         )
-        print(f"DEBUG: Muvaffaqiyatli e-mail {application_instance.email} manziliga jo'natildi.")
-    except Exception as e:
-        print(f"CRITICAL ERROR: E-mail yuborishda xato yuz berdi: {e}")
+        logger.info("Application e-mail sent", extra={
+            "event": "application_email_sent",
+            "application_id": application_instance.pk,
+            "registration_number": application_instance.registration_number,
+        })
+    except Exception:
+        logger.exception("Application e-mail failed", extra={
+            "event": "application_email_failed",
+            "application_id": application_instance.pk,
+            "registration_number": application_instance.registration_number,
+        })
+
+
+def _duplicate_free_key(field, value):
+    digest = hashlib.md5(str(value).encode()).hexdigest()
+    return f"dup-free:{field}:{digest}"
+
+
+def find_duplicate_fields(values, exclude_pk=None):
+    """
+    Return the names of the fields in ``values`` ({field: value}) whose value
+    is already used by another application, using a single query.
+
+    Values recently confirmed as free are cached for DUPLICATE_FREE_TIMEOUT
+    seconds and are not queried again; the unique constraints in the database
+    stay authoritative on save.
+    """
+    from apps.applications.models import Application
+
+    values = {field: value for field, value in values.items() if value}
+    if not values:
+        return set()
+
+    keys = {field: _duplicate_free_key(field, value) for field, value in values.items()}
+    known_free = cache.get_many(keys.values())
+    pending = {field: value for field, value in values.items() if keys[field] not in known_free}
+    if not pending:
+        return set()
+
+    condition = Q()
+    for field, value in pending.items():
+        condition |= Q(**{field: value})
+    queryset = Application.objects.filter(condition)
+    if exclude_pk is not None:
+        queryset = queryset.exclude(pk=exclude_pk)
+
+    taken = set()
+    for row in queryset.values(*pending):
+        taken.update(field for field, value in pending.items() if row[field] == value)
+
+    if exclude_pk is None:
+        # Only a query over all rows proves that a value is free for everyone.
+        cache.set_many(
+            {keys[field]: True for field in pending if field not in taken},
+            DUPLICATE_FREE_TIMEOUT,
+        )
+    return taken
+
 
+def forget_duplicate_free(application):
+    """Drop cached "free" markers for the unique values of a saved application."""
+    cache.delete_many([
+        _duplicate_free_key(field, getattr(application, field))
+        for field in DUPLICATE_CHECK_FIELDS
+        if getattr(application, field)
+    ])
@@ -1,4 +1,10 @@
 from .application_list import ApplicationListView
 from .application_create import ApplicationCreateView, get_requirements_for_specialty
+from .requirements_matrix import requirements_matrix_view
+from .eligibility import branch_eligibility_view
+from .application_wizard import ApplicationWizardView
 from .application_update import ApplicationUpdateView
-from .application_detail import ApplicationDetailView
\ No newline at end of file
+from .application_detail import ApplicationDetailView
+from .duplicate_check import check_application_duplicates
+from .application_search import search_applications_view
+from .autocomplete import location_autocomplete
\ No newline at end of file
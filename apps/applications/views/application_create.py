@@ -7,89 +7,81 @@ from django.http import JsonResponse, Http404
 from django.utils.decorators import method_decorator
 from django.contrib.auth.decorators import login_required
 
-from apps.applications.models import Application, Specialty, SpecialistsRequired, EquipmentRequired, EquipmentRequiredItem
+from apps.applications.models import Application
+from apps.applications.cache import get_specialty_requirements
 from apps.applications.choices import ApplicationStatus
-from apps.applications.forms import ApplicationForm, ApplicationBranchFormSet
+from apps.applications.forms import ApplicationForm, ApplicationBranchFormSet, DuplicateValuesError
+from apps.applications.snapshots import write_snapshot
 from apps.applications.utils import generate_registration_number, send_application_email
+from apps.common.db_router import replica_reads
+from apps.common.mixins import AtomicWriteMixin, IdempotentSubmitMixin
+from apps.common.ratelimit import ratelimit
 
+# Input caps of the requirements endpoint
+REQUIREMENTS_MAX_BODY_SIZE = 4096
+REQUIREMENTS_MAX_SPECIALTIES = 20
 
+
+@ratelimit("applications:requirements")
+@replica_reads
 def get_requirements_for_specialty(request):
     """
     Given a list of specialty IDs, returns the aggregated list of required 
     specialists and equipment with their details (name, minimum count).
     
-    Updated to use the new EquipmentRequiredItem model for individual equipment counts.
+    Per-specialty requirements are served from the reference-data cache and
+    merged here, keeping the highest minimum count for each item.
     """
     if not request.headers.get('x-requested-with') == 'XMLHttpRequest' or request.method != 'POST':
         raise Http404
 
+    try:
+        content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        content_length = 0
+    if content_length > REQUIREMENTS_MAX_BODY_SIZE:
+        return JsonResponse({'error': 'Request body too large'}, status=413)
+
     import json
     try:
         data = json.loads(request.body)
         specialty_ids = data.get('specialty_ids', [])
-    except json.JSONDecodeError:
+    except (json.JSONDecodeError, AttributeError):
         return JsonResponse({'error': 'Invalid JSON format'}, status=400)
     
     if not specialty_ids:
         return JsonResponse({'specialists': [], 'equipment': []})
 
+    if not isinstance(specialty_ids, list):
+        return JsonResponse({'error': 'specialty_ids must be a list'}, status=400)
+    # Duplicates add nothing to the merged result
+    specialty_ids = list(dict.fromkeys(str(specialty_id) for specialty_id in specialty_ids))
+    if len(specialty_ids) > REQUIREMENTS_MAX_SPECIALTIES:
+        return JsonResponse(
+            {'error': f'At most {REQUIREMENTS_MAX_SPECIALTIES} specialties can be requested at once'},
+            status=400,
+        )
+
     specialists_dict = {}
     equipment_dict = {}
 
     for specialty_id in specialty_ids:
         try:
-            specialty = Specialty.objects.get(pk=specialty_id)
-        except Specialty.DoesNotExist:
+            requirements = get_specialty_requirements(int(specialty_id))
+        except (TypeError, ValueError):
+            continue
+        if requirements is None:
             continue
-        
-        # 1. Collect Specialist Requirements
-        specialist_reqs = SpecialistsRequired.objects.filter(
-            specialty=specialty
-        ).select_related('required_specialists')
-        
-        for req in specialist_reqs:
-            specialist_id = req.required_specialists.id
-            specialist_title = req.required_specialists.title
-            min_count = req.min_count
-            
-            if specialist_id in specialists_dict:
-                specialists_dict[specialist_id]['min_count'] = max(
-                    specialists_dict[specialist_id]['min_count'], 
-                    min_count
-                )
-            else:
-                specialists_dict[specialist_id] = {
-                    'id': specialist_id,
-                    'title': specialist_title,
-                    'min_count': min_count
-                }
-
-        # 2. Collect Equipment Requirements (NEW LOGIC)
-        try:
-            equipment_req = EquipmentRequired.objects.get(specialty=specialty)
-            # Get all equipment items with their individual counts
-            equipment_items = EquipmentRequiredItem.objects.filter(
-                equipment_required=equipment_req
-            ).select_related('equipment')
-            
-            for item in equipment_items:
-                equipment_id = item.equipment.id
-                equipment_name = item.equipment.name
-                min_count = item.min_count  # Individual count per equipment
-                
-                if equipment_id in equipment_dict:
-                    equipment_dict[equipment_id]['min_count'] = max(
-                        equipment_dict[equipment_id]['min_count'],
-                        min_count
-                    )
-                else:
-                    equipment_dict[equipment_id] = {
-                        'id': equipment_id,
-                        'name': equipment_name,
-                        'min_count': min_count
-                    }
-        except EquipmentRequired.DoesNotExist:
-            pass
+
+        for item in requirements['specialists']:
+            current = specialists_dict.get(item['id'])
+            if current is None or current['min_count'] < item['min_count']:
+                specialists_dict[item['id']] = dict(item)
+
+        for item in requirements['equipment']:
+            current = equipment_dict.get(item['id'])
+            if current is None or current['min_count'] < item['min_count']:
+                equipment_dict[item['id']] = dict(item)
 
     specialists_list = list(specialists_dict.values())
     equipment_list = list(equipment_dict.values())
@@ -101,7 +93,7 @@ def get_requirements_for_specialty(request):
 
 
 @method_decorator(login_required, name='dispatch') 
-class ApplicationCreateView(CreateView):
+class ApplicationCreateView(IdempotentSubmitMixin, AtomicWriteMixin, CreateView):
     model = Application
     form_class = ApplicationForm
     template_name = 'applications/application_form.html'
@@ -109,6 +101,8 @@ class ApplicationCreateView(CreateView):
 
     def get_context_data(self, **kwargs):
         data = super().get_context_data(**kwargs)
+        if 'branch_formset' in kwargs:
+            return data
         if self.request.POST:
             data['branch_formset'] = ApplicationBranchFormSet(
                 self.request.POST, 
@@ -123,44 +117,49 @@ class ApplicationCreateView(CreateView):
         context = self.get_context_data()
         branch_formset = context['branch_formset']
 
-        with transaction.atomic():
-            app_instance = form.instance
-            
-            if self.request.user.is_authenticated:
-                app_instance.user = self.request.user
-
-            if 'send_application' in self.request.POST:
-                app_instance.status = ApplicationStatus.SUBMITTED
-                if not app_instance.registration_number:
-                    app_instance.registration_number = generate_registration_number()
-            elif 'save_draft' in self.request.POST:
-                app_instance.status = ApplicationStatus.DRAFT
-            
-            self.object = form.save()
-            
-            if branch_formset.is_valid():
-                branch_formset.instance = self.object
-                branch_formset.save()
-            else:
-                messages.error(
-                    self.request, 
-                    "Filial ma'lumotlarini saqlashda xato yuz berdi. Iltimos, xatolarni tuzating."
-                )
-                return self.form_invalid(form)
-
-            if app_instance.status == ApplicationStatus.SUBMITTED:
-                send_application_email(app_instance)
-                messages.success(
-                    self.request, 
-                    f"Ariza muvaffaqiyatli yuborildi. Ro'yxatdan o'tish raqamingiz: {app_instance.registration_number}"
-                )
-            elif app_instance.status == ApplicationStatus.DRAFT:
-                messages.info(self.request, "Ariza qoralama sifatida saqlandi.")
+        # Validate the formset before writing anything, so an invalid branch
+        # never leaves a half-saved application behind.
+        if not branch_formset.is_valid():
+            messages.error(
+                self.request, 
+                "Filial ma'lumotlarini saqlashda xato yuz berdi. Iltimos, xatolarni tuzating."
+            )
+            return self.form_invalid(form, branch_formset=branch_formset)
+
+        app_instance = form.instance
+        
+        if self.request.user.is_authenticated:
+            app_instance.user = self.request.user
+
+        if 'send_application' in self.request.POST:
+            app_instance.status = ApplicationStatus.SUBMITTED
+            if not app_instance.registration_number:
+                app_instance.registration_number = generate_registration_number()
+        elif 'save_draft' in self.request.POST:
+            app_instance.status = ApplicationStatus.DRAFT
+        
+        try:
+            with form.guard_unique_values():
+                self.object = form.save()
+        except DuplicateValuesError:
+            return self.form_invalid(form, branch_formset=branch_formset)
+        branch_formset.instance = self.object
+        branch_formset.save()
+
+        if app_instance.status == ApplicationStatus.SUBMITTED:
+            write_snapshot(self.object)
+            transaction.on_commit(lambda: send_application_email(app_instance))
+            messages.success(
+                self.request, 
+                f"Ariza muvaffaqiyatli yuborildi. Ro'yxatdan o'tish raqamingiz: {app_instance.registration_number}"
+            )
+        elif app_instance.status == ApplicationStatus.DRAFT:
+            messages.info(self.request, "Ariza qoralama sifatida saqlandi.")
 
         return redirect(self.get_success_url())
 
-    def form_invalid(self, form):
-        context = self.get_context_data(form=form)
+    def form_invalid(self, form, **kwargs):
+        context = self.get_context_data(form=form, **kwargs)
         messages.error(
             self.request, 
             "Arizani saqlashda xato yuz berdi. Iltimos, barcha xatolarni tuzating."
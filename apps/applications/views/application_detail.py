@@ -2,21 +2,39 @@ from django.views.generic import DetailView
 from django.shortcuts import render, get_object_or_404
 from django.contrib.auth.mixins import LoginRequiredMixin
 
-from apps.applications.models import Application, ApplicationBranch
+from apps.applications.models import Application, ApplicationBranch, ApplicationSnapshot, ArchivedApplication
+from apps.common.mixins import ReplicaReadMixin
 
 
-class ApplicationDetailView(LoginRequiredMixin, DetailView):
+class ApplicationDetailView(LoginRequiredMixin, ReplicaReadMixin, DetailView):
     template_name = 'applications/application_detail.html'
     
     def get(self, request, pk):
-        application = get_object_or_404(
-            Application,
-            pk=pk,
-            user=request.user
-        )
+        # Submitted applications: one row, branches from the submission snapshot
+        snapshot = ApplicationSnapshot.objects.select_related('application').filter(
+            pk=pk, application__user=request.user
+        ).first()
+        if snapshot is not None:
+            context = {
+                'application': snapshot.application,
+                'branch_documents': snapshot.document['branches'],
+            }
+            return render(request, self.template_name, context)
+
+        application = Application.objects.filter(pk=pk, user=request.user).first()
+        if application is None:
+            # Finished applications are moved to the archive after a while
+            archived = get_object_or_404(ArchivedApplication, pk=pk, user=request.user)
+            context = {
+                'application': archived,
+                'branch_documents': archived.branches,
+            }
+            return render(request, self.template_name, context)
         
         try:
-            application_branch = ApplicationBranch.objects.get(application=application)
+            application_branch = ApplicationBranch.objects.prefetch_related(
+                'specialties', 'specialist_selections__specialist', 'equipment_selections__equipment'
+            ).get(application=application)
         except ApplicationBranch.DoesNotExist:
             application_branch = None
         
@@ -25,4 +43,4 @@ class ApplicationDetailView(LoginRequiredMixin, DetailView):
             'application_branch': application_branch,
         }
         
-        return render(request, self.template_name, context)
\ No newline at end of file
+        return render(request, self.template_name, context)
@@ -4,9 +4,10 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 
 from apps.applications.models import Application
 from apps.applications.choices import ApplicationStatus
+from apps.common.mixins import ReplicaReadMixin
 
 
-class ApplicationListView(LoginRequiredMixin, ListView):
+class ApplicationListView(LoginRequiredMixin, ReplicaReadMixin, ListView):
     """List all applications for the current user"""
     model = Application
     template_name = 'applications/application_list.html'
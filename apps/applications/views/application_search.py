@@ -0,0 +1,40 @@
+from django.core.paginator import Paginator
+from django.http import JsonResponse
+from django.contrib.admin.views.decorators import staff_member_required
+
+from apps.applications.search import search_applications
+from apps.common.db_router import replica_reads
+
+SEARCH_PAGE_SIZE = 20
+
+
+@staff_member_required
+@replica_reads
+def search_applications_view(request):
+    """Ranked, paginated full-text search over applications for reviewers."""
+    query = request.GET.get('q', '').strip()
+    results = search_applications(query).only(
+        'pk', 'registration_number', 'first_name', 'last_name', 'paternal_name',
+        'phone_number', 'email', 'status', 'created_at',
+    )
+    page = Paginator(results, SEARCH_PAGE_SIZE).get_page(request.GET.get('page'))
+
+    return JsonResponse({
+        'query': query,
+        'page': page.number,
+        'num_pages': page.paginator.num_pages,
+        'count': page.paginator.count,
+        'results': [
+            {
+                'id': application.pk,
+                'registration_number': application.registration_number,
+                'full_name': f"{application.last_name} {application.first_name} {application.paternal_name}",
+                'phone_number': application.phone_number,
+                'email': application.email,
+                'status': application.status,
+                'created_at': application.created_at.isoformat(),
+                'rank': round(application.rank, 4),
+            }
+            for application in page
+        ],
+    })
@@ -1,5 +1,6 @@
 import random
 import string
+import logging
 from datetime import datetime
 from django.db import transaction
 from django.contrib import messages
@@ -11,16 +12,20 @@ from django.shortcuts import render, redirect, get_object_or_404
 
 from apps.applications.choices import ApplicationStatus
 from apps.applications.models import Application, ApplicationBranch
-from apps.applications.forms import ApplicationForm, ApplicationBranchForm
+from apps.applications.snapshots import write_snapshot
+from apps.applications.forms import ApplicationForm, ApplicationBranchForm, DuplicateValuesError
+from apps.common.mixins import AtomicWriteMixin, IdempotentSubmitMixin
 
+logger = logging.getLogger(__name__)
 
-class ApplicationUpdateView(LoginRequiredMixin, UpdateView):
+
+class ApplicationUpdateView(LoginRequiredMixin, IdempotentSubmitMixin, AtomicWriteMixin, UpdateView):
     model = Application
     form_class = ApplicationForm
     template_name = 'applications/application_form.html'
     
     def get_success_url(self):
-        return reverse_lazy('application_update', kwargs={'pk': self.object.pk})
+        return reverse_lazy('applications:application_update', kwargs={'pk': self.object.pk})
     
     def get_queryset(self):
         return Application.objects.filter(user=self.request.user)
@@ -31,17 +36,13 @@ class ApplicationUpdateView(LoginRequiredMixin, UpdateView):
         # Prevent editing submitted applications
         if self.object.status != ApplicationStatus.DRAFT:
             messages.warning(request, "Yuborilgan arizani tahrirlash mumkin emas!")
-            return redirect('application_detail', pk=self.object.pk)
+            return redirect('applications:application_detail', pk=self.object.pk)
         
         return super().get(request, *args, **kwargs)
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        
-        try:
-            application_branch = ApplicationBranch.objects.get(application=self.object)
-        except ApplicationBranch.DoesNotExist:
-            application_branch = None
+        application_branch = self.get_application_branch()
         
         if self.request.POST:
             context['branch_form'] = ApplicationBranchForm(
@@ -56,6 +57,12 @@ class ApplicationUpdateView(LoginRequiredMixin, UpdateView):
         context['can_submit'] = (self.object.status == ApplicationStatus.DRAFT)
         return context
     
+    def get_application_branch(self):
+        """The application's branch (or None), loaded once per request."""
+        if not hasattr(self, '_application_branch'):
+            self._application_branch = ApplicationBranch.objects.filter(application=self.object).first()
+        return self._application_branch
+
     def post(self, request, *args, **kwargs):
         self.object = self.get_object()
         
@@ -99,30 +106,34 @@ class ApplicationUpdateView(LoginRequiredMixin, UpdateView):
             return self.form_invalid(form)
         
         try:
+            # A savepoint, so a failure rolls back only these writes and the
+            # request's transaction stays usable for re-rendering the form.
             with transaction.atomic():
-                self.object = form.save()
-                
+                self.object = form.save(commit=False)
+                self.object.registration_number = self.generate_registration_number()
+                self.object.status = ApplicationStatus.PENDING
+                with form.guard_unique_values():
+                    self.object.save()
+
                 branch_instance = branch_form.save(commit=False)
                 branch_instance.application = self.object
                 branch_instance.save()
                 branch_form.save_m2m()
-                
-                self.object.registration_number = self.generate_registration_number()
-                
-                self.object.status = ApplicationStatus.PENDING
-                self.object.save()
-                
-                self.send_application_notification()
-            
-            messages.success(
-                self.request,
-                f"Ariza muvaffaqiyatli yuborildi! Ro'yxatga olish raqami: {self.object.registration_number}"
-            )
-            return redirect('application_detail', pk=self.object.pk)
-            
+                write_snapshot(self.object)
         except Exception as e:
-            messages.error(self.request, f"Arizani yuborishda xatolik yuz berdi: {str(e)}")
+            # Drop the in-memory state of the rolled back writes.
+            self.object = self.get_object()
+            del self._application_branch
+            if not isinstance(e, DuplicateValuesError):
+                messages.error(self.request, f"Arizani yuborishda xatolik yuz berdi: {str(e)}")
             return self.form_invalid(form)
+        
+        transaction.on_commit(self.send_application_notification)
+        messages.success(
+            self.request,
+            f"Ariza muvaffaqiyatli yuborildi! Ro'yxatga olish raqami: {self.object.registration_number}"
+        )
+        return redirect('applications:application_detail', pk=self.object.pk)
     
     def validate_application_for_submission(self):
         """Validate all required fields before submission"""
@@ -133,7 +144,6 @@ class ApplicationUpdateView(LoginRequiredMixin, UpdateView):
             'last_name': 'Familiya',
             'paternal_name': 'Otasining ismi',
             'full_address': 'To\'liq manzil',
-            'work_place': 'Ish joyi',
             'phone_number': 'Telefon raqami',
             'email': 'E-pochta',
             'document_type': 'Hujjat turi',
@@ -143,9 +153,8 @@ class ApplicationUpdateView(LoginRequiredMixin, UpdateView):
             if not getattr(self.object, field):
                 errors.append(f"{label} to'ldirilmagan!")
         
-        try:
-            application_branch = ApplicationBranch.objects.get(application=self.object)
-        except ApplicationBranch.DoesNotExist:
+        application_branch = self.get_application_branch()
+        if application_branch is None:
             errors.append("Filial ma'lumotlari to'ldirilmagan!")
             return errors
         
@@ -179,7 +188,7 @@ class ApplicationUpdateView(LoginRequiredMixin, UpdateView):
         try:
             branch_name = "N/A"
             if self.object.applicationbranch_set.exists():
-                branch_name = self.object.applicationbranch_set.first().branch.name
+                branch_name = self.object.applicationbranch_set.first().branch.branch_name
             
             subject = f"Ariza qabul qilindi - {self.object.registration_number}"
             message = f"""
@@ -205,10 +214,18 @@ class ApplicationUpdateView(LoginRequiredMixin, UpdateView):
                 fail_silently=False,
             )
             
-            print(f"Email yuborildi: {self.object.email}")
+            logger.info("Application e-mail sent", extra={
+                "event": "application_email_sent",
+                "application_id": self.object.pk,
+                "registration_number": self.object.registration_number,
+            })
             
-        except Exception as e:
-            print(f"Email yuborishda xatolik: {e}")
+        except Exception:
+            logger.exception("Application e-mail failed", extra={
+                "event": "application_email_failed",
+                "application_id": self.object.pk,
+                "registration_number": self.object.registration_number,
+            })
 
     def form_valid(self, form):
         """Handle valid form (save as draft)"""
@@ -222,13 +239,16 @@ class ApplicationUpdateView(LoginRequiredMixin, UpdateView):
             )
             return self.form_invalid(form)
         
-        with transaction.atomic():
-            self.object = form.save()
-            
-            branch_instance = branch_form.save(commit=False)
-            branch_instance.application = self.object
-            branch_instance.save()
-            branch_form.save_m2m()
+        try:
+            with form.guard_unique_values():
+                self.object = form.save()
+        except DuplicateValuesError:
+            return self.form_invalid(form)
+        
+        branch_instance = branch_form.save(commit=False)
+        branch_instance.application = self.object
+        branch_instance.save()
+        branch_form.save_m2m()
         
         messages.success(self.request, "Ariza muvaffaqiyatli saqlandi!")
         return redirect(self.get_success_url())
@@ -0,0 +1,103 @@
+import os
+
+from django.conf import settings
+from django.db import transaction
+from django.contrib import messages
+from django.shortcuts import redirect
+from django.core.files.storage import FileSystemStorage
+from django.contrib.auth.mixins import LoginRequiredMixin
+from formtools.wizard.views import SessionWizardView
+
+from apps.applications.choices import ApplicationStatus
+from apps.applications.forms import PersonalInfoForm, DocumentForm, ApplicationBranchFormSet, ReviewForm, DuplicateValuesError
+from apps.applications.snapshots import write_snapshot
+from apps.applications.utils import generate_registration_number, send_application_email
+from apps.common.mixins import AtomicWriteMixin, IdempotentSubmitMixin
+
+
+WIZARD_STEPS = (
+    ('personal', PersonalInfoForm),
+    ('document', DocumentForm),
+    ('branches', ApplicationBranchFormSet),
+    ('review', ReviewForm),
+)
+WIZARD_STEP_TITLES = {
+    'personal': "Shaxsiy ma'lumotlar",
+    'document': "Hujjat",
+    'branches': "Filiallar va ixtisosliklar",
+    'review': "Tekshirish va yuborish",
+}
+
+
+class ApplicationWizardView(LoginRequiredMixin, IdempotentSubmitMixin, AtomicWriteMixin, SessionWizardView):
+    """
+    Step-by-step application submission: personal info -> document ->
+    branches/specialties -> review.
+
+    Completed steps are kept in the session and the document in
+    ``file_storage``, so every POST carries only its own step and the file
+    is uploaded exactly once. All steps are validated again before the
+    application is created.
+    """
+    form_list = WIZARD_STEPS
+    template_name = 'applications/application_wizard.html'
+    file_storage = FileSystemStorage(location=os.path.join(settings.MEDIA_ROOT, 'wizard'))
+
+    def get_form(self, step=None, data=None, files=None):
+        form = super().get_form(step, data, files)
+        if (step or self.steps.current) == 'branches':
+            # At least one branch is required to submit.
+            form.min_num = 1
+            form.validate_min = True
+        return form
+
+    def process_step(self, form):
+        # Remember the validated form: the next step's page (the review)
+        # shows its data, and validating a formset again costs queries per
+        # branch.
+        self._validated_forms = {self.steps.current: form}
+        return super().process_step(form)
+
+    def get_cleaned_data_for_step(self, step):
+        form = getattr(self, '_validated_forms', {}).get(step)
+        if form is not None:
+            return form.cleaned_data
+        return super().get_cleaned_data_for_step(step)
+
+    def get_context_data(self, form, **kwargs):
+        context = super().get_context_data(form=form, **kwargs)
+        context['step_titles'] = [(step, WIZARD_STEP_TITLES[step]) for step in self.steps.all]
+        if self.steps.current == 'review':
+            context['personal'] = self.get_cleaned_data_for_step('personal')
+            context['document'] = self.get_cleaned_data_for_step('document')
+            context['branches'] = [
+                data for data in self.get_cleaned_data_for_step('branches') or []
+                if data.get('branch') and not data.get('DELETE')
+            ]
+        return context
+
+    def done(self, form_list, form_dict, **kwargs):
+        application = form_dict['personal'].save(commit=False)
+        document = form_dict['document'].cleaned_data
+        application.document_type = document['document_type']
+        application.document_file = document['document_file']
+        application.user = self.request.user
+        application.status = ApplicationStatus.SUBMITTED
+        application.registration_number = generate_registration_number()
+        try:
+            with form_dict['personal'].guard_unique_values():
+                application.save()
+        except DuplicateValuesError:
+            return self.render_revalidation_failure('personal', form_dict['personal'], **kwargs)
+
+        branch_formset = form_dict['branches']
+        branch_formset.instance = application
+        branch_formset.save()
+        write_snapshot(application)
+
+        transaction.on_commit(lambda: send_application_email(application))
+        messages.success(
+            self.request,
+            f"Ariza muvaffaqiyatli yuborildi. Ro'yxatdan o'tish raqamingiz: {application.registration_number}"
+        )
+        return redirect('applications:application_list')
@@ -0,0 +1,34 @@
+from django.http import JsonResponse
+from django.contrib.auth.decorators import login_required
+
+from apps.applications.autocomplete import KINDS, autocomplete
+
+MAX_AUTOCOMPLETE_RESULTS = 50
+
+
+def _int_param(request, name):
+    try:
+        return int(request.GET.get(name) or 0) or None
+    except ValueError:
+        return None
+
+
+@login_required
+def location_autocomplete(request):
+    """
+    Region / district / branch lookups served from the in-memory index.
+    Query parameters: q, kind (region|district|branch), region, district, limit.
+    """
+    kind = request.GET.get('kind')
+    if kind not in KINDS:
+        kind = None
+    limit = min(_int_param(request, 'limit') or 10, MAX_AUTOCOMPLETE_RESULTS)
+
+    entries = autocomplete(
+        request.GET.get('q', ''),
+        kind=kind,
+        region_id=_int_param(request, 'region'),
+        district_id=_int_param(request, 'district'),
+        limit=limit,
+    )
+    return JsonResponse({'results': [entry.as_dict() for entry in entries]})
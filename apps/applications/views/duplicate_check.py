@@ -0,0 +1,43 @@
+import json
+
+from django.http import JsonResponse, Http404
+from django.contrib.auth.decorators import login_required
+
+from apps.applications.models import Application
+from apps.applications.utils import DUPLICATE_CHECK_FIELDS, find_duplicate_fields
+from apps.common.ratelimit import ratelimit
+
+
+@login_required
+@ratelimit("applications:duplicates")
+def check_application_duplicates(request):
+    """
+    Tells the browser whether the phone number / e-mail are already used by
+    another application, without posting the whole (multipart) form.
+    """
+    if not request.headers.get('x-requested-with') == 'XMLHttpRequest' or request.method != 'POST':
+        raise Http404
+
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return JsonResponse({'error': 'Invalid JSON format'}, status=400)
+
+    values = {field: str(data.get(field) or '').strip() for field in DUPLICATE_CHECK_FIELDS}
+
+    exclude_pk = None
+    try:
+        application_id = int(data.get('application_id') or 0)
+    except (TypeError, ValueError):
+        application_id = 0
+    if application_id:
+        exclude_pk = Application.objects.filter(
+            pk=application_id, user=request.user
+        ).values_list('pk', flat=True).first()
+
+    taken = find_duplicate_fields(values, exclude_pk=exclude_pk)
+    return JsonResponse({
+        field: {'taken': field in taken}
+        for field, value in values.items()
+        if value
+    })
@@ -0,0 +1,65 @@
+import json
+
+from django.http import JsonResponse, Http404
+from django.contrib.auth.decorators import login_required
+
+from apps.applications.eligibility import MAX_COUNT, get_eligibility_matrix
+from apps.common.db_router import replica_reads
+from apps.common.ratelimit import ratelimit
+
+
+# Input caps of the eligibility endpoint
+ELIGIBILITY_MAX_BODY_SIZE = 16384
+ELIGIBILITY_MAX_ITEMS = 500
+
+
+def _parse_inventory(value):
+    """``{"<id>": count}`` -> ``{id: count}``; raises ValueError on anything else, or counts out of range."""
+    if not isinstance(value, dict):
+        raise ValueError
+    inventory = {}
+    for pk, count in value.items():
+        if isinstance(count, bool) or not isinstance(count, int) or not 0 <= count <= MAX_COUNT:
+            raise ValueError
+        inventory[int(pk)] = count
+    return inventory
+
+
+@login_required
+@ratelimit("applications:eligibility")
+@replica_reads
+def branch_eligibility_view(request):
+    """
+    Given the specialists and equipment a branch has (id -> count), returns
+    every specialty whose requirements that inventory satisfies.
+    """
+    if not request.headers.get('x-requested-with') == 'XMLHttpRequest' or request.method != 'POST':
+        raise Http404
+
+    try:
+        content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        content_length = 0
+    if content_length > ELIGIBILITY_MAX_BODY_SIZE:
+        return JsonResponse({'error': 'Request body too large'}, status=413)
+
+    try:
+        data = json.loads(request.body)
+        specialists = _parse_inventory(data.get('specialists', {}))
+        equipment = _parse_inventory(data.get('equipment', {}))
+    except (json.JSONDecodeError, AttributeError, TypeError, ValueError):
+        return JsonResponse({'error': 'specialists and equipment must map ids to counts'}, status=400)
+
+    if len(specialists) + len(equipment) > ELIGIBILITY_MAX_ITEMS:
+        return JsonResponse(
+            {'error': f'At most {ELIGIBILITY_MAX_ITEMS} items can be sent at once'},
+            status=400,
+        )
+
+    matrix = get_eligibility_matrix()
+    return JsonResponse({
+        'specialties': [
+            {'id': specialty_id, 'name': matrix.specialty_names.get(specialty_id, '')}
+            for specialty_id in matrix.satisfied_specialties(specialists, equipment)
+        ],
+    })
@@ -0,0 +1,24 @@
+from django.http import HttpResponse
+from django.shortcuts import redirect
+from django.views.decorators.http import require_safe
+
+from apps.applications.cache import get_requirements_matrix
+
+MATRIX_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@require_safe
+def requirements_matrix_view(request, version):
+    """
+    The whole specialty requirements matrix for client-side evaluation. The
+    URL carries the content hash, so the response is cached for a year; old
+    versions redirect to the current one.
+    """
+    current_version, payload = get_requirements_matrix()
+    if version != current_version:
+        return redirect('applications:requirements_matrix', version=current_version)
+
+    response = HttpResponse(payload, content_type='application/json')
+    response['Cache-Control'] = MATRIX_CACHE_CONTROL
+    response['ETag'] = f'"{current_version}"'
+    return response
@@ -0,0 +1,170 @@
+import logging
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+_MISSING = object()
+
+NAMESPACE_KEY = "ns-version:{namespace}"
+LOCK_KEY = "lock:{key}"
+STATS_KEY = "cache-stats:{event}"
+STATS_EVENTS = ("hit", "stale", "miss", "rebuild")
+# The shared counters are updated from a per-process buffer once it holds
+# STATS_FLUSH_EVENTS events or is STATS_FLUSH_INTERVAL seconds old, so a
+# lookup doesn't pay an extra cache round trip.
+STATS_FLUSH_EVENTS = 100
+STATS_FLUSH_INTERVAL = 10
+
+_request_events = ContextVar("cache_request_events", default=None)
+_pending_stats = Counter()
+_pending_stats_lock = threading.Lock()
+_pending_stats_since = time.monotonic()
+
+
+def get_namespace_version(namespace):
+    """Return the current version of a cache namespace (starting at 1)."""
+    key = NAMESPACE_KEY.format(namespace=namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, timeout=None)
+        version = cache.get(key, 1)
+    return version
+
+
+def invalidate_namespace(namespace):
+    """
+    Invalidate every key of a namespace at once by bumping its version.
+    Old entries are never read again and simply expire.
+    """
+    key = NAMESPACE_KEY.format(namespace=namespace)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 2, timeout=None)
+
+
+def make_key(key, namespace=None):
+    if namespace is None:
+        return key
+    return f"{namespace}:v{get_namespace_version(namespace)}:{key}"
+
+
+@contextmanager
+def collect_cache_events():
+    """Collect the cache events recorded in the current context into a Counter."""
+    events = Counter()
+    token = _request_events.set(events)
+    try:
+        yield events
+    finally:
+        _request_events.reset(token)
+
+
+def record_event(event, count=1):
+    """Count a hit/miss event; the shared counters in the cache are updated in batches."""
+    logger.debug("cache %s", event, extra={"event": "cache", "result": event})
+    events = _request_events.get()
+    if events is not None:
+        events[event] += count
+    with _pending_stats_lock:
+        _pending_stats[event] += count
+        due = (
+            _pending_stats.total() >= STATS_FLUSH_EVENTS
+            or time.monotonic() - _pending_stats_since >= STATS_FLUSH_INTERVAL
+        )
+    if due:
+        flush_cache_stats()
+
+
+def flush_cache_stats():
+    """Add this process's buffered events to the shared counters."""
+    global _pending_stats_since
+    with _pending_stats_lock:
+        pending = dict(_pending_stats)
+        _pending_stats.clear()
+        _pending_stats_since = time.monotonic()
+    for event, count in pending.items():
+        key = STATS_KEY.format(event=event)
+        try:
+            cache.incr(key, count)
+        except ValueError:
+            if not cache.add(key, count, timeout=None):
+                cache.incr(key, count)
+
+
+def get_cache_stats():
+    """Return the hit/miss counters and the resulting hit ratio (other processes' last few events may be missing)."""
+    flush_cache_stats()
+    values = cache.get_many([STATS_KEY.format(event=event) for event in STATS_EVENTS])
+    stats = {event: values.get(STATS_KEY.format(event=event), 0) for event in STATS_EVENTS}
+    served = stats["hit"] + stats["stale"]
+    lookups = served + stats["miss"]
+    stats["hit_ratio"] = round(served / lookups, 4) if lookups else None
+    return stats
+
+
+def reset_cache_stats():
+    global _pending_stats_since
+    with _pending_stats_lock:
+        _pending_stats.clear()
+        _pending_stats_since = time.monotonic()
+    cache.delete_many([STATS_KEY.format(event=event) for event in STATS_EVENTS])
+
+
+def cache_aside(key, builder, timeout=300, namespace=None, grace=60, lock_timeout=10, wait=0.05):
+    """
+    Return the cached value for ``key``, calling ``builder()`` to (re)build it.
+
+    Entries are stored together with a soft expiry and kept physically for an
+    extra ``grace`` period. When the soft expiry passes, only the caller that
+    wins the rebuild lock recomputes the value, the others keep serving the
+    stale copy. On a cold miss the losers wait for the winner for up to
+    ``lock_timeout`` seconds instead of all hitting the database at once.
+    """
+    full_key = make_key(key, namespace)
+    lock_key = LOCK_KEY.format(key=full_key)
+    token = uuid.uuid4().hex
+
+    envelope = cache.get(full_key, _MISSING)
+    if envelope is not _MISSING:
+        value, soft_expiry = envelope
+        if time.time() < soft_expiry:
+            record_event("hit")
+            return value
+        if not cache.add(lock_key, token, timeout=lock_timeout):
+            record_event("stale")
+            return value
+        return _rebuild(full_key, lock_key, builder, timeout, grace, token)
+
+    record_event("miss")
+    if cache.add(lock_key, token, timeout=lock_timeout):
+        return _rebuild(full_key, lock_key, builder, timeout, grace, token)
+
+    deadline = time.monotonic() + lock_timeout
+    while time.monotonic() < deadline:
+        time.sleep(wait)
+        envelope = cache.get(full_key, _MISSING)
+        if envelope is not _MISSING:
+            return envelope[0]
+    # The lock holder died or is too slow; build it ourselves.
+    return _rebuild(full_key, lock_key, builder, timeout, grace)
+
+
+def _rebuild(full_key, lock_key, builder, timeout, grace, token=None):
+    """Build and store the value; releases the rebuild lock only if ``token`` still holds it."""
+    try:
+        value = builder()
+        cache.set(full_key, (value, time.time() + timeout), timeout=timeout + grace)
+        record_event("rebuild")
+        return value
+    finally:
+        if token is not None and cache.get(lock_key) == token:
+            cache.delete(lock_key)
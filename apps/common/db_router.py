@@ -0,0 +1,84 @@
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+
+
+PINNED_SESSION_KEY = "_primary_pinned_until"
+
+_replica_alias = ContextVar("replica_alias", default=None)
+
+
+@contextmanager
+def use_replica():
+    """
+    Route the ORM reads made inside the block to a replica (if any is
+    configured). One replica is picked for the whole block, so its reads
+    see one consistent state even when the replicas lag differently.
+    """
+    replicas = settings.REPLICA_DATABASES
+    token = _replica_alias.set(random.choice(replicas) if replicas else None)
+    try:
+        yield
+    finally:
+        _replica_alias.reset(token)
+
+
+def render_response(response):
+    """
+    Render a lazy (Template)Response now. Views call this before leaving
+    ``use_replica()``, otherwise the querysets evaluated by the template would
+    run after the block, on the primary.
+    """
+    if hasattr(response, "render") and not response.is_rendered:
+        response.render()
+    return response
+
+
+def pin_to_primary(request):
+    """Keep this user's reads on the primary until their own writes have replicated."""
+    if hasattr(request, "session"):
+        request.session[PINNED_SESSION_KEY] = time.time() + settings.REPLICA_STICKY_SECONDS
+
+
+def is_pinned_to_primary(request):
+    session = getattr(request, "session", None)
+    return session is not None and session.get(PINNED_SESSION_KEY, 0) > time.time()
+
+
+def replica_reads(view_func):
+    """Decorator for read-only function views: serve their queries from a replica."""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if is_pinned_to_primary(request):
+            return view_func(request, *args, **kwargs)
+        with use_replica():
+            return render_response(view_func(request, *args, **kwargs))
+    return wrapper
+
+
+class PrimaryReplicaRouter:
+    """
+    Sends writes (and migrations) to ``default``. Reads go to the alias from
+    ``settings.REPLICA_DATABASES`` that ``use_replica()`` picked for the block
+    only inside it; session and auth data are always read from the primary.
+    """
+    primary_only_apps = {"sessions", "auth", "users", "contenttypes"}
+
+    def db_for_read(self, model, **hints):
+        alias = _replica_alias.get()
+        if alias and model._meta.app_label not in self.primary_only_apps:
+            return alias
+        return "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
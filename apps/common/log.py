@@ -0,0 +1,121 @@
+import atexit
+import copy
+import json
+import logging
+import queue
+import random
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler
+
+
+# Attributes every LogRecord has; anything else was passed with ``extra=``.
+_RECORD_ATTRS = frozenset(logging.makeLogRecord({}).__dict__) | {"message", "asctime", "taskName"}
+
+_started_listeners = []
+_listeners_lock = threading.Lock()
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    One JSON object per line: timestamp, level, logger and message plus every
+    field passed with ``extra=``, e.g.
+    ``logger.info("Email sent", extra={"event": "email_sent", "application_id": 3})``.
+    """
+
+    def format(self, record):
+        data = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and key not in data:
+                data[key] = value
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data["exc"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps only a ``rate`` fraction (0..1) of the records at or below
+    ``max_level`` (DEBUG by default); more important records always pass.
+    """
+
+    def __init__(self, rate=1.0, max_level=logging.DEBUG):
+        super().__init__()
+        self.rate = float(rate)
+        self.max_level = logging._checkLevel(max_level)
+
+    def filter(self, record):
+        if record.levelno > self.max_level or self.rate >= 1:
+            return True
+        return random.random() < self.rate
+
+
+def bounded_queue(maxsize=10000):
+    return queue.Queue(maxsize=maxsize)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    QueueHandler whose records are written by a background QueueListener, so
+    request threads never wait on the sinks. When the (bounded) queue is full
+    the record is dropped and counted (``dropped``) instead of blocking or
+    growing memory.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record):
+        # Render the traceback to exc_text now, while the frames still exist,
+        # and drop exc_info so the queued record doesn't keep them alive; the
+        # JSON formatter of the target handler writes exc_text instead. Work
+        # on a copy: other handlers of the logger still get the original.
+        record = copy.copy(record)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # Records are logged from many threads; += is not atomic.
+            with self._dropped_lock:
+                self.dropped += 1
+
+
+def start_queue_listeners():
+    """
+    Start the QueueListener of every configured QueueHandler (logging's
+    dictConfig creates but does not start them) and stop them at exit, which
+    flushes the remaining records. Safe to call more than once.
+    """
+    with _listeners_lock:
+        for name in logging.getHandlerNames():
+            listener = getattr(logging.getHandlerByName(name), "listener", None)
+            if listener is None or listener in _started_listeners:
+                continue
+            listener.start()
+            _started_listeners.append(listener)
+            atexit.register(_stop_listener, listener)
+
+
+def _stop_listener(listener):
+    try:
+        listener.stop()
+    except queue.Full:
+        # No room for the stop sentinel; the daemon thread dies with the process.
+        pass
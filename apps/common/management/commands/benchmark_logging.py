@@ -0,0 +1,82 @@
+import logging
+import os
+import tempfile
+import time
+from logging.handlers import QueueListener
+
+from django.core.management.base import BaseCommand
+
+from apps.common.log import JSONFormatter, NonBlockingQueueHandler, bounded_queue
+
+
+class SlowStream:
+    """File wrapper whose flush() takes ``delay`` seconds, like a slow disk or pipe."""
+
+    def __init__(self, fh, delay):
+        self.fh = fh
+        self.delay = delay
+
+    def write(self, text):
+        return self.fh.write(text)
+
+    def flush(self):
+        if self.delay:
+            time.sleep(self.delay)
+        self.fh.flush()
+
+
+class Command(BaseCommand):
+    help = "Compare the request-thread cost of print() with queued JSON logging."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20000)
+        parser.add_argument(
+            "--sink-delay", type=float, default=0.0,
+            help="Milliseconds every flush of the output takes, to simulate a slow sink.",
+        )
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        delay = options["sink_delay"] / 1000
+
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "print.log"), "w") as fh:
+                stream = SlowStream(fh, delay)
+                started = time.perf_counter()
+                for i in range(iterations):
+                    print(f"Email yuborildi: user{i}@example.uz", file=stream, flush=True)
+                print_time = time.perf_counter() - started
+
+            with open(os.path.join(tmp, "queue.log"), "w") as fh:
+                target = logging.StreamHandler(SlowStream(fh, delay))
+                target.setFormatter(JSONFormatter())
+                handler = NonBlockingQueueHandler(bounded_queue(iterations + 1))
+                listener = QueueListener(handler.queue, target, respect_handler_level=True)
+                logger = logging.getLogger("apps.common.benchmark_logging")
+                logger.handlers = [handler]
+                logger.propagate = False
+                logger.setLevel(logging.INFO)
+
+                listener.start()
+                started = time.perf_counter()
+                for i in range(iterations):
+                    logger.info("Application e-mail sent", extra={
+                        "event": "application_email_sent", "application_id": i,
+                    })
+                queue_time = time.perf_counter() - started
+                listener.stop()
+                drained_time = time.perf_counter() - started
+                logger.removeHandler(handler)
+
+        self.stdout.write(f"{iterations} messages, sink delay {options['sink_delay']} ms per flush")
+        self.stdout.write(f"{'method':<22}{'us/call':>12}{'calls/s':>14}{'total s':>10}")
+        for name, caller_time, total_time in (
+            ("print()", print_time, print_time),
+            ("queued JSON logging", queue_time, drained_time),
+        ):
+            self.stdout.write(
+                f"{name:<22}{caller_time / iterations * 1e6:>12.2f}"
+                f"{iterations / caller_time:>14.0f}{total_time:>10.2f}"
+            )
+        if handler.dropped:
+            self.stdout.write(self.style.WARNING(f"{handler.dropped} records dropped (queue full)"))
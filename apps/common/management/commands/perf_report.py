@@ -0,0 +1,83 @@
+import json
+import math
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Command(BaseCommand):
+    help = "Aggregate the request performance log into per-view p50/p95 tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument("log_file", nargs="?", default=None, help="Defaults to settings.PERF_LOG_FILE.")
+        parser.add_argument(
+            "--sort", choices=("count", "p50", "p95", "db"), default="p95",
+            help="Column to sort the table by (descending).",
+        )
+        parser.add_argument("--limit", type=int, default=30)
+
+    def handle(self, *args, **options):
+        log_file = options["log_file"] or settings.PERF_LOG_FILE
+        totals = defaultdict(list)
+        db_times = defaultdict(list)
+        db_queries = defaultdict(list)
+
+        try:
+            with open(log_file, encoding="utf-8") as fh:
+                for line in fh:
+                    record = self.parse_line(line)
+                    if record is None:
+                        continue
+                    view = record.get("view") or record.get("path") or "?"
+                    totals[view].append(record["total_ms"])
+                    db_times[view].append(record.get("db_ms", 0))
+                    db_queries[view].append(record.get("db_queries", 0))
+        except OSError as exc:
+            raise CommandError(exc)
+
+        rows = []
+        for view, values in totals.items():
+            values.sort()
+            db_sorted = sorted(db_times[view])
+            rows.append({
+                "view": view,
+                "count": len(values),
+                "p50": percentile(values, 0.50),
+                "p95": percentile(values, 0.95),
+                "db": percentile(db_sorted, 0.95),
+                "queries": sum(db_queries[view]) / len(values),
+            })
+
+        if not rows:
+            self.stdout.write("No request records found.")
+            return
+
+        rows.sort(key=lambda row: row[options["sort"]], reverse=True)
+        width = max(len(row["view"]) for row in rows[:options["limit"]])
+        header = f"{'view':<{width}}  {'count':>7}  {'p50 ms':>9}  {'p95 ms':>9}  {'db p95 ms':>9}  {'avg queries':>11}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for row in rows[:options["limit"]]:
+            self.stdout.write(
+                f"{row['view']:<{width}}  {row['count']:>7}  {row['p50']:>9.1f}  {row['p95']:>9.1f}  "
+                f"{row['db']:>9.1f}  {row['queries']:>11.1f}"
+            )
+
+    @staticmethod
+    def parse_line(line):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return None
+        if not isinstance(record, dict) or record.get("event") != "request":
+            return None
+        return record
@@ -0,0 +1,218 @@
+import logging
+import mimetypes
+import os
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import FileResponse, HttpResponseNotModified
+from django.template.base import Template
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+from django.contrib.staticfiles.storage import staticfiles_storage
+
+from apps.common.cache import collect_cache_events
+from apps.common.storage import COMPRESSED_SUFFIXES
+
+perf_logger = logging.getLogger("apps.common.perf")
+
+
+_current_metrics = ContextVar("perf_request_metrics", default=None)
+
+
+class RequestMetrics:
+    """Timings collected for a single request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper() hook
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.db_queries += 1
+
+
+def _timed_render(render):
+    """
+    Wrap ``Template.render`` to add the time of every outermost render to the
+    current request's metrics, whether it comes from a TemplateResponse, the
+    ``render()`` shortcut or ``render_to_string``. Includes and extends render
+    nested templates; only the outermost render is counted.
+    """
+    @wraps(render)
+    def wrapper(self, context):
+        metrics = _current_metrics.get()
+        if metrics is None or metrics.template_depth:
+            return render(self, context)
+        metrics.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return render(self, context)
+        finally:
+            metrics.template_time += time.perf_counter() - started
+            metrics.template_depth -= 1
+
+    wrapper.perf_timed = True
+    return wrapper
+
+
+class RequestTimingMiddleware:
+    """
+    Records wall time, DB query count/time, template render time and cache
+    hits per request, adds a ``Server-Timing`` header and writes one JSON line
+    to the ``apps.common.perf`` logger. Template time covers every Django
+    template rendered while the request runs (``Template.render`` is wrapped
+    when the middleware starts).
+
+    Enabled with ``PERF_INSTRUMENTATION = True``; otherwise the middleware
+    removes itself from the chain at startup and costs nothing.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "PERF_INSTRUMENTATION", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.server_timing = getattr(settings, "PERF_SERVER_TIMING", True)
+        if not getattr(Template.render, "perf_timed", False):
+            Template.render = _timed_render(Template.render)
+
+    def __call__(self, request):
+        metrics = request._perf_metrics = RequestMetrics()
+        token = _current_metrics.set(metrics)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all(initialized_only=False):
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                cache_events = stack.enter_context(collect_cache_events())
+                response = self.get_response(request)
+        finally:
+            _current_metrics.reset(token)
+        total = time.perf_counter() - metrics.started
+
+        if self.server_timing:
+            response["Server-Timing"] = ", ".join((
+                f'db;dur={metrics.db_time * 1000:.1f};desc="{metrics.db_queries} queries"',
+                f"tpl;dur={metrics.template_time * 1000:.1f}",
+                f'cache;desc="hit={cache_events["hit"] + cache_events["stale"]} miss={cache_events["miss"]}"',
+                f"total;dur={total * 1000:.1f}",
+            ))
+
+        match = request.resolver_match
+        perf_logger.info("request", extra={
+            "event": "request",
+            "view": match.view_name if match else None,
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "total_ms": round(total * 1000, 2),
+            "db_queries": metrics.db_queries,
+            "db_ms": round(metrics.db_time * 1000, 2),
+            "template_ms": round(metrics.template_time * 1000, 2),
+            "cache_hits": cache_events["hit"] + cache_events["stale"],
+            "cache_misses": cache_events["miss"],
+        })
+        return response
+
+
+class StaticFilesMiddleware:
+    """
+    Serves STATIC_ROOT from the application process (no separate web server
+    needed) when DEBUG is off.
+
+    Picks the precompressed ``.br``/``.gz`` variant written by
+    CompressedManifestStaticFilesStorage that the client accepts. Files with
+    a content hash in their name (the ones listed in the manifest) are sent
+    with a one-year ``immutable`` Cache-Control, so browsers never ask for
+    them again; other files are cached briefly and revalidated.
+    """
+    immutable_cache_control = "public, max-age=31536000, immutable"
+    default_cache_control = "public, max-age=60"
+
+    def __init__(self, get_response):
+        if settings.DEBUG or not getattr(settings, "STATIC_SERVE", True) or "://" in settings.STATIC_URL:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.prefix = "/" + settings.STATIC_URL.strip("/") + "/"
+        self.root = os.path.realpath(settings.STATIC_ROOT)
+        self.hashed_names = set(getattr(staticfiles_storage, "hashed_files", {}).values())
+        # name -> (path, mtime, {encoding: compressed path}); files don't change after collectstatic
+        self._files = {}
+
+    def __call__(self, request):
+        if request.method in ("GET", "HEAD") and request.path_info.startswith(self.prefix):
+            response = self.serve(request, request.path_info[len(self.prefix):])
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    def find(self, name):
+        if name not in self._files:
+            path = os.path.realpath(os.path.join(self.root, name))
+            if not path.startswith(self.root + os.sep) or not os.path.isfile(path):
+                return None
+            variants = {
+                encoding: path + suffix
+                for encoding, suffix in COMPRESSED_SUFFIXES.items()
+                if os.path.isfile(path + suffix)
+            }
+            self._files[name] = (path, os.stat(path).st_mtime, variants)
+        return self._files[name]
+
+    def serve(self, request, name):
+        found = self.find(name)
+        if found is None:
+            return None
+        path, mtime, variants = found
+
+        if name not in self.hashed_names and not was_modified_since(
+            request.headers.get("If-Modified-Since"), mtime
+        ):
+            return HttpResponseNotModified()
+
+        encoding = None
+        if variants:
+            accepted = _accepted_encodings(request.headers.get("Accept-Encoding", ""))
+            # Ordered by preference: COMPRESSED_SUFFIXES lists brotli first.
+            encoding = next((encoding for encoding in variants if encoding in accepted), None)
+
+        content_type, _ = mimetypes.guess_type(path)
+        response = FileResponse(
+            open(variants[encoding] if encoding else path, "rb"),
+            content_type=content_type or "application/octet-stream",
+        )
+        response.headers.pop("Content-Disposition", None)
+        if encoding:
+            response["Content-Encoding"] = encoding
+        if variants:
+            response["Vary"] = "Accept-Encoding"
+        response["Last-Modified"] = http_date(mtime)
+        response["Cache-Control"] = (
+            self.immutable_cache_control if name in self.hashed_names else self.default_cache_control
+        )
+        return response
+
+
+def _accepted_encodings(header):
+    accepted = set()
+    for part in header.split(","):
+        encoding, _, params = part.partition(";")
+        key, _, value = params.strip().partition("=")
+        try:
+            quality = float(value) if key.strip() == "q" else 1.0
+        except ValueError:
+            quality = 0.0
+        if quality > 0:
+            accepted.add(encoding.strip().lower())
+    return accepted
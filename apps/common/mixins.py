@@ -0,0 +1,116 @@
+import re
+import time
+import uuid
+
+from django.conf import settings
+from django.db import transaction
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseRedirect
+
+from apps.common.db_router import is_pinned_to_primary, pin_to_primary, render_response, use_replica
+
+
+class AtomicWriteMixin:
+    """
+    Runs state-changing requests (POST, PUT, PATCH, DELETE) inside one
+    explicit ``transaction.atomic()`` block. Safe methods (GET, HEAD, OPTIONS)
+    keep running in autocommit, so read-only pages don't pay for
+    BEGIN/COMMIT round trips.
+
+    Views using this mixin don't open their own ``atomic()`` blocks, except a
+    savepoint around writes whose failure is caught and answered with a
+    re-rendered page (a transaction marked for rollback can't run the
+    queries of that page). Use ``transaction.on_commit`` for side effects
+    such as e-mail.
+
+    After a write the user's reads are pinned to the primary database for
+    REPLICA_STICKY_SECONDS (read-your-writes).
+    """
+    atomic_methods = ("post", "put", "patch", "delete")
+    atomic_using = None
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method.lower() in self.atomic_methods:
+            with transaction.atomic(using=self.atomic_using):
+                response = super().dispatch(request, *args, **kwargs)
+            pin_to_primary(request)
+            return response
+        return super().dispatch(request, *args, **kwargs)
+
+
+IDEMPOTENCY_FIELD = "idempotency_key"
+IDEMPOTENCY_CACHE_KEY = "idempotency:{user}:{key}"
+_IDEMPOTENCY_KEY_RE = re.compile(r"^[0-9a-f]{32}$")
+_PENDING = "__pending__"
+
+
+class IdempotentSubmitMixin:
+    """
+    Makes form submissions replay-safe. Templates render
+    ``<input type="hidden" name="idempotency_key" value="{{ idempotency_key }}">``;
+    the redirect produced by the first POST of a key is kept for
+    IDEMPOTENCY_TTL seconds and returned as is for repeated POSTs (double
+    clicks, browser retries) without running the view again. A repeat that
+    arrives while the first attempt is still running waits for its result.
+
+    Failed attempts (anything but a redirect) are forgotten, so the
+    re-rendered form can be corrected and posted again with the same key.
+    Place it before AtomicWriteMixin so results are stored after commit.
+    """
+    idempotency_wait = 5
+    idempotency_poll = 0.1
+
+    def get_idempotency_key(self):
+        key = self.request.POST.get(IDEMPOTENCY_FIELD, "")
+        return key if _IDEMPOTENCY_KEY_RE.match(key) else None
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["idempotency_key"] = self.get_idempotency_key() or uuid.uuid4().hex
+        return context
+
+    def dispatch(self, request, *args, **kwargs):
+        key = self.get_idempotency_key() if request.method == "POST" else None
+        if key is None:
+            return super().dispatch(request, *args, **kwargs)
+
+        cache_key = IDEMPOTENCY_CACHE_KEY.format(user=request.user.pk, key=key)
+        while not cache.add(cache_key, _PENDING, timeout=settings.IDEMPOTENCY_TTL):
+            location = self._wait_for_result(cache_key)
+            if location == _PENDING:
+                return HttpResponse("Ariza hali qayta ishlanmoqda, iltimos kuting.", status=409)
+            if location is not None:
+                return HttpResponseRedirect(location)
+            # The first attempt failed; process this one.
+
+        try:
+            response = super().dispatch(request, *args, **kwargs)
+        except BaseException:
+            cache.delete(cache_key)
+            raise
+        if response.status_code in (301, 302, 303):
+            cache.set(cache_key, response["Location"], timeout=settings.IDEMPOTENCY_TTL)
+        else:
+            cache.delete(cache_key)
+        return response
+
+    def _wait_for_result(self, cache_key):
+        deadline = time.monotonic() + self.idempotency_wait
+        while True:
+            location = cache.get(cache_key)
+            if location != _PENDING or time.monotonic() >= deadline:
+                return location
+            time.sleep(self.idempotency_poll)
+
+
+class ReplicaReadMixin:
+    """
+    Serves the queries of a read-only view from a replica database, unless
+    the user recently wrote something and is pinned to the primary.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if is_pinned_to_primary(request):
+            return super().dispatch(request, *args, **kwargs)
+        with use_replica():
+            return render_response(super().dispatch(request, *args, **kwargs))
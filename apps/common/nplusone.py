@@ -0,0 +1,202 @@
+import logging
+import os
+import re
+import sys
+import warnings
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger("apps.common.nplusone")
+
+_IN_LIST_RE = re.compile(r"\bIN \((?:%s(?:, )?)+\)")
+_NUMBER_RE = re.compile(r"\b\d+\b")
+_SPACE_RE = re.compile(r"\s+")
+_TABLE_RE = re.compile(r'\bFROM "?(\w+)"?')
+
+_allowed = ContextVar("nplusone_allowed", default=False)
+
+_DJANGO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__import__("django").__file__)))
+
+
+class NPlusOneError(AssertionError):
+    pass
+
+
+class NPlusOneWarning(RuntimeWarning):
+    pass
+
+
+@contextmanager
+def allow_repeated_queries():
+    """
+    Context manager and decorator for code whose repeated queries are
+    intended (e.g. a cache miss per requested id); they aren't counted.
+    For statements regardless of where they run, use NPLUSONE_ALLOWLIST.
+    """
+    token = _allowed.set(True)
+    try:
+        yield
+    finally:
+        _allowed.reset(token)
+
+
+def fingerprint(sql):
+    """Normalize a SQL statement so that repetitions with other parameters compare equal."""
+    sql = _IN_LIST_RE.sub("IN (...)", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    return _SPACE_RE.sub(" ", sql).strip()
+
+
+def _model_for_sql(sql):
+    match = _TABLE_RE.search(sql)
+    if not match:
+        return None
+    tables = {model._meta.db_table: model._meta.label for model in apps.get_models(include_auto_created=True)}
+    return tables.get(match.group(1), match.group(1))
+
+
+def _is_project_file(filename):
+    filename = os.path.abspath(filename)
+    return (
+        filename.startswith(str(settings.BASE_DIR))
+        and not filename.startswith(_DJANGO_DIR)
+        and "site-packages" not in filename
+        and filename != __file__
+    )
+
+
+def _inspect_stack(frame):
+    """
+    Return the lazy-loading descriptor access (``Model.field``) found on the
+    stack, if any, and the project frames as ``file:line in function`` strings.
+    """
+    attribute = None
+    project_frames = []
+    while frame is not None:
+        code = frame.f_code
+        if attribute is None and code.co_filename.endswith("related_descriptors.py"):
+            descriptor = frame.f_locals.get("self")
+            field = getattr(descriptor, "field", None) or getattr(descriptor, "related", None)
+            if field is not None and hasattr(field, "model"):
+                name = getattr(field, "name", None) or field.get_accessor_name()
+                attribute = f"{field.model.__name__}.{name}"
+        if _is_project_file(code.co_filename):
+            project_frames.append(f"{os.path.relpath(code.co_filename, settings.BASE_DIR)}:{frame.f_lineno} in {code.co_name}")
+        frame = frame.f_back
+    return attribute, project_frames
+
+
+class RepeatedQuery:
+    def __init__(self, fingerprint, model, attribute, stack):
+        self.fingerprint = fingerprint
+        self.model = model
+        self.attribute = attribute
+        self.stack = stack
+        self.count = 0
+
+    def __str__(self):
+        where = self.attribute or (self.stack[0] if self.stack else "unknown location")
+        lines = [f"{self.count} similar queries on {self.model} via {where}:", f"    {self.fingerprint}"]
+        lines.extend(f"    at {entry}" for entry in self.stack)
+        return "\n".join(lines)
+
+
+class NPlusOneDetector:
+    """
+    Fingerprints the SELECT statements run inside the ``with`` block and
+    reports every fingerprint executed at least ``threshold`` times, together
+    with the queried model, the related attribute that triggered the lazy load
+    (when it can be found on the stack) and the project stack frames.
+
+    Fingerprints matching a regex of ``settings.NPLUSONE_ALLOWLIST`` and
+    queries run under ``allow_repeated_queries()`` are not reported.
+    """
+
+    def __init__(self, threshold=None):
+        self.threshold = threshold or getattr(settings, "NPLUSONE_THRESHOLD", 3)
+        self.allowlist = [re.compile(pattern) for pattern in getattr(settings, "NPLUSONE_ALLOWLIST", ())]
+        self._counts = {}
+        self._queries = {}
+        self._stack = None
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for connection in connections.all(initialized_only=False):
+            self._stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+        return False
+
+    def __call__(self, execute, sql, params, many, context):
+        if sql.lstrip()[:6].upper() == "SELECT" and not _allowed.get():
+            key = fingerprint(sql)
+            count = self._counts[key] = self._counts.get(key, 0) + 1
+            if count == 2:
+                # Inspect the stack once, on the first repetition.
+                attribute, stack = _inspect_stack(sys._getframe(1))
+                self._queries[key] = RepeatedQuery(key, _model_for_sql(sql), attribute, stack)
+            if key in self._queries:
+                self._queries[key].count = count
+        return execute(sql, params, many, context)
+
+    @property
+    def problems(self):
+        return [
+            query for query in self._queries.values()
+            if query.count >= self.threshold and not any(pattern.search(query.fingerprint) for pattern in self.allowlist)
+        ]
+
+    def report(self):
+        return "\n\n".join(str(problem) for problem in self.problems)
+
+    def check(self, raise_error=True):
+        """Raise NPlusOneError (or warn) if any repeated query was found."""
+        if not self.problems:
+            return
+        message = "Possible N+1 queries detected:\n" + self.report()
+        if raise_error:
+            raise NPlusOneError(message)
+        logger.warning(message)
+        warnings.warn(message, NPlusOneWarning, stacklevel=2)
+
+
+class NPlusOneTestMixin:
+    """TestCase mixin: ``with self.assertNoNPlusOne(): ...`` fails the test on repeated queries."""
+
+    def assertNoNPlusOne(self, threshold=None):
+        return _AssertNoNPlusOne(threshold)
+
+
+class _AssertNoNPlusOne(NPlusOneDetector):
+    def __exit__(self, exc_type, *exc_info):
+        super().__exit__(exc_type, *exc_info)
+        if exc_type is None:
+            self.check(raise_error=True)
+        return False
+
+
+class NPlusOneMiddleware:
+    """
+    Runs every request under NPlusOneDetector. In DEBUG it emits a
+    NPlusOneWarning; with ``NPLUSONE_RAISE = True`` (test settings) it raises
+    NPlusOneError so the offending request fails the test.
+    """
+
+    def __init__(self, get_response):
+        self.raise_error = getattr(settings, "NPLUSONE_RAISE", False)
+        if not (settings.DEBUG or self.raise_error):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with NPlusOneDetector() as detector:
+            response = self.get_response(request)
+        detector.check(raise_error=self.raise_error)
+        return response
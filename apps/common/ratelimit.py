@@ -0,0 +1,172 @@
+import hashlib
+import math
+import threading
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse, JsonResponse
+
+
+BUCKET_KEY = "ratelimit:{policy}:{identity}"
+_PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+_semaphores = {}
+_semaphores_lock = threading.Lock()
+
+
+def parse_rate(rate):
+    """``"30/m"`` -> ``(30, 60)``: 30 requests per 60 seconds."""
+    try:
+        count, period = rate.split("/")
+        return int(count), _PERIODS[period]
+    except (ValueError, KeyError):
+        raise ImproperlyConfigured(f"Invalid rate limit {rate!r}, expected e.g. '30/m'.")
+
+
+def get_policy(name):
+    try:
+        return settings.RATELIMITS[name]
+    except KeyError:
+        raise ImproperlyConfigured(f"Rate limit policy {name!r} is not defined in settings.RATELIMITS.")
+
+
+def client_ip(request):
+    header = getattr(settings, "RATELIMIT_IP_HEADER", None)
+    if header and request.META.get(header):
+        # e.g. X-Forwarded-For set by our own proxy: the client is the first entry
+        return request.META[header].split(",")[0].strip()
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def _identity(request, key):
+    """
+    The value a policy's bucket is keyed by. Only request metadata, the POST
+    body or the (cached) session user are used, never the database.
+    """
+    if key == "ip":
+        return f"ip:{client_ip(request)}"
+    if key == "user_or_ip":
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            return f"user:{user.pk}"
+        return f"ip:{client_ip(request)}"
+    if key.startswith("post:"):
+        value = request.POST.get(key[5:], "").strip().casefold()
+        if not value:
+            return None
+        return f"{key}:{hashlib.sha256(value.encode()).hexdigest()[:32]}"
+    raise ImproperlyConfigured(f"Unknown rate limit key {key!r}.")
+
+
+def consume(policy_name, identity, cost=1):
+    """
+    Take ``cost`` tokens from the bucket of ``identity``. Returns
+    ``(allowed, retry_after_seconds)``.
+
+    The bucket refills at ``rate`` and holds at most ``burst`` tokens. Its
+    state lives in the cache, so every worker shares it; concurrent requests
+    of one identity may race on the read-modify-write and let a request or
+    two through, which is fine for load protection.
+    """
+    policy = get_policy(policy_name)
+    count, period = parse_rate(policy["rate"])
+    burst = policy.get("burst", count)
+    refill = count / period
+
+    key = BUCKET_KEY.format(policy=policy_name, identity=identity)
+    now = time.time()
+    tokens, updated = cache.get(key, (burst, now))
+    tokens = min(burst, tokens + (now - updated) * refill)
+
+    allowed = tokens >= cost
+    if allowed:
+        tokens -= cost
+    # Keep the entry only as long as it takes the bucket to refill completely.
+    cache.set(key, (tokens, now), timeout=math.ceil((burst - tokens) / refill) + 1)
+    retry_after = 0 if allowed else math.ceil((cost - tokens) / refill)
+    return allowed, retry_after
+
+
+def _semaphore(policy_name, size):
+    with _semaphores_lock:
+        if policy_name not in _semaphores:
+            _semaphores[policy_name] = threading.BoundedSemaphore(size)
+        return _semaphores[policy_name]
+
+
+def too_many_requests(request, retry_after, status=429):
+    message = "So'rovlar soni juda ko'p. Iltimos, birozdan so'ng qayta urinib ko'ring."
+    if request.headers.get("x-requested-with") == "XMLHttpRequest":
+        response = JsonResponse({"error": message, "retry_after": retry_after}, status=status)
+    else:
+        response = HttpResponse(message, status=status, content_type="text/plain; charset=utf-8")
+    response["Retry-After"] = str(max(retry_after, 1))
+    return response
+
+
+def check_ratelimit(request, policies):
+    """Return a 429 response if any of ``policies`` is exhausted for this request, else None."""
+    if not getattr(settings, "RATELIMIT_ENABLED", True):
+        return None
+    for policy_name in policies:
+        policy = get_policy(policy_name)
+        if request.method not in policy.get("methods", ("GET", "POST")):
+            continue
+        identity = _identity(request, policy.get("key", "user_or_ip"))
+        if identity is None:
+            continue
+        allowed, retry_after = consume(policy_name, identity)
+        if not allowed:
+            return too_many_requests(request, retry_after)
+    return None
+
+
+def _shed_load(request, policies, handler):
+    """
+    Run ``handler`` while holding a slot of every policy with a
+    ``max_concurrent`` limit; when a slot is not free right away the request
+    is shed with a 503 instead of queueing up behind the others.
+    """
+    acquired = []
+    try:
+        for policy_name in policies:
+            size = get_policy(policy_name).get("max_concurrent")
+            if not size:
+                continue
+            semaphore = _semaphore(policy_name, size)
+            if not semaphore.acquire(blocking=False):
+                return too_many_requests(request, 1, status=503)
+            acquired.append(semaphore)
+        return handler()
+    finally:
+        for semaphore in acquired:
+            semaphore.release()
+
+
+def ratelimit(*policies):
+    """Decorator for function views: ``@ratelimit("applications:requirements")``."""
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            limited = check_ratelimit(request, policies)
+            if limited is not None:
+                return limited
+            return _shed_load(request, policies, lambda: view_func(request, *args, **kwargs))
+        return wrapper
+    return decorator
+
+
+class RateLimitMixin:
+    """Class-based view counterpart of ``@ratelimit``: set ``ratelimit_policies``."""
+    ratelimit_policies = ()
+
+    def dispatch(self, request, *args, **kwargs):
+        limited = check_ratelimit(request, self.ratelimit_policies)
+        if limited is not None:
+            return limited
+        return _shed_load(
+            request, self.ratelimit_policies, lambda: super(RateLimitMixin, self).dispatch(request, *args, **kwargs)
+        )
@@ -0,0 +1,59 @@
+import gzip
+import os
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:  # optional: pip install ".[brotli]"
+    brotli = None
+
+
+# Text formats worth compressing; images, fonts and archives already are.
+COMPRESSIBLE_EXTENSIONS = frozenset((".css", ".js", ".mjs", ".json", ".map", ".svg", ".txt", ".xml", ".html"))
+COMPRESSED_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+def _compressors():
+    compressors = {"gzip": lambda data: gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        compressors["br"] = lambda data: brotli.compress(data, quality=11)
+    return compressors
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    ManifestStaticFilesStorage that also writes ``.gz`` (and, with the
+    optional ``brotli`` package, ``.br``) variants of every compressible
+    file during ``collectstatic``. A variant is only kept when it is
+    noticeably smaller than the original.
+    StaticFilesMiddleware serves the best variant the client accepts.
+    """
+    min_size = 256
+    min_ratio = 0.95
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+
+        names = set(paths)
+        names.update(self.hashed_files.values())
+        compressors = _compressors()
+        for name in sorted(names):
+            if os.path.splitext(name)[1].lower() not in COMPRESSIBLE_EXTENSIONS or not self.exists(name):
+                continue
+            with self.open(name) as fh:
+                data = fh.read()
+            if len(data) < self.min_size:
+                continue
+            for encoding, compress in compressors.items():
+                compressed_name = name + COMPRESSED_SUFFIXES[encoding]
+                compressed = compress(data)
+                if len(compressed) >= len(data) * self.min_ratio:
+                    continue
+                if self.exists(compressed_name):
+                    self.delete(compressed_name)
+                self._save(compressed_name, ContentFile(compressed))
+                yield name, compressed_name, True
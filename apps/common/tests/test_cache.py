@@ -0,0 +1,137 @@
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from apps.common import cache as cache_module
+from apps.common.cache import (
+    LOCK_KEY, STATS_KEY, cache_aside, get_cache_stats, get_namespace_version, invalidate_namespace, make_key,
+    record_event, reset_cache_stats,
+)
+
+
+class CacheAsideTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        reset_cache_stats()
+        self.builds = 0
+
+    def builder(self, value="fresh"):
+        def build():
+            self.builds += 1
+            return value
+        return build
+
+    def expire(self, key, namespace=None, value="stale"):
+        """Store ``value`` past its soft expiry but within the grace period."""
+        cache.set(make_key(key, namespace), (value, time.time() - 1), timeout=60)
+
+    def test_namespace_bump_invalidates_its_keys(self):
+        self.assertEqual(cache_aside("key", self.builder("one"), namespace="ref"), "one")
+        self.assertEqual(cache_aside("key", self.builder("two"), namespace="ref"), "one")
+        self.assertEqual(cache_aside("key", self.builder("other"), namespace="other"), "other")
+
+        invalidate_namespace("ref")
+
+        self.assertEqual(get_namespace_version("ref"), 2)
+        self.assertEqual(get_namespace_version("other"), 1)
+        self.assertEqual(cache_aside("key", self.builder("two"), namespace="ref"), "two")
+        self.assertEqual(cache_aside("key", self.builder("again"), namespace="other"), "other")
+        self.assertEqual(self.builds, 3)
+
+    def test_stale_value_is_served_while_another_caller_rebuilds(self):
+        self.expire("key")
+        cache.add(LOCK_KEY.format(key="key"), "other", timeout=10)
+
+        self.assertEqual(cache_aside("key", self.builder()), "stale")
+
+        self.assertEqual(self.builds, 0)
+        self.assertEqual(cache.get(LOCK_KEY.format(key="key")), "other")
+        self.assertEqual(get_cache_stats()["stale"], 1)
+
+    def test_stale_value_is_rebuilt_by_the_lock_winner(self):
+        self.expire("key")
+
+        self.assertEqual(cache_aside("key", self.builder()), "fresh")
+        self.assertEqual(cache_aside("key", self.builder("later")), "fresh")
+
+        self.assertEqual(self.builds, 1)
+        self.assertIsNone(cache.get(LOCK_KEY.format(key="key")))
+
+    def test_cold_miss_waits_for_the_winner(self):
+        cache.add(LOCK_KEY.format(key="key"), "other", timeout=10)
+
+        def winner_stores(seconds):
+            cache.set("key", ("built elsewhere", time.time() + 60))
+
+        with mock.patch("apps.common.cache.time.sleep", side_effect=winner_stores):
+            self.assertEqual(cache_aside("key", self.builder()), "built elsewhere")
+        self.assertEqual(self.builds, 0)
+
+    def test_loser_that_gives_up_waiting_keeps_the_winners_lock(self):
+        lock_key = LOCK_KEY.format(key="key")
+        cache.add(lock_key, "other", timeout=10)
+
+        self.assertEqual(cache_aside("key", self.builder(), lock_timeout=0), "fresh")
+
+        self.assertEqual(self.builds, 1)
+        self.assertEqual(cache.get(lock_key), "other")
+
+    def test_expired_lock_taken_over_is_not_released(self):
+        lock_key = LOCK_KEY.format(key="key")
+
+        def build():
+            # Our lock expired during a slow build and another caller took it.
+            cache.set(lock_key, "other", timeout=10)
+            return "slow"
+
+        self.assertEqual(cache_aside("key", build), "slow")
+        self.assertEqual(cache.get(lock_key), "other")
+
+    def test_single_winner_rebuild(self):
+        started = threading.Barrier(5)
+        results = []
+
+        def build():
+            time.sleep(0.1)
+            self.builds += 1
+            return "fresh"
+
+        def lookup():
+            started.wait()
+            results.append(cache_aside("key", build, wait=0.01))
+
+        threads = [threading.Thread(target=lookup) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, ["fresh"] * 5)
+        self.assertEqual(self.builds, 1)
+        self.assertEqual(get_cache_stats()["rebuild"], 1)
+
+
+class CacheStatsTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        reset_cache_stats()
+
+    def test_events_are_buffered_per_process(self):
+        with mock.patch.object(cache_module, "STATS_FLUSH_INTERVAL", 3600), mock.patch.object(cache, "incr") as incr:
+            record_event("hit")
+            record_event("miss")
+        incr.assert_not_called()
+
+        self.assertEqual(get_cache_stats(), {"hit": 1, "stale": 0, "miss": 1, "rebuild": 0, "hit_ratio": 0.5})
+
+    def test_buffer_is_flushed_when_full(self):
+        with mock.patch.object(cache_module, "STATS_FLUSH_EVENTS", 3):
+            for _ in range(3):
+                record_event("hit")
+
+        self.assertEqual(cache.get(STATS_KEY.format(event="hit")), 3)
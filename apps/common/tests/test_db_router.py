@@ -0,0 +1,86 @@
+from unittest import mock
+
+from django.db import connections
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.applications.models import Application, Region
+from apps.applications.tests.base import ApplicationDataMixin
+from apps.common.db_router import PrimaryReplicaRouter, pin_to_primary, use_replica
+from apps.users.models import CustomUser
+
+
+class CaptureAliases:
+    """Captures the SQL run on each of the two test aliases inside the block."""
+    aliases = ('default', 'replica')
+
+    def __enter__(self):
+        self.contexts = {alias: CaptureQueriesContext(connections[alias]) for alias in self.aliases}
+        for context in self.contexts.values():
+            context.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        for context in self.contexts.values():
+            context.__exit__(*exc_info)
+
+    def aliases_reading(self, table):
+        return {
+            alias for alias, context in self.contexts.items()
+            if any(table in query['sql'] for query in context.captured_queries)
+        }
+
+
+class PrimaryReplicaRouterTests(TestCase):
+    router = PrimaryReplicaRouter()
+
+    def test_reads_default_outside_use_replica(self):
+        self.assertEqual(self.router.db_for_read(Region), "default")
+
+    def test_primary_only_apps(self):
+        with use_replica():
+            self.assertEqual(self.router.db_for_read(Region), "replica")
+            self.assertEqual(self.router.db_for_read(CustomUser), "default")
+        self.assertEqual(self.router.db_for_write(Region), "default")
+
+    @override_settings(REPLICA_DATABASES=["replica", "replica2"])
+    def test_one_replica_per_block(self):
+        with mock.patch("apps.common.db_router.random.choice", side_effect=lambda aliases: aliases[-1]) as choice:
+            with use_replica():
+                aliases = {self.router.db_for_read(Region) for _ in range(5)}
+        self.assertEqual(aliases, {"replica2"})
+        self.assertEqual(choice.call_count, 1)
+
+    @override_settings(REPLICA_DATABASES=[])
+    def test_without_replicas(self):
+        with use_replica():
+            self.assertEqual(self.router.db_for_read(Region), "default")
+
+
+class ReplicaViewTests(ApplicationDataMixin, TestCase):
+
+    def assertReadFrom(self, alias, url):
+        with CaptureAliases() as captured:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(captured.aliases_reading(Application._meta.db_table), {alias})
+        return response
+
+    def test_template_querysets_read_from_the_replica(self):
+        # The list view's queryset is only evaluated while its TemplateResponse renders.
+        application = self.create_application()
+        response = self.assertReadFrom('replica', reverse('applications:application_list'))
+        self.assertEqual(list(response.context['applications']), [application])
+
+    def test_detail_reads_from_the_replica(self):
+        application = self.create_application()
+        self.assertReadFrom('replica', reverse('applications:application_detail', args=[application.pk]))
+
+    def test_pinned_user_reads_from_the_primary(self):
+        self.create_application()
+        session = self.client.session
+        request = mock.Mock(session=session)
+        pin_to_primary(request)
+        session.save()
+        self.assertReadFrom('default', reverse('applications:application_list'))
@@ -0,0 +1,63 @@
+import json
+import logging
+import queue
+import sys
+import threading
+
+from django.test import SimpleTestCase
+
+from apps.common.log import JSONFormatter, NonBlockingQueueHandler
+
+
+class NonBlockingQueueHandlerTests(SimpleTestCase):
+
+    def record(self, msg="hello %s", args=("world",), exc_info=None):
+        return logging.LogRecord("apps.test", logging.ERROR, __file__, 1, msg, args, exc_info)
+
+    def test_prepare_renders_the_traceback_and_drops_the_frames(self):
+        handler = NonBlockingQueueHandler(queue.Queue())
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = handler.prepare(self.record(exc_info=sys.exc_info()))
+
+        self.assertIsNone(record.exc_info)
+        self.assertEqual(record.getMessage(), "hello world")
+        data = json.loads(JSONFormatter().format(record))
+        self.assertIn("ValueError: boom", data["exc"])
+
+    def test_prepare_leaves_the_callers_record_alone(self):
+        handler = NonBlockingQueueHandler(queue.Queue())
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            exc_info = sys.exc_info()
+        original = self.record(exc_info=exc_info)
+
+        prepared = handler.prepare(original)
+
+        self.assertIsNot(prepared, original)
+        self.assertEqual((original.msg, original.args), ("hello %s", ("world",)))
+        self.assertIs(original.exc_info, exc_info)
+        self.assertIsNone(original.exc_text)
+        # A handler running after this one still formats the traceback itself.
+        self.assertIn("ValueError: boom", logging.Formatter().format(original))
+
+    def test_counts_every_dropped_record_across_threads(self):
+        handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+        handler.enqueue(self.record())
+        barrier = threading.Barrier(8)
+
+        def emit():
+            barrier.wait()
+            for _ in range(2000):
+                handler.enqueue(self.record())
+
+        threads = [threading.Thread(target=emit) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(handler.dropped, 8 * 2000)
+        self.assertEqual(handler.queue.qsize(), 1)
@@ -0,0 +1,56 @@
+from itertools import count
+from unittest import mock
+
+from django.http import HttpResponse
+from django.template import Context, Template, engines
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.template.response import TemplateResponse
+
+from apps.common.middleware import RequestTimingMiddleware
+
+
+@override_settings(PERF_INSTRUMENTATION=True, PERF_SERVER_TIMING=True)
+class RequestTimingMiddlewareTests(SimpleTestCase):
+
+    def get(self, view):
+        request = RequestFactory().get("/")
+        response = RequestTimingMiddleware(view)(request)
+        return request._perf_metrics, response
+
+    def test_times_templates_rendered_by_function_views(self):
+        # What the render() shortcut does: no TemplateResponse hooks involved.
+        def view(request):
+            return HttpResponse(engines["django"].from_string("{% for i in items %}{{ i }}{% endfor %}").render(
+                {"items": range(500)}, request
+            ))
+
+        metrics, response = self.get(view)
+        self.assertGreater(metrics.template_time, 0)
+        self.assertIn("tpl;dur=", response["Server-Timing"])
+
+    def test_times_template_responses(self):
+        def view(request):
+            return TemplateResponse(request, engines["django"].from_string("{{ value }}"), {"value": 1})
+
+        metrics, _ = self.get(lambda request: view(request).render())
+        self.assertGreater(metrics.template_time, 0)
+
+    def test_included_templates_are_counted_once(self):
+        def view(request):
+            return HttpResponse(Template("{% include inner %}").render(Context({"inner": Template("x")})))
+
+        # Every perf_counter() call returns the next integer: a single timed
+        # render reads the clock twice in a row.
+        with mock.patch("apps.common.middleware.time.perf_counter", side_effect=count()):
+            metrics, _ = self.get(view)
+        self.assertEqual(metrics.template_time, 1)
+
+    def test_no_templates_no_time(self):
+        metrics, _ = self.get(lambda request: HttpResponse("ok"))
+        self.assertEqual(metrics.template_time, 0)
+
+    @override_settings(PERF_INSTRUMENTATION=False)
+    def test_disabled(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            RequestTimingMiddleware(lambda request: HttpResponse())
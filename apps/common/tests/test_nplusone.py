@@ -0,0 +1,64 @@
+import json
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from apps.applications.models import Branch, District, Region, Specialty
+from apps.common.nplusone import NPlusOneError, NPlusOneTestMixin, allow_repeated_queries
+from apps.users.models import CustomUser
+
+
+class NPlusOneDetectorTests(NPlusOneTestMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        region = Region.objects.create(region_name="Toshkent")
+        for index in range(3):
+            district = District.objects.create(region=region, district_name=f"Tuman {index}")
+            Branch.objects.create(district=district, branch_name=f"Filial {index}")
+
+    def test_lazy_loads_are_reported(self):
+        with self.assertRaises(NPlusOneError) as raised:
+            with self.assertNoNPlusOne():
+                [str(branch) for branch in Branch.objects.all()]
+
+        message = str(raised.exception)
+        self.assertIn("3 similar queries on applications.District via Branch.district", message)
+        self.assertIn("apps/common/tests/test_nplusone.py", message)
+
+    def test_select_related_passes(self):
+        with self.assertNoNPlusOne():
+            [str(branch) for branch in Branch.objects.select_related("district__region")]
+
+    def test_below_threshold_passes(self):
+        with self.assertNoNPlusOne(threshold=4):
+            [str(branch.district.district_name) for branch in Branch.objects.all()]
+
+    def test_allow_repeated_queries(self):
+        with self.assertNoNPlusOne(), allow_repeated_queries():
+            [str(branch) for branch in Branch.objects.all()]
+
+    @override_settings(NPLUSONE_ALLOWLIST=[r'FROM "applications_district"', r'FROM "applications_region"'])
+    def test_allowlist(self):
+        with self.assertNoNPlusOne():
+            [str(branch) for branch in Branch.objects.all()]
+
+
+class NPlusOneMiddlewareTests(TestCase):
+    databases = {"default", "replica"}
+
+    def test_requirements_cache_misses_are_allowed(self):
+        # NPLUSONE_RAISE is on in the test settings: a reported request raises.
+        specialties = [Specialty.objects.create(name=f"Ixtisoslik {index}") for index in range(4)]
+        user = CustomUser.objects.create_user(email="user@example.uz", password="x", first_name="A", last_name="B")
+        self.client.force_login(user)
+        cache.clear()
+
+        response = self.client.post(
+            reverse("applications:get_requirements"),
+            data=json.dumps({"specialty_ids": [specialty.pk for specialty in specialties]}),
+            content_type="application/json",
+            HTTP_X_REQUESTED_WITH="XMLHttpRequest",
+        )
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,117 @@
+import json
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from apps.applications.tests.base import ApplicationDataMixin
+from apps.common.ratelimit import _semaphore
+
+
+def policies(**overrides):
+    return {**settings.RATELIMITS, **overrides}
+
+
+class LoginRateLimitTests(ApplicationDataMixin, TestCase):
+    url = reverse('users:login')
+
+    def setUp(self):
+        super().setUp()
+        self.client.logout()
+        cache.clear()
+
+    def login(self, username="user@example.uz", ip="10.0.0.1"):
+        return self.client.post(self.url, {'username': username, 'password': "wrong"}, REMOTE_ADDR=ip)
+
+    @override_settings(RATELIMITS=policies(**{
+        "users:login-ip": {"rate": "2/m", "burst": 2, "key": "ip", "methods": ("POST",)},
+    }))
+    def test_per_ip(self):
+        with mock.patch('django.contrib.auth.forms.authenticate', wraps=authenticate) as checked:
+            self.assertEqual(self.login("a@example.uz").status_code, 200)
+            self.assertEqual(self.login("b@example.uz").status_code, 200)
+            self.assertEqual(self.login("c@example.uz").status_code, 429)
+            self.assertEqual(self.login("c@example.uz", ip="10.0.0.2").status_code, 200)
+
+        # The limited attempt never reached the password check.
+        self.assertEqual(checked.call_count, 3)
+
+    @override_settings(RATELIMITS=policies(**{
+        "users:login-account": {"rate": "2/h", "burst": 2, "key": "post:username", "methods": ("POST",)},
+    }))
+    def test_per_submitted_account(self):
+        with mock.patch('django.contrib.auth.forms.authenticate', wraps=authenticate) as checked:
+            self.assertEqual(self.login(ip="10.0.0.1").status_code, 200)
+            self.assertEqual(self.login(ip="10.0.0.2").status_code, 200)
+            # The same account in another case, from a third address.
+            self.assertEqual(self.login(" User@Example.uz", ip="10.0.0.3").status_code, 429)
+            self.assertEqual(self.login("other@example.uz", ip="10.0.0.3").status_code, 200)
+
+        self.assertEqual(checked.call_count, 3)
+
+    def test_get_is_not_limited(self):
+        for _ in range(15):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+
+
+class RequirementsRateLimitTests(ApplicationDataMixin, TestCase):
+    url = reverse('applications:get_requirements')
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def post(self, body, **extra):
+        return self.client.post(
+            self.url, data=body, content_type='application/json', HTTP_X_REQUESTED_WITH='XMLHttpRequest', **extra
+        )
+
+    def request_ids(self, ids):
+        return self.post(json.dumps({'specialty_ids': ids}))
+
+    @override_settings(RATELIMITS=policies(**{
+        "applications:requirements": {"rate": "6/m", "burst": 1, "key": "user_or_ip", "methods": ("POST",)},
+    }))
+    def test_retry_after(self):
+        with mock.patch('apps.common.ratelimit.time.time', return_value=1000.0) as now:
+            self.assertEqual(self.request_ids([self.specialty.pk]).status_code, 200)
+            now.return_value = 1004.0
+            response = self.request_ids([self.specialty.pk])
+
+            self.assertEqual(response.status_code, 429)
+            # One token refills every 10 s; 0.4 of it is back already.
+            self.assertEqual(response['Retry-After'], "6")
+            self.assertEqual(response.json()['retry_after'], 6)
+
+            now.return_value = 1010.0
+            self.assertEqual(self.request_ids([self.specialty.pk]).status_code, 200)
+
+    @override_settings(RATELIMITS=policies(**{
+        "applications:requirements": {
+            "rate": "60/m", "burst": 20, "key": "user_or_ip", "methods": ("POST",), "max_concurrent": 1,
+        },
+    }))
+    def test_max_concurrent(self):
+        with mock.patch.dict('apps.common.ratelimit._semaphores', clear=True):
+            semaphore = _semaphore("applications:requirements", 1)
+            semaphore.acquire()
+            response = self.request_ids([self.specialty.pk])
+            semaphore.release()
+
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(response['Retry-After'], "1")
+            self.assertEqual(self.request_ids([self.specialty.pk]).status_code, 200)
+
+    def test_body_size_cap(self):
+        body = json.dumps({'specialty_ids': [self.specialty.pk], 'padding': "x" * 4096})
+        self.assertEqual(self.post(body).status_code, 413)
+
+    def test_specialty_count_cap(self):
+        self.assertEqual(self.request_ids(list(range(1, 22))).status_code, 400)
+        # Duplicates are dropped before counting.
+        self.assertEqual(self.request_ids([self.specialty.pk] * 21).status_code, 200)
+        response = self.request_ids([self.specialty.pk, *range(1000, 1019)])
+        self.assertEqual([item['id'] for item in response.json()['specialists']], [self.specialist.pk])
@@ -0,0 +1,119 @@
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+from io import StringIO
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from apps.common import storage
+from apps.common.middleware import StaticFilesMiddleware
+
+CSS = "".join(f".rule-{index} {{ color: #{index:06x}; margin: 0 auto; }}\n" for index in range(50))
+
+
+class StaticFilesTests(SimpleTestCase):
+    """collectstatic with CompressedManifestStaticFilesStorage, served by StaticFilesMiddleware."""
+
+    def setUp(self):
+        source = tempfile.mkdtemp()
+        self.static_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, source, ignore_errors=True)
+        self.addCleanup(shutil.rmtree, self.static_root, ignore_errors=True)
+        os.makedirs(os.path.join(source, "css"))
+        with open(os.path.join(source, "css", "app.css"), "w") as fh:
+            fh.write(CSS)
+        with open(os.path.join(source, "css", "tiny.css"), "w") as fh:
+            fh.write("a { color: red; }")
+        with open(os.path.join(source, "logo.png"), "wb") as fh:
+            fh.write(os.urandom(1024))
+
+        settings_override = override_settings(
+            STATICFILES_DIRS=[source],
+            STATIC_ROOT=self.static_root,
+            STORAGES={
+                "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+                "staticfiles": {"BACKEND": "apps.common.storage.CompressedManifestStaticFilesStorage"},
+            },
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        # Only this test's files: the project's static directory and the admin's are not collected.
+        with override_settings(INSTALLED_APPS=["apps.common", "django.contrib.staticfiles"]):
+            call_command("collectstatic", interactive=False, verbosity=0, stdout=StringIO())
+        self.css = staticfiles_storage.stored_name("css/app.css")
+
+    def path(self, name):
+        return os.path.join(self.static_root, name)
+
+    def get(self, name, encoding=None):
+        headers = {"Accept-Encoding": encoding} if encoding is not None else {}
+        return self.client.get(f"/static/{name}", headers=headers)
+
+    def content(self, response):
+        return b"".join(response.streaming_content)
+
+    def test_collectstatic_writes_gzip_variants(self):
+        self.assertNotEqual(self.css, "css/app.css")
+        with gzip.open(self.path(self.css + ".gz")) as fh:
+            self.assertEqual(fh.read().decode(), CSS)
+        # Too small to be worth it, or not compressible.
+        self.assertFalse(os.path.exists(self.path(staticfiles_storage.stored_name("css/tiny.css") + ".gz")))
+        self.assertFalse(os.path.exists(self.path(staticfiles_storage.stored_name("logo.png") + ".gz")))
+
+    @unittest.skipIf(storage.brotli is None, "brotli is not installed")
+    def test_collectstatic_writes_brotli_variants(self):
+        with open(self.path(self.css + ".br"), "rb") as fh:
+            self.assertEqual(storage.brotli.decompress(fh.read()).decode(), CSS)
+
+    def test_encoding_is_chosen_from_accept_encoding(self):
+        # Whatever collectstatic did, a .br variant is preferred when accepted.
+        with open(self.path(self.css + ".br"), "wb") as fh:
+            fh.write(b"brotli bytes")
+
+        cases = (
+            ("gzip, deflate, br", "br", b"brotli bytes"),
+            ("br;q=0, gzip", "gzip", None),
+            ("gzip;q=0.5", "gzip", None),
+            ("deflate", None, CSS.encode()),
+            ("", None, CSS.encode()),
+        )
+        for accept, encoding, body in cases:
+            with self.subTest(accept=accept):
+                response = self.get(self.css, accept)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.get("Content-Encoding"), encoding)
+                self.assertEqual(response["Content-Type"], "text/css")
+                self.assertEqual(response["Vary"], "Accept-Encoding")
+                content = self.content(response)
+                if encoding == "gzip":
+                    content = gzip.decompress(content)
+                self.assertEqual(content, body or CSS.encode())
+
+    def test_no_vary_without_variants(self):
+        response = self.get(staticfiles_storage.stored_name("logo.png"), "gzip, br")
+        self.assertEqual(response["Content-Type"], "image/png")
+        self.assertNotIn("Vary", response)
+        self.assertNotIn("Content-Encoding", response)
+
+    def test_hashed_names_are_immutable(self):
+        self.assertEqual(self.get(self.css)["Cache-Control"], "public, max-age=31536000, immutable")
+
+        response = self.get("css/app.css")
+        self.assertEqual(response["Cache-Control"], "public, max-age=60")
+        not_modified = self.client.get("/static/css/app.css", headers={"If-Modified-Since": response["Last-Modified"]})
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_unknown_paths_are_not_found(self):
+        for name in ("css/missing.css", "../manage.py", "css/"):
+            with self.subTest(name=name):
+                self.assertEqual(self.get(name).status_code, 404)
+
+    def test_not_used_in_debug(self):
+        with override_settings(DEBUG=True):
+            with self.assertRaises(MiddlewareNotUsed):
+                StaticFilesMiddleware(lambda request: None)
@@ -1,9 +1,9 @@
-# from django.urls import path
+from django.urls import path
 
-# from apps.common.views import GetToHomeView
+from apps.common.views import CacheStatsView
 
-# app_name = "common"
+app_name = "common"
 
-# urlpatterns = [
-#     path(" ", GetToHomeView.as_view(), name="home")
-# ]
\ No newline at end of file
+urlpatterns = [
+    path("cache-stats/", CacheStatsView.as_view(), name="cache_stats"),
+]
@@ -1,9 +1,15 @@
+from django.http import JsonResponse
 from django.shortcuts import render
-from django.views.generic import TemplateView
+from django.views.generic import TemplateView, View
+from django.utils.decorators import method_decorator
+from django.contrib.admin.views.decorators import staff_member_required
+
 from apps.applications.models import Application
+from apps.common.cache import get_cache_stats
+from apps.common.mixins import ReplicaReadMixin
 
 
-class GetToHomeView(TemplateView):
+class GetToHomeView(ReplicaReadMixin, TemplateView):
     template_name = "home.html"
 
     def get_context_data(self, **kwargs):
@@ -20,3 +26,11 @@ class GetToHomeView(TemplateView):
             context['no_access'] = "Bu sahifaga kirish uchun login qilishingiz kerak."
 
         return context
+
+
+class CacheStatsView(View):
+    """Exposes the shared cache hit/miss counters for monitoring (staff only)."""
+
+    @method_decorator(staff_member_required)
+    def get(self, request):
+        return JsonResponse(get_cache_stats())
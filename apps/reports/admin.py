@@ -0,0 +1,94 @@
+from django.contrib import admin
+from django.db.models import F, Q, Sum
+from django.db.models.functions import TruncMonth
+from django.template.response import TemplateResponse
+from django.utils.translation import gettext_lazy as _
+
+from apps.applications.choices import ApplicationStatus
+from apps.reports.choices import RollupDimension
+from apps.reports.forms import ReportFilterForm
+from apps.reports.models import DailyApplicationRollup, ReportWatermark
+from apps.reports.rollups import WATERMARK_NAME
+from apps.common.db_router import render_response, use_replica
+
+
+# group_by -> (rollup dimension, field the report rows are grouped on); "month" is truncated from day
+GROUPINGS = {
+    "region": (RollupDimension.REGION, "region__region_name"),
+    "district": (RollupDimension.DISTRICT, "district__district_name"),
+    "specialty": (RollupDimension.SPECIALTY, "specialty__name"),
+    "month": (RollupDimension.TOTAL, None),
+    "day": (RollupDimension.TOTAL, "day"),
+}
+
+
+@admin.register(DailyApplicationRollup)
+class DailyApplicationRollupAdmin(admin.ModelAdmin):
+    """Approvals report by region/district/specialty/status, read from the rollup table only."""
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+    def changelist_view(self, request, extra_context=None):
+        with use_replica():
+            return render_response(self._report_view(request, extra_context))
+
+    def _report_view(self, request, extra_context):
+        form = ReportFilterForm(request.GET or None)
+        group_by = "region"
+        rollups = DailyApplicationRollup.objects.all()
+        if form.is_valid():
+            group_by = form.cleaned_data["group_by"]
+            if form.cleaned_data["date_from"]:
+                rollups = rollups.filter(day__gte=form.cleaned_data["date_from"])
+            if form.cleaned_data["date_to"]:
+                rollups = rollups.filter(day__lte=form.cleaned_data["date_to"])
+
+        # Only rows of one dimension add up without counting an application twice.
+        dimension, field = GROUPINGS[group_by]
+        rollups = rollups.filter(dimension=dimension)
+        if group_by == "month":
+            rollups = rollups.annotate(group=TruncMonth("day"))
+        else:
+            rollups = rollups.annotate(group=F(field))
+
+        totals = {
+            status: Sum("application_count", filter=Q(status=status))
+            for status in ApplicationStatus.values
+        }
+        rows = (
+            rollups.values("group")
+            .annotate(total=Sum("application_count"), **totals)
+            .order_by("group")
+        )
+        def label(value):
+            if value is None:
+                return _("Not set")
+            return value.strftime("%Y-%m") if group_by == "month" else value
+
+        table = [
+            {
+                "group": label(row["group"]),
+                "counts": [row[status] or 0 for status in ApplicationStatus.values],
+                "total": row["total"] or 0,
+            }
+            for row in rows
+        ]
+
+        context = {
+            **self.admin_site.each_context(request),
+            "title": _("Applications report"),
+            "opts": self.model._meta,
+            "form": form,
+            "statuses": ApplicationStatus.labels,
+            "table": table,
+            "watermark": ReportWatermark.objects.filter(name=WATERMARK_NAME).first(),
+            **(extra_context or {}),
+        }
+        return TemplateResponse(request, "reports/application_report.html", context)
@@ -0,0 +1,9 @@
+from django.db.models import TextChoices
+from django.utils.translation import gettext_lazy as _
+
+
+class RollupDimension(TextChoices):
+    TOTAL = ("total", _("Total"))
+    REGION = ("region", _("Region"))
+    DISTRICT = ("district", _("District"))
+    SPECIALTY = ("specialty", _("Specialty"))
@@ -0,0 +1,17 @@
+from django import forms
+from django.utils.translation import gettext_lazy as _
+
+
+GROUP_BY_CHOICES = (
+    ("region", _("Region")),
+    ("district", _("District")),
+    ("specialty", _("Specialty")),
+    ("month", _("Month")),
+    ("day", _("Day")),
+)
+
+
+class ReportFilterForm(forms.Form):
+    date_from = forms.DateField(required=False, label=_("From"), widget=forms.DateInput(attrs={"type": "date"}))
+    date_to = forms.DateField(required=False, label=_("To"), widget=forms.DateInput(attrs={"type": "date"}))
+    group_by = forms.ChoiceField(choices=GROUP_BY_CHOICES, initial="region", label=_("Group by"))
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.6 on 2026-10-19 12:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('applications', '0004_application_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=64, unique=True, verbose_name='Name')),
+                ('updated_at', models.DateTimeField(verbose_name='Processed up to')),
+            ],
+            options={
+                'verbose_name': 'Report watermark',
+                'verbose_name_plural': 'Report watermarks',
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyApplicationRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='Day')),
+                ('status', models.CharField(choices=[('draft', 'Draft'), ('submitted', 'Submitted'), ('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected')], max_length=20, verbose_name='Status')),
+                ('application_count', models.PositiveIntegerField(default=0, verbose_name='Applications')),
+                ('district', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='applications.district', verbose_name='District')),
+                ('region', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='applications.region', verbose_name='Region')),
+                ('specialty', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='applications.specialty', verbose_name='Specialty')),
+            ],
+            options={
+                'verbose_name': 'Application report',
+                'verbose_name_plural': 'Application reports',
+                'indexes': [models.Index(fields=['day', 'status'], name='rollup_day_status_idx')],
+                'constraints': [models.UniqueConstraint(fields=('day', 'region', 'district', 'specialty', 'status'), name='unique_daily_application_rollup')],
+            },
+        ),
+    ]
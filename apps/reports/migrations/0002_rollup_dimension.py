@@ -0,0 +1,41 @@
+from django.db import migrations, models
+
+
+def drop_rollups(apps, schema_editor):
+    # The old rows mix all dimensions; the next `refresh_reports` rebuilds them
+    # in full since the watermark is gone.
+    apps.get_model("reports", "DailyApplicationRollup").objects.all().delete()
+    apps.get_model("reports", "ReportWatermark").objects.filter(name="daily_application_rollup").delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_rollups, migrations.RunPython.noop),
+        migrations.RemoveConstraint(
+            model_name='dailyapplicationrollup',
+            name='unique_daily_application_rollup',
+        ),
+        migrations.RemoveIndex(
+            model_name='dailyapplicationrollup',
+            name='rollup_day_status_idx',
+        ),
+        migrations.AddField(
+            model_name='dailyapplicationrollup',
+            name='dimension',
+            field=models.CharField(choices=[('total', 'Total'), ('region', 'Region'), ('district', 'District'), ('specialty', 'Specialty')], default='total', max_length=20, verbose_name='Dimension'),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='dailyapplicationrollup',
+            index=models.Index(fields=['dimension', 'day'], name='rollup_dimension_day_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailyapplicationrollup',
+            constraint=models.UniqueConstraint(fields=('day', 'dimension', 'region', 'district', 'specialty', 'status'), name='unique_daily_application_rollup'),
+        ),
+    ]
@@ -0,0 +1,72 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from apps.applications.choices import ApplicationStatus
+from apps.reports.choices import RollupDimension
+
+
+class DailyApplicationRollup(models.Model):
+    """
+    Number of distinct applications created on ``day`` per current status,
+    broken down by one ``dimension``: the row's region, district or specialty
+    (``None`` for applications without one), or no breakdown for ``total``.
+    An application with several branches/specialties is counted once in each
+    of its regions, districts and specialties, so only rows of one dimension
+    may be summed.
+
+    Maintained by ``manage.py refresh_reports``; never written by request code.
+    """
+    day = models.DateField(verbose_name=_("Day"))
+    dimension = models.CharField(max_length=20, choices=RollupDimension.choices, verbose_name=_("Dimension"))
+    region = models.ForeignKey(
+        "applications.Region",
+        on_delete=models.CASCADE,
+        null=True,
+        related_name="+",
+        verbose_name=_("Region"),
+    )
+    district = models.ForeignKey(
+        "applications.District",
+        on_delete=models.CASCADE,
+        null=True,
+        related_name="+",
+        verbose_name=_("District"),
+    )
+    specialty = models.ForeignKey(
+        "applications.Specialty",
+        on_delete=models.CASCADE,
+        null=True,
+        related_name="+",
+        verbose_name=_("Specialty"),
+    )
+    status = models.CharField(max_length=20, choices=ApplicationStatus.choices, verbose_name=_("Status"))
+    application_count = models.PositiveIntegerField(default=0, verbose_name=_("Applications"))
+
+    def __str__(self):
+        return f"{self.day} | {self.dimension} | {self.status}: {self.application_count}"
+
+    class Meta:
+        verbose_name = _("Application report")
+        verbose_name_plural = _("Application reports")
+        constraints = [
+            models.UniqueConstraint(
+                fields=("day", "dimension", "region", "district", "specialty", "status"),
+                name="unique_daily_application_rollup",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=("dimension", "day"), name="rollup_dimension_day_idx"),
+        ]
+
+
+class ReportWatermark(models.Model):
+    """Highest ``Application.updated_at`` already folded into a rollup table."""
+    name = models.CharField(max_length=64, unique=True, verbose_name=_("Name"))
+    updated_at = models.DateTimeField(verbose_name=_("Processed up to"))
+
+    def __str__(self):
+        return f"{self.name}: {self.updated_at}"
+
+    class Meta:
+        verbose_name = _("Report watermark")
+        verbose_name_plural = _("Report watermarks")
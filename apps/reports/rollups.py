@@ -0,0 +1,145 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+from django.db.models import Count, Max
+from django.db.models.functions import TruncDate
+
+from apps.applications.models import Application, ArchivedApplication, District, Region, Specialty
+from apps.reports.choices import RollupDimension
+from apps.reports.models import DailyApplicationRollup, ReportWatermark
+
+
+WATERMARK_NAME = "daily_application_rollup"
+
+
+# dimension -> Application lookup of the value it is broken down by
+DIMENSION_LOOKUPS = {
+    RollupDimension.TOTAL: None,
+    RollupDimension.REGION: "applicationbranch__branch__district__region_id",
+    RollupDimension.DISTRICT: "applicationbranch__branch__district_id",
+    RollupDimension.SPECIALTY: "applicationbranch__specialties",
+}
+DIMENSION_FIELDS = {
+    RollupDimension.REGION: "region_id",
+    RollupDimension.DISTRICT: "district_id",
+    RollupDimension.SPECIALTY: "specialty_id",
+}
+
+
+def _archived_values(branches):
+    """The region, district and specialty ids of an archived application's branches, by dimension."""
+    values = {dimension: set() for dimension in DIMENSION_FIELDS}
+    for branch in branches:
+        values[RollupDimension.REGION].add(branch["branch"]["region_id"])
+        values[RollupDimension.DISTRICT].add(branch["branch"]["district_id"])
+        values[RollupDimension.SPECIALTY].update(specialty["id"] for specialty in branch["specialties"])
+    # Like the LEFT JOINs of live applications: nothing to break down by counts as None.
+    return {dimension: ids or {None} for dimension, ids in values.items()}
+
+
+def _aggregate_days(days):
+    """Yield DailyApplicationRollup rows (unsaved) for applications created on ``days``."""
+    counts = Counter()
+    applications = (
+        Application.objects
+        .filter(created_at__date__in=days)
+        .annotate(day=TruncDate("created_at"))
+        .order_by()
+    )
+    for dimension, lookup in DIMENSION_LOOKUPS.items():
+        # The reverse relations are LEFT JOINs, so applications without
+        # branches (drafts) count under None.
+        fields = ("day", lookup, "status") if lookup else ("day", "status")
+        for row in applications.values(*fields).annotate(application_count=Count("id", distinct=True)):
+            value = row[lookup] if lookup else None
+            counts[(row["day"], dimension, value, row["status"])] += row["application_count"]
+
+    # Archived applications are gone from the tables above but keep counting.
+    archived = (
+        ArchivedApplication.objects
+        .filter(created_at__date__in=days)
+        .values_list("created_at", "status", "branches")
+    )
+    archived_counts = Counter()
+    for created_at, status, branches in archived.iterator():
+        day = timezone.localdate(created_at)
+        archived_counts[(day, RollupDimension.TOTAL, None, status)] += 1
+        for dimension, ids in _archived_values(branches).items():
+            archived_counts.update((day, dimension, value, status) for value in ids)
+    if archived_counts:
+        # Like live rows, drop counts whose region/district/specialty was deleted since.
+        existing = {
+            RollupDimension.TOTAL: {None},
+            RollupDimension.REGION: set(Region.objects.values_list("pk", flat=True)) | {None},
+            RollupDimension.DISTRICT: set(District.objects.values_list("pk", flat=True)) | {None},
+            RollupDimension.SPECIALTY: set(Specialty.objects.values_list("pk", flat=True)) | {None},
+        }
+        for key, count in archived_counts.items():
+            if key[2] in existing[key[1]]:
+                counts[key] += count
+
+    for (day, dimension, value, status), application_count in counts.items():
+        rollup = DailyApplicationRollup(
+            day=day, dimension=dimension, status=status, application_count=application_count,
+        )
+        if dimension in DIMENSION_FIELDS:
+            setattr(rollup, DIMENSION_FIELDS[dimension], value)
+        yield rollup
+
+
+def rebuild_days(days, batch_size=1000):
+    """Replace the rollup rows of ``days`` with freshly aggregated ones."""
+    days = sorted(set(days))
+    if not days:
+        return 0
+    with transaction.atomic():
+        DailyApplicationRollup.objects.filter(day__in=days).delete()
+        rows = DailyApplicationRollup.objects.bulk_create(_aggregate_days(days), batch_size=batch_size)
+    return len(rows)
+
+
+def refresh_rollups(full=False, overlap=timedelta(minutes=5), day_batch=31):
+    """
+    Fold applications changed since the stored watermark into the rollups.
+
+    Only the days on which the changed applications were created are
+    recomputed. The scan starts ``overlap`` before the watermark so rows
+    committed late by slow transactions are not missed; recomputing a day is
+    idempotent. Deleted applications are only removed by a ``full`` rebuild,
+    which runs in one transaction so the report never shows a partial table;
+    without a watermark the refresh is a full rebuild.
+
+    Returns ``(days_rebuilt, rows_written)``.
+    """
+    watermark = ReportWatermark.objects.filter(name=WATERMARK_NAME).first()
+    if full or watermark is None:
+        with transaction.atomic():
+            DailyApplicationRollup.objects.all().delete()
+            return _refresh(Application.objects.all(), None, day_batch, archived=True)
+    changed = Application.objects.filter(updated_at__gt=watermark.updated_at - overlap)
+    return _refresh(changed, watermark, day_batch)
+
+
+def _refresh(changed, watermark, day_batch, archived=False):
+    high_water = changed.aggregate(value=Max("updated_at"))["value"]
+    days = set(
+        changed.annotate(day=TruncDate("created_at")).values_list("day", flat=True).distinct().order_by()
+    )
+    if archived:
+        days.update(
+            ArchivedApplication.objects.annotate(day=TruncDate("created_at"))
+            .values_list("day", flat=True).distinct().order_by()
+        )
+    if not days:
+        return 0, 0
+
+    days = sorted(days)
+    rows_written = 0
+    for start in range(0, len(days), day_batch):
+        rows_written += rebuild_days(days[start:start + day_batch])
+
+    if high_water is not None and (watermark is None or high_water > watermark.updated_at):
+        ReportWatermark.objects.update_or_create(name=WATERMARK_NAME, defaults={"updated_at": high_water})
+    return len(days), rows_written
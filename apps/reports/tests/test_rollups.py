@@ -0,0 +1,104 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.applications.archive import archive_batch
+from apps.applications.choices import ApplicationStatus
+from apps.applications.models import ApplicationBranch, Branch, District, Specialty
+from apps.applications.tests.base import ApplicationDataMixin
+from apps.reports.choices import RollupDimension
+from apps.reports.models import DailyApplicationRollup
+from apps.reports.rollups import refresh_rollups
+from apps.users.models import CustomUser
+
+
+class RollupTests(ApplicationDataMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.specialties = [cls.specialty] + [Specialty.objects.create(name=name) for name in ("Jarrohlik", "Pediatriya")]
+        cls.other_district = District.objects.create(region=cls.region, district_name="Chilonzor")
+        cls.other_branch = Branch.objects.create(district=cls.other_district, branch_name="Filial 2")
+        cls.admin = CustomUser.objects.create_superuser(email="admin@example.uz", password=cls.password)
+
+    def setUp(self):
+        super().setUp()
+        # One application, two branches of one region, three specialties.
+        self.application = self.create_application(index=0, status=ApplicationStatus.APPROVED)
+        application_branch = ApplicationBranch.objects.get(application=self.application)
+        application_branch.specialties.add(*self.specialties)
+        ApplicationBranch.objects.create(
+            application=self.application, branch=self.other_branch
+        ).specialties.add(self.specialty)
+        # A draft without branches.
+        self.draft = self.create_application(index=1, with_branch=False)
+
+    def counts(self, dimension, field=None):
+        rows = DailyApplicationRollup.objects.filter(dimension=dimension)
+        return {
+            (getattr(row, field) if field else None, row.status): row.application_count
+            for row in rows
+        }
+
+    def report(self, group_by):
+        self.client.force_login(self.admin)
+        response = self.client.get(
+            reverse('admin:reports_dailyapplicationrollup_changelist'), {'group_by': group_by}
+        )
+        self.assertEqual(response.status_code, 200)
+        return {str(row['group']): row['total'] for row in response.context['table']}
+
+    def test_counts_each_application_once_per_dimension(self):
+        refresh_rollups(full=True)
+
+        approved, draft = ApplicationStatus.APPROVED, ApplicationStatus.DRAFT
+        self.assertEqual(self.counts(RollupDimension.TOTAL), {(None, approved): 1, (None, draft): 1})
+        self.assertEqual(
+            self.counts(RollupDimension.REGION, 'region_id'), {(self.region.pk, approved): 1, (None, draft): 1}
+        )
+        self.assertEqual(self.counts(RollupDimension.DISTRICT, 'district_id'), {
+            (self.district.pk, approved): 1, (self.other_district.pk, approved): 1, (None, draft): 1,
+        })
+        self.assertEqual(self.counts(RollupDimension.SPECIALTY, 'specialty_id'), {
+            **{(specialty.pk, approved): 1 for specialty in self.specialties}, (None, draft): 1,
+        })
+
+    def test_report_groupings_do_not_multi_count(self):
+        refresh_rollups(full=True)
+        day = self.application.created_at.date()
+
+        self.assertEqual(self.report("region"), {"Toshkent": 1, "Not set": 1})
+        self.assertEqual(self.report("district"), {"Yunusobod": 1, "Chilonzor": 1, "Not set": 1})
+        self.assertEqual(self.report("specialty"), {"Terapiya": 1, "Jarrohlik": 1, "Pediatriya": 1, "Not set": 1})
+        self.assertEqual(self.report("day"), {str(day): 2})
+        self.assertEqual(self.report("month"), {day.strftime("%Y-%m"): 2})
+
+    def test_archived_applications_count_once(self):
+        archive_batch([self.application.pk], timezone.now() + timedelta(days=1))
+        refresh_rollups(full=True)
+
+        self.assertEqual(self.report("region"), {"Toshkent": 1, "Not set": 1})
+        self.assertEqual(self.report("specialty"), {"Terapiya": 1, "Jarrohlik": 1, "Pediatriya": 1, "Not set": 1})
+        self.assertEqual(sum(self.report("day").values()), 2)
+
+    def test_failed_full_rebuild_keeps_the_old_rollups(self):
+        refresh_rollups(full=True)
+        before = list(DailyApplicationRollup.objects.values_list("pk", flat=True).order_by("pk"))
+
+        with mock.patch("apps.reports.rollups.rebuild_days", side_effect=RuntimeError("boom")):
+            with self.assertRaises(RuntimeError):
+                refresh_rollups(full=True)
+
+        self.assertEqual(list(DailyApplicationRollup.objects.values_list("pk", flat=True).order_by("pk")), before)
+
+    def test_incremental_refresh(self):
+        refresh_rollups()
+        self.assertEqual(self.report("day"), {str(self.application.created_at.date()): 2})
+
+        self.create_application(index=2, with_branch=False)
+        refresh_rollups()
+        self.assertEqual(sum(self.report("day").values()), 3)
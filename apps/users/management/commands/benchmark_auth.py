@@ -0,0 +1,77 @@
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.contrib import auth
+from django.http import HttpResponse
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+
+from apps.users.middleware import CachedAuthenticationMiddleware
+
+CustomUser = get_user_model()
+
+# (label, session engine, authentication middleware)
+SETUPS = (
+    ("db sessions + AuthenticationMiddleware", "django.contrib.sessions.backends.db", AuthenticationMiddleware),
+    ("cached_db sessions + cached user", "django.contrib.sessions.backends.cached_db", CachedAuthenticationMiddleware),
+)
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _view(request):
+    return HttpResponse(request.user.email)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the queries and time per logged-in request spent on loading the "
+        "session and the user, with the DB session backend and with the cached one. "
+        "The user and sessions it creates are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                user = CustomUser.objects.create_user(
+                    email="benchmark-auth@example.invalid", password=None, first_name="Benchmark", last_name="Auth"
+                )
+                for label, engine, middleware in SETUPS:
+                    queries, elapsed = self._measure(user, engine, middleware, options["requests"])
+                    self.stdout.write(
+                        f"{label}: {queries / options['requests']:.2f} queries/request, "
+                        f"{elapsed / options['requests'] * 1e6:.0f} us/request"
+                    )
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _measure(self, user, engine, middleware_class, count):
+        with override_settings(SESSION_ENGINE=engine):
+            session_middleware = SessionMiddleware(middleware_class(_view))
+            session = session_middleware.SessionStore()
+            session[auth.SESSION_KEY] = str(user.pk)
+            session[auth.BACKEND_SESSION_KEY] = "django.contrib.auth.backends.ModelBackend"
+            session[auth.HASH_SESSION_KEY] = user.get_session_auth_hash()
+            session.save()
+
+            factory = RequestFactory()
+            factory.cookies[settings.SESSION_COOKIE_NAME] = session.session_key
+            session_middleware(factory.get("/"))  # warm the caches
+
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                for _ in range(count):
+                    session_middleware(factory.get("/"))
+                elapsed = time.perf_counter() - started
+        return len(captured), elapsed
@@ -1,7 +1,45 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from itertools import islice
+
+from django.db import transaction
 from django.contrib.auth.base_user import BaseUserManager
 from django.contrib.auth.hashers import make_password
 
 
+def _init_hashing_worker():
+    # Workers started with the "spawn" method don't inherit configured settings.
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+
+
+def hashing_pool(workers=None):
+    """A process pool for ``hash_passwords``; reuse it across calls, starting workers is costly."""
+    return ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1, initializer=_init_hashing_worker)
+
+
+def hash_passwords(passwords, workers=None, executor=None):
+    """
+    Hash ``passwords`` with the default hasher and return the encoded values
+    in the same order, in ``executor`` (see ``hashing_pool``) or else in a
+    pool started for this call. ``workers=1`` hashes in-process.
+    """
+    passwords = list(passwords)
+    if executor is None and (workers == 1 or len(passwords) < 2):
+        return [make_password(password) for password in passwords]
+
+    if executor is None:
+        with hashing_pool(workers) as executor:
+            return hash_passwords(passwords, workers, executor)
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(passwords) // (workers * 4))
+    return list(executor.map(make_password, passwords, chunksize=chunksize))
+
+
 class CustomUserManager(BaseUserManager):
     def _create_user_object(self, email, password, **extra_fields):
         email = self.normalize_email(email)
@@ -33,4 +71,68 @@ class CustomUserManager(BaseUserManager):
         if extra_fields.get("is_superuser") is not True:
             raise ValueError("Superuser must have is_superuser=True.")
 
-        return self._create_user(email, password, **extra_fields)
\ No newline at end of file
+        return self._create_user(email, password, **extra_fields)
+
+    def bulk_create_users(self, rows, chunk_size=500, workers=None):
+        """
+        Provision many regular users at once.
+
+        ``rows`` is an iterable of dicts with an ``email``, an optional
+        ``password`` (missing or empty means an unusable password) and any
+        other model fields. Emails are normalized up front, rows whose email
+        already exists (or repeats within the input) are skipped, passwords
+        are hashed in one process pool shared by all chunks and users are
+        inserted with ``bulk_create`` one chunk per transaction. Emails
+        registered concurrently are skipped by the insert itself
+        (``ignore_conflicts``), so they don't abort the import.
+
+        Returns a ``(created, skipped)`` tuple.
+        """
+        created = skipped = 0
+        seen = set()
+        rows = iter(rows)
+
+        with ExitStack() as stack:
+            executor = None if workers == 1 else stack.enter_context(hashing_pool(workers))
+
+            while chunk := list(islice(rows, chunk_size)):
+                for row in chunk:
+                    row["email"] = self.normalize_email(row["email"])
+
+                existing = set(
+                    self.using(self._db)
+                    .filter(email__in=[row["email"] for row in chunk])
+                    .values_list("email", flat=True)
+                )
+                fresh = []
+                for row in chunk:
+                    if row["email"] in existing or row["email"] in seen:
+                        skipped += 1
+                        continue
+                    seen.add(row["email"])
+                    fresh.append(row)
+
+                if not fresh:
+                    continue
+
+                hashes = hash_passwords(
+                    [row.pop("password", None) or None for row in fresh], workers=workers, executor=executor
+                )
+                users = []
+                for row, encoded in zip(fresh, hashes):
+                    row.setdefault("is_staff", False)
+                    row.setdefault("is_superuser", False)
+                    users.append(self.model(password=encoded, **row))
+
+                with transaction.atomic(using=self._db):
+                    self.using(self._db).bulk_create(users, batch_size=chunk_size, ignore_conflicts=True)
+                    # Salted hashes are unique, so they tell our rows from conflicting ones.
+                    inserted = self.using(self._db).filter(
+                        email__in=[user.email for user in users], password__in=hashes
+                    ).count()
+                created += inserted
+                skipped += len(users) - inserted
+
+        return created, skipped
+
+    bulk_create_users.alters_data = True
@@ -0,0 +1,53 @@
+from django.contrib import auth
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+from django.contrib.auth.middleware import AuthenticationMiddleware
+
+from apps.common.cache import make_key, record_event
+
+
+USER_CACHE_NAMESPACE = "auth-user:{user_id}"
+USER_CACHE_TIMEOUT = 60 * 15
+
+
+def get_cached_user(request):
+    """
+    Per-request user loader backed by the shared cache.
+
+    The cache key is built from the session's user id and auth hash, and the
+    entry is dropped whenever the user row is saved or deleted (see
+    ``apps.users.signals``). A cache hit therefore costs no DB query; a miss
+    falls back to ``django.contrib.auth.get_user``, which also takes care of
+    invalid sessions.
+    """
+    if not hasattr(request, "_cached_user"):
+        request._cached_user = _load_user(request)
+    return request._cached_user
+
+
+def _load_user(request):
+    user_id = request.session.get(auth.SESSION_KEY)
+    session_hash = request.session.get(auth.HASH_SESSION_KEY)
+    if user_id is None or not session_hash:
+        return auth.get_user(request)
+
+    key = make_key(session_hash, namespace=USER_CACHE_NAMESPACE.format(user_id=user_id))
+    user = cache.get(key)
+    if user is not None and constant_time_compare(session_hash, user.get_session_auth_hash()):
+        record_event("hit")
+        return user
+
+    record_event("miss")
+    user = auth.get_user(request)
+    if user.is_authenticated:
+        cache.set(key, user, USER_CACHE_TIMEOUT)
+    return user
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """Drop-in replacement for AuthenticationMiddleware using get_cached_user()."""
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_cached_user(request))
@@ -0,0 +1,19 @@
+from django.db import transaction
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save, post_delete
+
+from apps.common.cache import invalidate_namespace
+from apps.users.middleware import USER_CACHE_NAMESPACE
+
+CustomUser = get_user_model()
+
+
+def invalidate_cached_user(sender, instance, **kwargs):
+    # After commit, otherwise a concurrent request could re-cache the user as
+    # they were before this transaction (e.g. still active) for USER_CACHE_TIMEOUT.
+    namespace = USER_CACHE_NAMESPACE.format(user_id=instance.pk)
+    transaction.on_commit(lambda: invalidate_namespace(namespace))
+
+
+post_save.connect(invalidate_cached_user, sender=CustomUser, dispatch_uid="invalidate-cached-user-save")
+post_delete.connect(invalidate_cached_user, sender=CustomUser, dispatch_uid="invalidate-cached-user-delete")
@@ -0,0 +1,51 @@
+from django.test import TestCase
+from django.urls import reverse
+from django.core.cache import cache
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+
+from apps.common.cache import get_namespace_version
+from apps.users.middleware import USER_CACHE_NAMESPACE
+from apps.users.models import CustomUser
+
+
+class CachedAuthenticationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(
+            email="user@example.uz", password="pass12345", first_name="Ali", last_name="Valiyev"
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def auth_queries(self):
+        """Queries of one profile page request that load the session or the user."""
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(reverse("users:profile"))
+        self.assertEqual(response.status_code, 200)
+        return [
+            query["sql"] for query in captured.captured_queries
+            if '"django_session"' in query["sql"] or '"users_customuser"' in query["sql"]
+        ]
+
+    def test_cache_hit_costs_no_queries(self):
+        self.assertEqual(len(self.auth_queries()), 1)  # cold cache: the user row
+        self.assertEqual(self.auth_queries(), [])
+
+    def test_invalidated_on_commit(self):
+        self.auth_queries()
+        namespace = USER_CACHE_NAMESPACE.format(user_id=self.user.pk)
+        version = get_namespace_version(namespace)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+            # Until commit a concurrent request must not see (and re-cache) a new version.
+            self.assertEqual(get_namespace_version(namespace), version)
+
+        self.assertEqual(get_namespace_version(namespace), version + 1)
+        response = self.client.get(reverse("users:profile"))
+        self.assertEqual(response.status_code, 302)
@@ -0,0 +1,52 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.test import TestCase
+
+from apps.users import managers
+from apps.users.models import CustomUser
+
+
+def user_rows(count, start=0):
+    return [
+        {"email": f"user{index}@EXAMPLE.UZ", "first_name": "Ali", "last_name": f"V{index}", "password": "secret123"}
+        for index in range(start, start + count)
+    ]
+
+
+class BulkCreateUsersTests(TestCase):
+
+    def test_creates_users_and_skips_existing_and_repeated(self):
+        CustomUser.objects.create_user(email="user0@example.uz", password="x", first_name="A", last_name="B")
+        rows = user_rows(4) + user_rows(1, start=3) + [{"email": "nopass@example.uz", "first_name": "A", "last_name": "B"}]
+
+        created, skipped = CustomUser.objects.bulk_create_users(rows, chunk_size=2, workers=1)
+
+        self.assertEqual((created, skipped), (4, 2))
+        user = CustomUser.objects.get(email="user1@example.uz")
+        self.assertTrue(user.check_password("secret123"))
+        self.assertFalse(user.is_staff)
+        self.assertFalse(CustomUser.objects.get(email="nopass@example.uz").has_usable_password())
+
+    def test_one_hashing_pool_for_all_chunks(self):
+        with mock.patch.object(
+            managers, "hashing_pool", side_effect=lambda workers: ThreadPoolExecutor(workers)
+        ) as hashing_pool:
+            created, skipped = CustomUser.objects.bulk_create_users(user_rows(10), chunk_size=3, workers=2)
+
+        self.assertEqual((created, skipped), (10, 0))
+        hashing_pool.assert_called_once_with(2)
+
+    def test_concurrently_registered_email_is_skipped(self):
+        real_hash_passwords = managers.hash_passwords
+
+        def register_meanwhile(passwords, **kwargs):
+            # Someone registers after the existence check, before the insert.
+            CustomUser.objects.create_user(email="user1@example.uz", password="x", first_name="A", last_name="B")
+            return real_hash_passwords(passwords, **kwargs)
+
+        with mock.patch.object(managers, "hash_passwords", side_effect=register_meanwhile):
+            created, skipped = CustomUser.objects.bulk_create_users(user_rows(3), workers=1)
+
+        self.assertEqual((created, skipped), (2, 1))
+        self.assertFalse(CustomUser.objects.get(email="user1@example.uz").check_password("secret123"))
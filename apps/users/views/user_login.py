@@ -2,9 +2,12 @@ from django.urls import reverse_lazy
 from django.contrib.auth.views import LoginView
 
 from apps.users.forms import UserLoginForm
+from apps.common.ratelimit import RateLimitMixin
 
 
-class UserLoginView(LoginView):
+class UserLoginView(RateLimitMixin, LoginView):
+    # Throttled per client IP and per account before any password hashing
+    ratelimit_policies = ("users:login-ip", "users:login-account")
     form_class = UserLoginForm
     template_name = "users/login.html"
     success_url = reverse_lazy("home")
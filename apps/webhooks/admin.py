@@ -0,0 +1,46 @@
+from django.contrib import admin
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from apps.webhooks.models import DeliveryStatus, WebhookDelivery, WebhookEvent, WebhookSubscription
+
+
+@admin.register(WebhookSubscription)
+class WebhookSubscriptionAdmin(admin.ModelAdmin):
+    list_display = ('name', 'url', 'is_active', 'created_at')
+    list_filter = ('is_active',)
+    search_fields = ('name', 'url')
+
+
+class ReadOnlyAdmin(admin.ModelAdmin):
+    """Events and deliveries are written by the application, only inspected here."""
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(WebhookEvent)
+class WebhookEventAdmin(ReadOnlyAdmin):
+    list_display = ('id', 'event_type', 'application_id', 'created_at')
+    list_filter = ('event_type',)
+    search_fields = ('=application_id',)
+    date_hierarchy = 'created_at'
+
+
+@admin.register(WebhookDelivery)
+class WebhookDeliveryAdmin(ReadOnlyAdmin):
+    list_display = ('id', 'subscription', 'event', 'status', 'attempts', 'next_attempt_at', 'delivered_at')
+    list_filter = ('status', 'subscription')
+    list_select_related = ('subscription', 'event')
+    search_fields = ('=event__application_id',)
+    actions = ('retry_now',)
+
+    @admin.action(description=_("Retry selected deliveries now"))
+    def retry_now(self, request, queryset):
+        count = queryset.exclude(status=DeliveryStatus.DELIVERED).update(
+            status=DeliveryStatus.PENDING, attempts=0, next_attempt_at=timezone.now()
+        )
+        self.message_user(request, _("%(count)d deliveries queued for retry.") % {'count': count})
@@ -0,0 +1,225 @@
+import hashlib
+import hmac
+import http.client
+import json
+import math
+import random
+import time
+from collections import Counter
+from datetime import timedelta
+from itertools import groupby
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.core.serializers.json import DjangoJSONEncoder
+
+from apps.webhooks.models import DeliveryStatus, WebhookDelivery
+
+
+SIGNATURE_HEADER = 'X-Webhook-Signature'
+# Errors of a kept-alive connection the receiver already closed; retried once on a fresh one.
+STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError)
+
+
+def sign(secret, timestamp, body):
+    """``t=<unix time>,v1=<hex HMAC-SHA256 of "<t>." + body>``, checked by the receiver with the shared secret."""
+    digest = hmac.new(secret.encode(), f'{timestamp}.'.encode() + body, hashlib.sha256).hexdigest()
+    return f't={timestamp},v1={digest}'
+
+
+class WebhookSession:
+    """
+    Keeps one persistent HTTP connection per receiver (scheme, host, port), so
+    consecutive batches to the same endpoint skip the TCP and TLS handshakes.
+    """
+
+    def __init__(self, timeout=None):
+        self.timeout = timeout or settings.WEBHOOK_TIMEOUT
+        self.connections_opened = 0
+        self.requests_sent = 0
+        self._connections = {}
+
+    def _connect(self, parts):
+        connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self.connections_opened += 1
+        return connection_class(parts.hostname, parts.port, timeout=self.timeout)
+
+    def post(self, url, body, headers):
+        """POST ``body`` to ``url``; returns the response status, raises ``OSError``/``HTTPException``."""
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        path = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+        headers = {**headers, 'Content-Length': str(len(body))}
+
+        connection = self._connections.pop(key, None)
+        reused = connection is not None
+        while True:
+            connection = connection or self._connect(parts)
+            try:
+                connection.request('POST', path, body=body, headers=headers)
+                response = connection.getresponse()
+                response.read()
+            except STALE_CONNECTION_ERRORS:
+                connection.close()
+                if not reused:
+                    raise
+                connection, reused = None, False
+                continue
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                raise
+            break
+
+        self.requests_sent += 1
+        if response.will_close:
+            connection.close()
+        else:
+            self._connections[key] = connection
+        return response.status
+
+    def close(self):
+        for connection in self._connections.values():
+            connection.close()
+        self._connections.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def delivery_lease(group_sizes, batch_size=None, timeout=None):
+    """
+    How long sending deliveries can take, given the number of deliveries per
+    subscription: every request, ``batch_size`` events each, timing out on a
+    reused connection and again on a fresh one, plus one timeout of slack.
+    """
+    batch_size = batch_size or settings.WEBHOOK_BATCH_SIZE
+    timeout = timeout or settings.WEBHOOK_TIMEOUT
+    requests = sum(math.ceil(size / batch_size) for size in group_sizes)
+    return timedelta(seconds=timeout * (2 * requests + 1))
+
+
+def claim_due_deliveries(limit, lease=None, subscriptions=None, batch_size=None, timeout=None):
+    """
+    Lock up to ``limit`` due pending deliveries of active subscriptions
+    (optionally only ``subscriptions``), skipping rows another worker holds, and push
+    their next attempt ``lease`` into the future so they are not picked up
+    again while this worker sends them. The lease defaults to the worst-case
+    time of sending the claimed rows (see ``delivery_lease``).
+    """
+    now = timezone.now()
+    due = WebhookDelivery.objects.filter(
+        status=DeliveryStatus.PENDING, next_attempt_at__lte=now, subscription__is_active=True,
+    )
+    if subscriptions is not None:
+        due = due.filter(subscription__in=subscriptions)
+    with transaction.atomic():
+        claimed = list(
+            due.order_by('next_attempt_at', 'pk').select_for_update(skip_locked=True, of=('self',))
+            .values_list('pk', 'subscription_id')[:limit]
+        )
+        pks = [pk for pk, _ in claimed]
+        if lease is None:
+            lease = delivery_lease(Counter(subscription_id for _, subscription_id in claimed).values(),
+                                   batch_size, timeout)
+        WebhookDelivery.objects.filter(pk__in=pks).update(next_attempt_at=now + lease)
+    return list(
+        WebhookDelivery.objects.filter(pk__in=pks).select_related('subscription', 'event')
+        .order_by('subscription_id', 'event_id')
+    )
+
+
+def _body(deliveries):
+    events = [
+        {
+            'id': delivery.event_id,
+            'type': delivery.event.event_type,
+            'created_at': delivery.event.created_at,
+            'data': delivery.event.payload,
+        }
+        for delivery in deliveries
+    ]
+    return json.dumps({'events': events}, cls=DjangoJSONEncoder, separators=(',', ':')).encode()
+
+
+def _backoff(attempts):
+    delay = min(settings.WEBHOOK_BACKOFF_MAX, settings.WEBHOOK_BACKOFF_BASE * 2 ** (attempts - 1))
+    # Jittered over the upper half of the delay, so endpoints that failed together don't retry together.
+    return timedelta(seconds=delay * random.uniform(0.5, 1))
+
+
+def _send(session, subscription, deliveries):
+    """POST ``deliveries`` as one signed batch; returns an error message or ``''`` on success."""
+    body = _body(deliveries)
+    headers = {
+        'Content-Type': 'application/json',
+        'User-Agent': 'applications-webhooks/1.0',
+        SIGNATURE_HEADER: sign(subscription.secret, int(time.time()), body),
+    }
+    try:
+        status = session.post(subscription.url, body, headers)
+    except (OSError, http.client.HTTPException) as error:
+        return f'{type(error).__name__}: {error}'
+    if 200 <= status < 300:
+        return ''
+    return f'HTTP {status}'
+
+
+def deliver(session, deliveries, batch_size=None):
+    """
+    Send ``deliveries`` grouped by subscription, ``batch_size`` events per
+    request. Once a request to an endpoint fails, its remaining deliveries are
+    rescheduled without being sent or counted as an attempt.
+    Returns ``(delivered, retried, failed)``.
+    """
+    batch_size = batch_size or settings.WEBHOOK_BATCH_SIZE
+    now = timezone.now()
+    delivered, rescheduled = [], []
+
+    for _, group in groupby(deliveries, key=lambda delivery: delivery.subscription_id):
+        group = list(group)
+        subscription = group[0].subscription
+        error = ''
+        for start in range(0, len(group), batch_size):
+            batch = group[start:start + batch_size]
+            sent = not error
+            if sent:
+                error = _send(session, subscription, batch)
+            for delivery in batch:
+                if error:
+                    delivery.attempts += sent
+                    delivery.last_error = error
+                    if delivery.attempts >= settings.WEBHOOK_MAX_ATTEMPTS:
+                        delivery.status = DeliveryStatus.FAILED
+                    else:
+                        delivery.next_attempt_at = now + _backoff(max(delivery.attempts, 1))
+                    rescheduled.append(delivery)
+                else:
+                    delivered.append(delivery.pk)
+
+    # Every delivered row gets the same values, so one UPDATE instead of a bulk_update CASE per row.
+    WebhookDelivery.objects.filter(pk__in=delivered).update(
+        status=DeliveryStatus.DELIVERED, attempts=F('attempts') + 1, delivered_at=timezone.now(), last_error='',
+    )
+    WebhookDelivery.objects.bulk_update(rescheduled, ['status', 'attempts', 'next_attempt_at', 'last_error'])
+    failed = sum(delivery.status == DeliveryStatus.FAILED for delivery in rescheduled)
+    return len(delivered), len(rescheduled) - failed, failed
+
+
+def deliver_due(session, limit=1000, batch_size=None, subscriptions=None):
+    """
+    Claim and send due deliveries, ``limit`` at a time, until none are due.
+    Returns the ``(delivered, retried, failed)`` totals.
+    """
+    totals = [0, 0, 0]
+    while deliveries := claim_due_deliveries(
+        limit, subscriptions=subscriptions, batch_size=batch_size, timeout=session.timeout
+    ):
+        for index, count in enumerate(deliver(session, deliveries, batch_size)):
+            totals[index] += count
+    return tuple(totals)
@@ -0,0 +1,42 @@
+from django.db import transaction
+from django.utils import timezone
+
+from apps.webhooks.models import WebhookDelivery, WebhookEvent, WebhookSubscription
+
+
+STATUS_CHANGED = "application.status_changed"
+
+
+def record_status_change(application, previous_status):
+    """
+    Record that ``application`` moved from ``previous_status`` (None when it
+    was created) to its current status, with one pending delivery per
+    interested subscription. Runs in the caller's transaction, so the event
+    exists exactly when the status change is committed.
+    """
+    subscriptions = [
+        subscription for subscription in WebhookSubscription.objects.filter(is_active=True)
+        if subscription.wants(application.status)
+    ]
+    if not subscriptions:
+        return None
+
+    now = timezone.now()
+    with transaction.atomic():
+        event = WebhookEvent.objects.create(
+            event_type=STATUS_CHANGED,
+            application_id=application.pk,
+            created_at=now,
+            payload={
+                'application_id': application.pk,
+                'registration_number': application.registration_number,
+                'previous_status': previous_status,
+                'status': application.status,
+                'occurred_at': now.isoformat(),
+            },
+        )
+        WebhookDelivery.objects.bulk_create(
+            WebhookDelivery(subscription=subscription, event=event, next_attempt_at=now)
+            for subscription in subscriptions
+        )
+    return event
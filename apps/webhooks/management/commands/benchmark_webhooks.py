@@ -0,0 +1,111 @@
+import hmac
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.db import transaction
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.applications.choices import ApplicationStatus
+from apps.webhooks.delivery import SIGNATURE_HEADER, WebhookSession, deliver_due, sign
+from apps.webhooks.models import DeliveryStatus, WebhookDelivery, WebhookEvent, WebhookSubscription
+
+
+class _Rollback(Exception):
+    pass
+
+
+class StubReceiver(ThreadingHTTPServer):
+    """Local keep-alive endpoint that checks signatures and counts the events it receives."""
+    daemon_threads = True
+
+    def __init__(self, secret):
+        super().__init__(('127.0.0.1', 0), _StubHandler)
+        self.secret = secret
+        self.events = self.requests = self.connections = self.bad_signatures = 0
+        self.lock = threading.Lock()
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        timestamp = self.headers[SIGNATURE_HEADER].partition(',')[0].removeprefix('t=')
+        valid = hmac.compare_digest(self.headers[SIGNATURE_HEADER], sign(self.server.secret, timestamp, body))
+        with self.server.lock:
+            self.server.requests += 1
+            if valid:
+                self.server.events += len(json.loads(body)['events'])
+            else:
+                self.server.bad_signatures += 1
+        self.send_response(204 if valid else 401)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure webhook delivery throughput against a local stub receiver. "
+        "The events and deliveries it creates are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--events", type=int, default=5000)
+        parser.add_argument("--batch-size", type=int, default=None, help="Events per request (WEBHOOK_BATCH_SIZE).")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._benchmark(options["events"], options["batch_size"])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _benchmark(self, count, batch_size):
+        subscription = WebhookSubscription.objects.create(name="benchmark", url="http://127.0.0.1/")
+        receiver = StubReceiver(subscription.secret)
+        subscription.url = f"http://127.0.0.1:{receiver.server_port}/hooks"
+        subscription.save(update_fields=["url"])
+        threading.Thread(target=receiver.serve_forever, daemon=True).start()
+
+        events = WebhookEvent.objects.bulk_create(
+            WebhookEvent(
+                event_type="application.status_changed",
+                application_id=index,
+                payload={
+                    "application_id": index,
+                    "previous_status": ApplicationStatus.SUBMITTED,
+                    "status": ApplicationStatus.APPROVED,
+                },
+            )
+            for index in range(1, count + 1)
+        )
+        WebhookDelivery.objects.bulk_create(WebhookDelivery(subscription=subscription, event=event) for event in events)
+
+        started = time.monotonic()
+        try:
+            with WebhookSession() as session:
+                delivered, retried, failed = deliver_due(session, batch_size=batch_size, subscriptions=[subscription])
+        finally:
+            receiver.shutdown()
+            receiver.server_close()
+        elapsed = time.monotonic() - started
+
+        if receiver.bad_signatures:
+            raise CommandError(f"The receiver rejected {receiver.bad_signatures} requests with a bad signature.")
+        pending = WebhookDelivery.objects.filter(subscription=subscription).exclude(status=DeliveryStatus.DELIVERED)
+        self.stdout.write(self.style.SUCCESS(
+            f"Delivered {delivered}/{count} events ({receiver.events} received, {retried + failed} not delivered, "
+            f"{pending.count()} left) in {elapsed:.2f}s: {delivered / elapsed:.0f} events/s over "
+            f"{session.requests_sent} requests and {session.connections_opened} connections."
+        ))
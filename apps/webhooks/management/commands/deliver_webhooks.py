@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.webhooks.delivery import WebhookSession, deliver_due
+
+
+class Command(BaseCommand):
+    help = "Send due webhook deliveries, batched per endpoint, over persistent connections."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None, help="Events per request (WEBHOOK_BATCH_SIZE).")
+        parser.add_argument("--loop", action="store_true", help="Keep polling for due deliveries.")
+        parser.add_argument("--interval", type=float, default=5, help="Seconds between polls with --loop.")
+
+    def handle(self, *args, **options):
+        with WebhookSession() as session:
+            while True:
+                started = time.monotonic()
+                delivered, retried, failed = deliver_due(session, batch_size=options["batch_size"])
+                if delivered or retried or failed or not options["loop"]:
+                    self.stdout.write(
+                        f"Delivered {delivered}, retrying {retried}, gave up on {failed} "
+                        f"in {time.monotonic() - started:.1f}s."
+                    )
+                if not options["loop"]:
+                    return
+                time.sleep(options["interval"])
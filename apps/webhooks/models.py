@@ -0,0 +1,100 @@
+import secrets
+
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+def generate_secret():
+    return secrets.token_hex(32)
+
+
+class WebhookSubscription(models.Model):
+    """A downstream endpoint notified when applications change status."""
+    name = models.CharField(max_length=128, verbose_name=_("Name"))
+    url = models.URLField(max_length=500, verbose_name=_("URL"))
+    secret = models.CharField(
+        max_length=128,
+        default=generate_secret,
+        help_text=_("Shared key of the X-Webhook-Signature HMAC-SHA256 header."),
+        verbose_name=_("Secret")
+    )
+    statuses = models.JSONField(
+        default=list,
+        blank=True,
+        help_text=_("Only notify about these new statuses; empty for all."),
+        verbose_name=_("Statuses")
+    )
+    is_active = models.BooleanField(default=True, verbose_name=_("Active"))
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created at"))
+
+    def __str__(self):
+        return self.name
+
+    def wants(self, status):
+        return not self.statuses or status in self.statuses
+
+    class Meta:
+        verbose_name = _("Webhook subscription")
+        verbose_name_plural = _("Webhook subscriptions")
+
+
+class WebhookEvent(models.Model):
+    """
+    A status change of an application, recorded in the transaction that
+    saved it. ``application_id`` is a plain column so events outlive
+    archived and deleted applications.
+    """
+    event_type = models.CharField(max_length=64, verbose_name=_("Event type"))
+    application_id = models.BigIntegerField(db_index=True, verbose_name=_("Application ID"))
+    payload = models.JSONField(verbose_name=_("Payload"))
+    created_at = models.DateTimeField(default=timezone.now, verbose_name=_("Created at"))
+
+    def __str__(self):
+        return f"{self.event_type} #{self.application_id}"
+
+    class Meta:
+        verbose_name = _("Webhook event")
+        verbose_name_plural = _("Webhook events")
+
+
+class DeliveryStatus(models.TextChoices):
+    PENDING = ("pending", _("Pending"))
+    DELIVERED = ("delivered", _("Delivered"))
+    FAILED = ("failed", _("Failed"))
+
+
+class WebhookDelivery(models.Model):
+    """One event to send to one subscription, retried with backoff until delivered or given up."""
+    subscription = models.ForeignKey(
+        "webhooks.WebhookSubscription",
+        on_delete=models.CASCADE,
+        related_name="deliveries",
+        verbose_name=_("Subscription")
+    )
+    event = models.ForeignKey(
+        "webhooks.WebhookEvent",
+        on_delete=models.CASCADE,
+        related_name="deliveries",
+        verbose_name=_("Event")
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=DeliveryStatus.choices,
+        default=DeliveryStatus.PENDING,
+        verbose_name=_("Status")
+    )
+    attempts = models.PositiveIntegerField(default=0, verbose_name=_("Attempts"))
+    next_attempt_at = models.DateTimeField(default=timezone.now, verbose_name=_("Next attempt at"))
+    last_error = models.TextField(blank=True, verbose_name=_("Last error"))
+    delivered_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Delivered at"))
+
+    def __str__(self):
+        return f"{self.event} -> {self.subscription}"
+
+    class Meta:
+        verbose_name = _("Webhook delivery")
+        verbose_name_plural = _("Webhook deliveries")
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='webhook_delivery_due_idx'),
+        ]
@@ -0,0 +1,26 @@
+from django.db.models.signals import post_init, post_save
+
+from apps.applications.choices import ApplicationStatus
+from apps.applications.models import Application
+from apps.webhooks.events import record_status_change
+
+
+def remember_status(sender, instance, **kwargs):
+    # __dict__ so a deferred status is not loaded just for this.
+    instance._webhook_status = instance.__dict__.get('status')
+
+
+def status_changed(sender, instance, created, raw=False, **kwargs):
+    if raw or 'status' not in instance.__dict__:
+        return
+    if created:
+        if instance.status != ApplicationStatus.DRAFT:
+            record_status_change(instance, None)
+    # None: the status was deferred when the row was loaded, so the change is unknown.
+    elif instance._webhook_status is not None and instance.status != instance._webhook_status:
+        record_status_change(instance, instance._webhook_status)
+    instance._webhook_status = instance.status
+
+
+post_init.connect(remember_status, sender=Application, dispatch_uid="webhooks-remember-status")
+post_save.connect(status_changed, sender=Application, dispatch_uid="webhooks-status-changed")
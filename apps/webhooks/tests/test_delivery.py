@@ -0,0 +1,170 @@
+import math
+import threading
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.applications.choices import ApplicationStatus
+from apps.users.models import CustomUser
+from apps.webhooks.delivery import WebhookSession, claim_due_deliveries, deliver_due, delivery_lease
+from apps.webhooks.management.commands.benchmark_webhooks import StubReceiver
+from apps.webhooks.models import DeliveryStatus, WebhookDelivery, WebhookEvent, WebhookSubscription
+
+
+class StubReceiverMixin:
+    """Runs a StubReceiver for the test; it answers 401 to requests not signed with ``receiver_secret``."""
+    receiver_secret = None
+
+    def setUp(self):
+        super().setUp()
+        self.subscription = WebhookSubscription.objects.create(name="stub", url="http://127.0.0.1/")
+        self.receiver = StubReceiver(self.receiver_secret or self.subscription.secret)
+        self.subscription.url = f"http://127.0.0.1:{self.receiver.server_port}/hooks"
+        self.subscription.save(update_fields=["url"])
+        thread = threading.Thread(target=self.receiver.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.receiver.server_close)
+        self.addCleanup(thread.join)
+        self.addCleanup(self.receiver.shutdown)
+
+    def create_deliveries(self, count, subscription=None):
+        events = WebhookEvent.objects.bulk_create(
+            WebhookEvent(
+                event_type="application.status_changed",
+                application_id=index,
+                payload={"application_id": index, "previous_status": ApplicationStatus.SUBMITTED,
+                         "status": ApplicationStatus.APPROVED},
+            )
+            for index in range(1, count + 1)
+        )
+        return WebhookDelivery.objects.bulk_create(
+            WebhookDelivery(subscription=subscription or self.subscription, event=event) for event in events
+        )
+
+
+@override_settings(WEBHOOK_BATCH_SIZE=10)
+class DeliverDueTests(StubReceiverMixin, TestCase):
+
+    def test_delivers_signed_batches_over_one_connection(self):
+        self.create_deliveries(25)
+
+        with WebhookSession() as session:
+            self.assertEqual(deliver_due(session, limit=20), (25, 0, 0))
+
+        self.assertEqual(self.receiver.events, 25)
+        self.assertEqual(self.receiver.bad_signatures, 0)
+        # Two claims of 20 and 5 deliveries: 10 + 10, then 5 events per request.
+        self.assertEqual(self.receiver.requests, 3)
+        self.assertEqual(session.connections_opened, 1)
+        self.assertEqual(self.receiver.connections, 1)
+        self.assertFalse(WebhookDelivery.objects.exclude(status=DeliveryStatus.DELIVERED).exists())
+        self.assertEqual(set(WebhookDelivery.objects.values_list("attempts", flat=True)), {1})
+
+
+@override_settings(WEBHOOK_BATCH_SIZE=10)
+class FailingEndpointTests(StubReceiverMixin, TestCase):
+    receiver_secret = "not the subscription's secret"
+
+    def test_reschedules_without_sending_the_rest(self):
+        self.create_deliveries(25)
+        started = timezone.now()
+
+        with WebhookSession() as session:
+            self.assertEqual(deliver_due(session), (0, 25, 0))
+
+        # The first batch is rejected; the other two are not sent.
+        self.assertEqual(self.receiver.requests, 1)
+        self.assertEqual(self.receiver.bad_signatures, 1)
+        deliveries = WebhookDelivery.objects.order_by("event_id")
+        self.assertEqual([delivery.attempts for delivery in deliveries], [1] * 10 + [0] * 15)
+        self.assertTrue(all(delivery.last_error == "HTTP 401" for delivery in deliveries))
+        self.assertTrue(all(delivery.next_attempt_at > started for delivery in deliveries))
+
+
+class LeaseTests(TestCase):
+
+    def setUp(self):
+        self.subscriptions = [
+            WebhookSubscription.objects.create(name=f"endpoint {index}", url=f"http://127.0.0.{index}/")
+            for index in (1, 2)
+        ]
+        event = WebhookEvent.objects.create(event_type="application.status_changed", application_id=1, payload={})
+        for subscription, count in zip(self.subscriptions, (250, 3)):
+            WebhookDelivery.objects.bulk_create(
+                WebhookDelivery(subscription=subscription, event=event) for _ in range(count)
+            )
+
+    @override_settings(WEBHOOK_TIMEOUT=10, WEBHOOK_BATCH_SIZE=100)
+    def test_lease_covers_every_request_timing_out(self):
+        before = timezone.now()
+        claimed = claim_due_deliveries(1000)
+
+        self.assertEqual(len(claimed), 253)
+        # 3 + 1 requests, each up to two timeouts, plus one timeout of slack.
+        lease = timedelta(seconds=10 * (2 * 4 + 1))
+        self.assertEqual(delivery_lease([250, 3]), lease)
+        next_attempts = set(WebhookDelivery.objects.values_list("next_attempt_at", flat=True))
+        self.assertEqual(len(next_attempts), 1)
+        self.assertGreaterEqual(next_attempts.pop(), before + lease)
+        # Nothing is due again until the lease runs out.
+        self.assertEqual(claim_due_deliveries(1000), [])
+
+    def test_lease_grows_with_the_claim(self):
+        self.assertEqual(
+            delivery_lease([1000], batch_size=100, timeout=10),
+            timedelta(seconds=10 * (2 * math.ceil(1000 / 100) + 1)),
+        )
+        self.assertEqual(delivery_lease([1] * 50, batch_size=100, timeout=10), timedelta(seconds=1010))
+
+
+class RetryNowActionTests(TestCase):
+
+    def test_resets_attempts(self):
+        admin = CustomUser.objects.create_superuser(email="admin@example.uz", password="pass12345")
+        subscription = WebhookSubscription.objects.create(name="endpoint", url="http://127.0.0.1/")
+        event = WebhookEvent.objects.create(event_type="application.status_changed", application_id=1, payload={})
+        failed = WebhookDelivery.objects.create(
+            subscription=subscription, event=event, status=DeliveryStatus.FAILED, attempts=8,
+            next_attempt_at=timezone.now() + timedelta(days=1), last_error="HTTP 500",
+        )
+        delivered = WebhookDelivery.objects.create(
+            subscription=subscription, event=event, status=DeliveryStatus.DELIVERED, attempts=1,
+        )
+
+        self.client.force_login(admin)
+        response = self.client.post(reverse("admin:webhooks_webhookdelivery_changelist"), {
+            "action": "retry_now", "_selected_action": [failed.pk, delivered.pk],
+        })
+
+        self.assertEqual(response.status_code, 302)
+        failed.refresh_from_db()
+        self.assertEqual(failed.status, DeliveryStatus.PENDING)
+        self.assertEqual(failed.attempts, 0)
+        self.assertLessEqual(failed.next_attempt_at, timezone.now())
+        delivered.refresh_from_db()
+        self.assertEqual((delivered.status, delivered.attempts), (DeliveryStatus.DELIVERED, 1))
+
+
+class BenchmarkCommandTests(TestCase):
+
+    def test_delivers_everything_and_rolls_back(self):
+        statuses = set()
+
+        def deliver(*args, **kwargs):
+            statuses.update(WebhookEvent.objects.values_list("payload__previous_status", "payload__status"))
+            return deliver_due(*args, **kwargs)
+
+        out = StringIO()
+        with mock.patch("apps.webhooks.management.commands.benchmark_webhooks.deliver_due", side_effect=deliver):
+            call_command("benchmark_webhooks", events=50, batch_size=20, stdout=out)
+
+        self.assertIn("Delivered 50/50 events (50 received, 0 not delivered, 0 left)", out.getvalue())
+        # Payloads carry real status values, like the ones record_status_change() writes.
+        self.assertEqual(statuses, {(ApplicationStatus.SUBMITTED.value, ApplicationStatus.APPROVED.value)})
+        self.assertFalse(WebhookDelivery.objects.exists())
+        self.assertFalse(WebhookEvent.objects.exists())
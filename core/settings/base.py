@@ -38,7 +38,7 @@ DJANGO_APPS = [
     'django.contrib.staticfiles',
 ]
 
-LOCAL_APPS = ["apps.users", "apps.applications", "apps.common"]
+LOCAL_APPS = ["apps.users", "apps.applications", "apps.common", "apps.reports", "apps.webhooks"]
 
 EXTERNAL_APPS = ["formtools", ]
 
@@ -46,12 +46,15 @@ INSTALLED_APPS = LOCAL_APPS + EXTERNAL_APPS + DJANGO_APPS
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'apps.common.middleware.StaticFilesMiddleware',
+    'apps.common.middleware.RequestTimingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.users.middleware.CachedAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'apps.common.nplusone.NPlusOneMiddleware',
 ]
 
 ROOT_URLCONF = 'core.urls'
@@ -88,10 +91,165 @@ DATABASES = {
         "PASSWORD": os.getenv("DB_PASSWORD"),
         "HOST": os.getenv("DB_HOST"),
         "PORT": os.getenv("DB_PORT"),
-        "ATOMIC_REQUESTS": True,
+        # Requests run in autocommit; write views opt into a single atomic
+        # block via apps.common.mixins.AtomicWriteMixin.
+        "ATOMIC_REQUESTS": False,
     }
 }
 
+# Read replicas: comma separated hosts sharing the primary's credentials.
+# Read-only views opt in through apps.common.mixins.ReplicaReadMixin.
+REPLICA_DATABASES = []
+for index, host in enumerate(filter(None, os.getenv("DB_REPLICA_HOSTS", "").split(",")), start=1):
+    alias = f"replica_{index}"
+    DATABASES[alias] = {**DATABASES["default"], "HOST": host.strip(), "TEST": {"MIRROR": "default"}}
+    REPLICA_DATABASES.append(alias)
+
+DATABASE_ROUTERS = ["apps.common.db_router.PrimaryReplicaRouter"]
+# Seconds a user's reads stay on the primary after they submitted something.
+REPLICA_STICKY_SECONDS = 10
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# CACHE_BACKEND: "locmem" (default, local/test), "file" or "redis" (prod,
+# any Redis-compatible server reachable at REDIS_URL).
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "locmem")
+
+if CACHE_BACKEND == "redis":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL", "redis://127.0.0.1:6379/0"),
+            "KEY_PREFIX": os.getenv("PROJECT_NAME", "internship"),
+            "TIMEOUT": 300,
+        }
+    }
+elif CACHE_BACKEND == "file":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": BASE_DIR / ".cache",
+            "TIMEOUT": 300,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "internship-default",
+            "TIMEOUT": 300,
+        }
+    }
+
+
+# Sessions are read from the cache and written through to the database.
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+
+# How long (seconds) the result of a form submission is replayed for repeated
+# posts of the same idempotency key (apps.common.mixins.IdempotentSubmitMixin).
+IDEMPOTENCY_TTL = 600
+
+
+# Per-request performance instrumentation (apps.common.middleware).
+# Aggregate the log with `manage.py perf_report`.
+
+PERF_INSTRUMENTATION = os.getenv("PERF_INSTRUMENTATION", "0") == "1"
+PERF_SERVER_TIMING = True
+PERF_LOG_FILE = os.getenv("PERF_LOG_FILE", str(BASE_DIR / "perf.log"))
+
+# Logging: records are put on a bounded in-memory queue by the request
+# threads and written as JSON lines by a background listener thread
+# (apps.common.log), so slow sinks never block requests.
+# LOG_DEBUG_SAMPLE_RATE keeps that fraction of DEBUG records (0..1).
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "0.01"))
+LOG_QUEUE_SIZE = 10000
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "json": {"()": "apps.common.log.JSONFormatter"},
+    },
+    "filters": {
+        "sample_debug": {"()": "apps.common.log.SamplingFilter", "rate": LOG_DEBUG_SAMPLE_RATE},
+    },
+    "handlers": {
+        "console": {
+            "class": "logging.StreamHandler",
+            "formatter": "json",
+        },
+        "perf_file": {
+            "class": "logging.FileHandler",
+            "filename": PERF_LOG_FILE,
+            "formatter": "json",
+            "delay": True,
+        },
+        "queue_console": {
+            "class": "apps.common.log.NonBlockingQueueHandler",
+            "queue": {"()": "apps.common.log.bounded_queue", "maxsize": LOG_QUEUE_SIZE},
+            "handlers": ["console"],
+            "filters": ["sample_debug"],
+        },
+        "queue_perf": {
+            "class": "apps.common.log.NonBlockingQueueHandler",
+            "queue": {"()": "apps.common.log.bounded_queue", "maxsize": LOG_QUEUE_SIZE},
+            "handlers": ["perf_file"],
+        },
+    },
+    "loggers": {
+        "apps": {
+            "handlers": ["queue_console"],
+            "level": LOG_LEVEL,
+            "propagate": False,
+        },
+        "apps.common.perf": {
+            "handlers": ["queue_perf"],
+            "level": "INFO",
+            "propagate": False,
+        },
+    },
+}
+
+
+# Token-bucket rate limits per view (apps.common.ratelimit). "rate" is the
+# refill rate, "burst" the bucket size, "key" one of "ip", "user_or_ip" or
+# "post:<field>"; "max_concurrent" sheds load above N in-flight requests per
+# process. Set RATELIMIT_IP_HEADER (e.g. "HTTP_X_FORWARDED_FOR") behind a
+# trusted proxy.
+RATELIMIT_ENABLED = True
+RATELIMIT_IP_HEADER = os.getenv("RATELIMIT_IP_HEADER") or None
+RATELIMITS = {
+    "applications:requirements": {
+        "rate": "60/m", "burst": 20, "key": "user_or_ip", "methods": ("POST",), "max_concurrent": 8,
+    },
+    "applications:eligibility": {"rate": "30/m", "burst": 10, "key": "user_or_ip", "methods": ("POST",)},
+    "applications:duplicates": {"rate": "30/m", "burst": 10, "key": "user_or_ip", "methods": ("POST",)},
+    "users:login-ip": {"rate": "20/m", "burst": 10, "key": "ip", "methods": ("POST",)},
+    "users:login-account": {"rate": "10/h", "burst": 5, "key": "post:username", "methods": ("POST",)},
+}
+
+# Outbound webhooks (apps.webhooks): status changes are queued transactionally
+# and sent by `manage.py deliver_webhooks`, up to WEBHOOK_BATCH_SIZE events
+# per request. Failed deliveries are retried after BACKOFF_BASE * 2^n seconds
+# (jittered, capped at BACKOFF_MAX) and given up after MAX_ATTEMPTS.
+
+WEBHOOK_TIMEOUT = 10
+WEBHOOK_BATCH_SIZE = 100
+WEBHOOK_MAX_ATTEMPTS = 8
+WEBHOOK_BACKOFF_BASE = 30
+WEBHOOK_BACKOFF_MAX = 6 * 60 * 60
+
+# N+1 query detection (apps.common.nplusone): warns in DEBUG, raises when
+# NPLUSONE_RAISE is set (test settings). NPLUSONE_ALLOWLIST holds regexes of
+# query fingerprints that may repeat; intended repetitions in code are
+# marked with apps.common.nplusone.allow_repeated_queries().
+
+NPLUSONE_THRESHOLD = 3
+NPLUSONE_RAISE = False
+NPLUSONE_ALLOWLIST = []
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -131,6 +289,15 @@ STATIC_URL = 'static/'
 STATIC_ROOT = BASE_DIR / "staticfiles"
 STATICFILES_DIRS = (BASE_DIR / "static",)
 
+# collectstatic writes content-hashed names plus .gz/.br variants, which
+# apps.common.middleware.StaticFilesMiddleware serves with immutable caching
+# when DEBUG is off.
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "apps.common.storage.CompressedManifestStaticFilesStorage"},
+}
+STATIC_SERVE = True
+
 MEDIA_URL = "media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
@@ -0,0 +1,47 @@
+from .base import *  # noqa
+
+DEBUG = False
+
+# Tests don't need a .env; sessions and signing only need some key.
+SECRET_KEY = SECRET_KEY or "insecure-test-key"  # noqa: F405
+
+# Two SQLite aliases stand in for the primary and a read replica.
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "test-primary.sqlite3",
+    },
+    "replica": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "test-replica.sqlite3",
+        # The mirror opens the primary's in-memory test database on its own
+        # connection; reading uncommitted rows lets it see the data of the
+        # TestCase transaction instead of failing on its table locks.
+        "OPTIONS": {"init_command": "PRAGMA read_uncommitted = 1"},
+        "TEST": {"MIRROR": "default"},
+    },
+}
+REPLICA_DATABASES = ["replica"]
+
+# Password hashing dominates test run time with the default PBKDF2 cost.
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "internship-test",
+    }
+}
+
+NPLUSONE_RAISE = True
+
+# Tests don't run collectstatic, so there is no manifest to resolve names from.
+STORAGES = {
+    **STORAGES,
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+# Keep the test output readable; warnings and errors are still logged.
+LOGGING["loggers"]["apps"]["level"] = "WARNING"  # noqa: F405
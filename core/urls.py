@@ -25,6 +25,7 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('users/', include("apps.users.urls", namespace="users")),
     path('applications/', include("apps.applications.urls", namespace="applications")),
+    path('common/', include("apps.common.urls", namespace="common")),
     path('', GetToHomeView.as_view(template_name="home.html"), name="home"),
 ]
 
@@ -0,0 +1,416 @@
+$(document).ready(function() {
+    // URLs and ids rendered by the template on the form element
+    const config = document.getElementById('main-form').dataset;
+    // Wizard steps prefix their field names ("personal-email")
+    const fieldPrefix = config.fieldPrefix ? `${config.fieldPrefix}-` : '';
+    const formsetContainer = $('#branch-formset-container');
+    const totalForms = $(`#id_${config.formsetPrefix}-TOTAL_FORMS`);
+
+    function getCookie(name) {
+        let cookieValue = null;
+        if (document.cookie && document.cookie !== '') {
+            const cookies = document.cookie.split(';');
+            for (let i = 0; i < cookies.length; i++) {
+                const cookie = cookies[i].trim();
+                if (cookie.substring(0, name.length + 1) === (name + '=')) {
+                    cookieValue = decodeURIComponent(cookie.substring(name.length + 1));
+                    break;
+                }
+            }
+        }
+        return cookieValue;
+    }
+
+    // Disable/Enable specialty checkboxes based on branch selection
+    function toggleSpecialtyAccess(formIndex) {
+        const formElement = $(`#branch-form-${formIndex}`);
+        const prefix = formElement.find('input[name$=form_prefix]').val();
+        const branchSelect = formElement.find(`select[name="${prefix}-branch"]`);
+        const specialtyCheckboxes = formElement.find(`input[name="${prefix}-specialties"]`);
+
+        if (branchSelect.val()) {
+            specialtyCheckboxes.prop('disabled', false);
+            specialtyCheckboxes.closest('label').removeClass('disabled-checkbox');
+        } else {
+            specialtyCheckboxes.prop('disabled', true).prop('checked', false);
+            specialtyCheckboxes.closest('label').addClass('disabled-checkbox');
+            toggleSpecialistsEquipmentAccess(formIndex);
+
+            $(`#specialist-requirements-${formIndex}`).addClass('empty').html(`
+                <h6>📋 Minimal talab qilinadigan mutaxassislar:</h6>
+                <p class="mb-0 text-muted">Ixtisoslik turini tanlagandan so'ng bu yerda minimal talablar ko'rsatiladi</p>
+            `);
+            $(`#equipment-requirements-${formIndex}`).addClass('empty').html(`
+                <h6>🔧 Minimal talab qilinadigan jihozlar:</h6>
+                <p class="mb-0 text-muted">Ixtisoslik turini tanlagandan so'ng bu yerda minimal talablar ko'rsatiladi</p>
+            `);
+        }
+    }
+
+    // Disable/Enable specialists and equipment based on specialty selection
+    function toggleSpecialistsEquipmentAccess(formIndex) {
+        const formElement = $(`#branch-form-${formIndex}`);
+        const prefix = formElement.find('input[name$=form_prefix]').val();
+        const specialtyCheckboxes = formElement.find(`input[name="${prefix}-specialties"]:checked`);
+
+        // One count input per specialist / equipment type ("<prefix>-selected_specialists-<id>")
+        const specialistCounts = formElement.find(`input[name^="${prefix}-selected_specialists-"]`);
+        const equipmentCounts = formElement.find(`input[name^="${prefix}-selected_equipment-"]`);
+
+        if (specialtyCheckboxes.length > 0) {
+            specialistCounts.prop('disabled', false);
+            specialistCounts.closest('label').removeClass('disabled-checkbox');
+
+            equipmentCounts.prop('disabled', false);
+            equipmentCounts.closest('label').removeClass('disabled-checkbox');
+        } else {
+            specialistCounts.prop('disabled', true).val(0);
+            specialistCounts.closest('label').addClass('disabled-checkbox');
+
+            equipmentCounts.prop('disabled', true).val(0);
+            equipmentCounts.closest('label').addClass('disabled-checkbox');
+        }
+    }
+
+    // The whole requirements matrix is downloaded once from a content-hashed,
+    // long-cached URL and merged here; the AJAX endpoint is only a fallback.
+    const requirementsMatrix = config.matrixUrl
+        ? $.getJSON(config.matrixUrl)
+        : $.Deferred().reject().promise();
+
+    // Keep the highest minimum count per item over the selected specialties,
+    // the same merge get_requirements_for_specialty does on the server.
+    function mergeRequirements(matrix, specialtyIds) {
+        const specialists = {};
+        const equipment = {};
+        specialtyIds.forEach(function(specialtyId) {
+            const entry = matrix.requirements[specialtyId];
+            if (!entry) {
+                return;
+            }
+            entry[0].forEach(function([id, minCount]) {
+                if (!specialists[id] || specialists[id].min_count < minCount) {
+                    specialists[id] = {id: id, title: matrix.specialists[id], min_count: minCount};
+                }
+            });
+            entry[1].forEach(function([id, minCount]) {
+                if (!equipment[id] || equipment[id].min_count < minCount) {
+                    equipment[id] = {id: id, name: matrix.equipment[id], min_count: minCount};
+                }
+            });
+        });
+        return {specialists: Object.values(specialists), equipment: Object.values(equipment)};
+    }
+
+    function loadRequirements(specialtyIds) {
+        return requirementsMatrix.then(
+            function(matrix) {
+                return mergeRequirements(matrix, specialtyIds);
+            },
+            function() {
+                return $.ajax({
+                    url: config.requirementsUrl,
+                    type: 'POST',
+                    headers: {'X-CSRFToken': getCookie('csrftoken')},
+                    dataType: 'json',
+                    contentType: 'application/json',
+                    data: JSON.stringify({ specialty_ids: specialtyIds })
+                });
+            }
+        );
+    }
+
+    function updateRequirementsDisplay(formIndex) {
+        const formElement = $(`#branch-form-${formIndex}`);
+        const prefix = formElement.find('input[name$=form_prefix]').val();
+
+        const selectedSpecialtyIds = [];
+        formElement.find(`input[name="${prefix}-specialties"]:checked`).each(function() {
+            selectedSpecialtyIds.push($(this).val());
+        });
+
+        const specialistReqBox = $(`#specialist-requirements-${formIndex}`);
+        const equipmentReqBox = $(`#equipment-requirements-${formIndex}`);
+
+        if (selectedSpecialtyIds.length === 0) {
+            specialistReqBox.addClass('empty').html(`
+                <h6>📋 Minimal talab qilinadigan mutaxassislar:</h6>
+                <p class="mb-0 text-muted">Ixtisoslik turini tanlagandan so'ng bu yerda minimal talablar ko'rsatiladi</p>
+            `);
+            equipmentReqBox.addClass('empty').html(`
+                <h6>🔧 Minimal talab qilinadigan jihozlar:</h6>
+                <p class="mb-0 text-muted">Ixtisoslik turini tanlagandan so'ng bu yerda minimal talablar ko'rsatiladi</p>
+            `);
+            return;
+        }
+
+        loadRequirements(selectedSpecialtyIds).then(function(response) {
+            const specialists = response.specialists;
+            const equipment = response.equipment;
+
+            if (specialists.length > 0) {
+                let specialistHTML = '<h6>📋 Minimal talab qilinadigan mutaxassislar:</h6><ul>';
+                specialists.forEach(function(spec) {
+                    specialistHTML += `<li><strong>${spec.min_count} ta</strong> ${spec.title}</li>`;
+                });
+                specialistHTML += '</ul>';
+                specialistReqBox.removeClass('empty').html(specialistHTML);
+            } else {
+                specialistReqBox.addClass('empty').html(`
+                    <h6>📋 Minimal talab qilinadigan mutaxassislar:</h6>
+                    <p class="mb-0 text-muted">Bu ixtisoslik uchun minimal mutaxassis talabi yo'q</p>
+                `);
+            }
+
+            if (equipment.length > 0) {
+                let equipmentHTML = '<h6>🔧 Minimal talab qilinadigan jihozlar:</h6><ul>';
+                equipment.forEach(function(eq) {
+                    equipmentHTML += `<li><strong>${eq.min_count} ta</strong> ${eq.name}</li>`;
+                });
+                equipmentHTML += '</ul>';
+                equipmentReqBox.removeClass('empty').html(equipmentHTML);
+            } else {
+                equipmentReqBox.addClass('empty').html(`
+                    <h6>🔧 Minimal talab qilinadigan jihozlar:</h6>
+                    <p class="mb-0 text-muted">Bu ixtisoslik uchun minimal jihoz talabi yo'q</p>
+                `);
+            }
+        }, function(xhr, status, error) {
+            console.error("AJAX Error:", error);
+            specialistReqBox.addClass('empty').html(`
+                <h6>📋 Minimal talab qilinadigan mutaxassislar:</h6>
+                <p class="mb-0 text-danger">Xato: Ma'lumotlarni yuklashda muammo</p>
+            `);
+            equipmentReqBox.addClass('empty').html(`
+                <h6>🔧 Minimal talab qilinadigan jihozlar:</h6>
+                <p class="mb-0 text-danger">Xato: Ma'lumotlarni yuklashda muammo</p>
+            `);
+        });
+    }
+
+    // Narrow the branch select down to the autocomplete matches
+    let branchSearchTimer = null;
+    function filterBranchOptions(formElement, query) {
+        const options = formElement.find('select[name$="-branch"] option');
+        if (!query.trim()) {
+            options.show();
+            return;
+        }
+        $.getJSON(config.autocompleteUrl, {q: query, kind: 'branch', limit: 50}, function(response) {
+            const ids = new Set(response.results.map(item => String(item.id)));
+            options.each(function() {
+                $(this).toggle(!this.value || ids.has(this.value));
+            });
+        });
+    }
+
+    function setupListeners(formElement) {
+        const formIndex = formElement.data('form-index');
+        const prefix = formElement.find('input[name$=form_prefix]').val();
+
+        if (!prefix) return;
+
+        formElement.find('.branch-search').on('input', function() {
+            const query = $(this).val();
+            clearTimeout(branchSearchTimer);
+            branchSearchTimer = setTimeout(() => filterBranchOptions(formElement, query), 150);
+        });
+
+        // Listen to branch selection changes
+        formElement.find(`select[name="${prefix}-branch"]`).on('change', function() {
+            toggleSpecialtyAccess(formIndex);
+        });
+
+        // Listen to specialty checkbox changes
+        formElement.find(`input[name="${prefix}-specialties"]`).on('change', function() {
+            toggleSpecialistsEquipmentAccess(formIndex);
+            updateRequirementsDisplay(formIndex);
+        });
+
+        // Initialize state on page load
+        toggleSpecialtyAccess(formIndex);
+        toggleSpecialistsEquipmentAccess(formIndex);
+
+        if (formElement.find(`input[name="${prefix}-specialties"]:checked`).length > 0) {
+            updateRequirementsDisplay(formIndex);
+        }
+    }
+
+    // Instant duplicate feedback for the unique phone number / e-mail
+    function checkDuplicates() {
+        const fields = {phone_number: $(`#id_${fieldPrefix}phone_number`), email: $(`#id_${fieldPrefix}email`)};
+        $.ajax({
+            url: config.duplicatesUrl,
+            type: 'POST',
+            headers: {'X-CSRFToken': getCookie('csrftoken')},
+            dataType: 'json',
+            contentType: 'application/json',
+            data: JSON.stringify({
+                phone_number: fields.phone_number.val(),
+                email: fields.email.val(),
+                application_id: config.applicationId
+            }),
+            success: function(response) {
+                $.each(fields, function(name, input) {
+                    input.siblings('.duplicate-feedback').remove();
+                    if (response[name] && response[name].taken) {
+                        input.after('<div class="invalid-feedback d-block duplicate-feedback">Bu qiymat bilan ariza allaqachon mavjud.</div>');
+                    }
+                });
+            }
+        });
+    }
+    $(`#id_${fieldPrefix}phone_number, #id_${fieldPrefix}email`).on('change', checkDuplicates);
+
+    // Initialize all branch forms
+    $('.branch-form-card').each(function() {
+        setupListeners($(this));
+    });
+
+    // Add Branch Button - Clone and add new form
+    $('#add-branch-button').on('click', function(e) {
+        e.preventDefault();
+
+        console.log('Add branch button clicked');
+
+        const currentFormCount = parseInt(totalForms.val());
+        const newFormIndex = currentFormCount;
+
+        console.log('Current form count:', currentFormCount);
+        console.log('New form index:', newFormIndex);
+
+        // Clone the first form (as template) - clone WITHOUT events
+        const templateForm = $('.branch-form-card').first();
+        const newForm = templateForm.clone(false);
+
+        console.log('Form cloned');
+
+        // Update the form index
+        newForm.attr('id', `branch-form-${newFormIndex}`);
+        newForm.attr('data-form-index', newFormIndex);
+
+        // Update all field names, IDs, and clear values
+        newForm.find(':input').each(function() {
+            const oldName = $(this).attr('name');
+            const oldId = $(this).attr('id');
+
+            if (oldName) {
+                // Replace the index in name: applicationbranch_set-0-field -> applicationbranch_set-X-field
+                const newName = oldName.replace(/-\d+-/, `-${newFormIndex}-`);
+                $(this).attr('name', newName);
+            }
+
+            if (oldId) {
+                // Replace the index in id: id_applicationbranch_set-0-field -> id_applicationbranch_set-X-field
+                const newId = oldId.replace(/-\d+-/, `-${newFormIndex}-`);
+                $(this).attr('id', newId);
+            }
+
+            // Clear values
+            const inputType = $(this).attr('type');
+            if (inputType === 'checkbox' || inputType === 'radio') {
+                $(this).prop('checked', false);
+            } else if (inputType === 'number') {
+                $(this).val(0);
+            } else if ($(this).is('select')) {
+                $(this).val('').prop('selectedIndex', 0);
+            } else if (oldName && oldName.includes('form_prefix')) {
+                $(this).val(`${config.formsetPrefix}-${newFormIndex}`);
+            } else if (inputType !== 'hidden' || (oldName && !oldName.includes('id'))) {
+                $(this).val('');
+            }
+        });
+
+        // Update labels 'for' attributes
+        newForm.find('label').each(function() {
+            const oldFor = $(this).attr('for');
+            if (oldFor) {
+                const newFor = oldFor.replace(/-\d+-/, `-${newFormIndex}-`);
+                $(this).attr('for', newFor);
+            }
+        });
+
+        // Update requirements box IDs
+        newForm.find('[id^="specialist-requirements-"]').attr('id', `specialist-requirements-${newFormIndex}`)
+            .addClass('empty')
+            .html(`
+                <h6>📋 Minimal talab qilinadigan mutaxassislar:</h6>
+                <p class="mb-0 text-muted">Ixtisoslik turini tanlagandan so'ng bu yerda minimal talablar ko'rsatiladi</p>
+            `);
+
+        newForm.find('[id^="equipment-requirements-"]').attr('id', `equipment-requirements-${newFormIndex}`)
+            .addClass('empty')
+            .html(`
+                <h6>🔧 Minimal talab qilinadigan jihozlar:</h6>
+                <p class="mb-0 text-muted">Ixtisoslik turini tanlagandan so'ng bu yerda minimal talablar ko'rsatiladi</p>
+            `);
+
+        // Update form header number
+        newForm.find('h5.text-secondary').html(`<i class="fas fa-building me-2"></i>Filial #${newFormIndex + 1}`);
+
+        // Clear error messages
+        newForm.find('.invalid-feedback').remove();
+
+        // Disable and uncheck all checkboxes initially
+        newForm.find('input[type="checkbox"]').prop('disabled', true).prop('checked', false);
+        newForm.find('input[type="number"]').prop('disabled', true);
+        newForm.find('.checkbox-group label').addClass('disabled-checkbox');
+
+        // Remove d-none class if it exists
+        newForm.removeClass('d-none');
+
+        // Show delete button
+        newForm.find('.remove-branch-button').show();
+
+        // Append the new form
+        formsetContainer.append(newForm);
+
+        console.log('New form appended');
+
+        // Update total forms count
+        totalForms.val(newFormIndex + 1);
+        console.log('Total forms updated to:', totalForms.val());
+
+        // IMPORTANT: Remove old event listeners from cloned elements
+        newForm.find('select, input[type="checkbox"], .branch-search').off();
+        newForm.find('select[name$="-branch"] option').show();
+
+        // Setup NEW listeners for the new form
+        setupListeners(newForm);
+
+        console.log('Listeners set up for form index:', newFormIndex);
+
+        // Update remove buttons visibility
+        updateRemoveButtons();
+
+        console.log('Remove buttons updated');
+    });
+
+    // Remove Branch Button Logic
+    formsetContainer.on('click', '.remove-branch-button', function() {
+        const formId = $(this).data('form-id');
+        const formElement = $(`#${formId}`);
+
+        // Mark for deletion using Django's DELETE checkbox
+        const deleteCheckbox = formElement.find('input[name$="-DELETE"]');
+        if (deleteCheckbox.length) {
+            deleteCheckbox.prop('checked', true);
+        }
+
+        // Hide the form
+        formElement.addClass('d-none');
+
+        // Update remove buttons
+        updateRemoveButtons();
+    });
+
+    function updateRemoveButtons() {
+        const visibleForms = formsetContainer.find('.branch-form-card:not(.d-none)').length;
+        if (visibleForms <= 1) {
+            formsetContainer.find('.remove-branch-button').hide();
+        } else {
+            formsetContainer.find('.remove-branch-button').show();
+        }
+    }
+    updateRemoveButtons();
+});